@@ -0,0 +1,185 @@
+"""
+timing for animations played in the gui. nothing here ever sleeps: the
+controller asks the scheduler how long it may wait for window events and
+whether the next animation step is due, so the window keeps responding while
+an animation plays.
+"""
+
+"""
+animation speeds, in steps per second
+"""
+DEFAULT_SPEED = 1
+MIN_SPEED = 0.5
+MAX_SPEED = 50
+
+"""
+node movement. positions are worked out from the time elapsed rather than the
+number of frames drawn, so frames that can't be drawn in time are dropped
+instead of making the movement lag behind.
+"""
+FRAME_RATE = 60 #most frames drawn per second while nodes are moving
+TWEEN_FRACTION = 0.8 #share of the time between steps spent moving nodes
+
+
+class Tween:
+    """
+    the timing of one movement of nodes from where they are to where they
+    belong.
+    """
+    def __init__(self, start, duration):
+        """
+        parameters:
+            start (float): the time in seconds the movement began.
+            duration (float): how many seconds the movement lasts.
+        """
+        self.start = start
+        self.duration = duration
+
+    def progress(self, now):
+        """
+        parameters:
+            now (float): the current time in seconds.
+
+        returns (float):
+            how far along the movement is, from 0 to 1. eased so nodes speed
+            up and slow down rather than starting and stopping abruptly.
+        """
+        if self.duration <= 0:
+            return 1.0
+
+        fraction = min(max((now - self.start) / self.duration, 0.0), 1.0)
+        return fraction * fraction * (3 - 2 * fraction)
+
+
+class AnimationScheduler:
+    """
+    decides when the steps of an animation are played. supports changing
+    speed, pausing, stepping one instruction at a time while paused and
+    skipping to the end of the current animation.
+    """
+    def __init__(self, speed=DEFAULT_SPEED):
+        """
+        parameters:
+            speed (float): the number of steps played per second.
+        """
+        self.speed = speed
+        self.paused = False
+        self.step_requested = False
+        self.skip_requested = False
+        self.next_step = 0.0 #time the next step is due
+        self.next_frame = 0.0 #time the next frame of movement is due
+
+    def set_speed(self, speed):
+        """
+        change how many steps are played per second. takes effect from the
+        next step.
+        """
+        self.speed = min(max(speed, MIN_SPEED), MAX_SPEED)
+
+    def toggle_pause(self):
+        """
+        pause a playing animation or resume a paused one.
+
+        returns (bool):
+            true if the scheduler is now paused.
+        """
+        self.paused = not self.paused
+        return self.paused
+
+    def request_step(self):
+        """
+        play exactly one step straight away, even while paused.
+        """
+        self.step_requested = True
+
+    def request_skip(self):
+        """
+        jump to the end of the current animation.
+        """
+        self.skip_requested = True
+
+    def start(self, now):
+        """
+        called when a new animation begins. its first step is due straight
+        away.
+
+        parameters:
+            now (float): the current time in seconds.
+        """
+        self.next_step = now
+        self.skip_requested = False
+
+    def due(self, now):
+        """
+        returns (bool):
+            true if a step of the current animation should be played now.
+        """
+        if self.step_requested:
+            return True
+        if self.paused:
+            return False
+        return now >= self.next_step
+
+    def mark_step(self, now):
+        """
+        called after a step has been played, scheduling the next one.
+
+        parameters:
+            now (float): the current time in seconds.
+        """
+        self.step_requested = False
+        self.next_step = now + 1 / self.speed
+
+    def tween_duration(self):
+        """
+        returns (float):
+            seconds that nodes moved by a step should take to get into place,
+            so they settle before the next step is due.
+        """
+        return TWEEN_FRACTION / self.speed
+
+    def frame_due(self, now):
+        """
+        returns (bool):
+            true if the next frame of node movement should be drawn now.
+        """
+        return now >= self.next_frame
+
+    def mark_frame(self, now):
+        """
+        called after a frame of movement has been drawn, scheduling the next
+        one. frames that were missed are dropped rather than drawn late.
+
+        parameters:
+            now (float): the current time in seconds.
+        """
+        self.next_frame += 1 / FRAME_RATE
+        if self.next_frame <= now:
+            self.next_frame = now + 1 / FRAME_RATE
+
+    def timeout(self, now, stepping, moving=False):
+        """
+        how long the controller may wait for window events before it needs to
+        check on the animation again.
+
+        parameters:
+            now (float): the current time in seconds.
+            stepping (bool): true if an animation is playing or operations are
+                waiting to start one.
+            moving (bool): true if nodes are moving into place.
+
+        returns (int):
+            the wait in milliseconds, or None to wait until the next event.
+        """
+        if self.skip_requested or (stepping and self.step_requested):
+            return 0
+
+        waits = []
+        if stepping and not self.paused:
+            waits.append(self.next_step - now)
+        if moving:
+            waits.append(self.next_frame - now)
+
+        if len(waits) == 0:
+            return None
+        return max(0, int(min(waits) * 1000))
@@ -0,0 +1,333 @@
+"""
+avl tree implementation. offers the same functions as bst.py and returns the
+same paths, with every rotation performed to rebalance the tree reported as a
+RESTRUCTURE instruction so the view can replay it.
+"""
+
+import sys
+
+import bst
+from bst import Node, node_height, update
+from bst import SEARCH, SWAP, INSERT, NOT_FOUND, DUPLICATE, DELETE, \
+    RESTRUCTURE
+
+
+def create(value):
+    """
+    function to initialise an avl tree holding a single value.
+
+    returns (Node):
+        the root of the new tree.
+    """
+    return Node(value)
+
+
+def balance_factor(node):
+    """
+    returns (int):
+        the height of the left subtree minus the height of the right subtree.
+    """
+    return node_height(node.left) - node_height(node.right)
+
+
+def rotate_left(node, path):
+    """
+    rotate the right child of node up into its place.
+
+    parameters:
+        node (Node): the root of the subtree to rotate.
+        path [(string, int)]: the path the rotation is recorded in.
+
+    returns (Node):
+        the new root of the subtree.
+    """
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    update(node)
+    update(pivot)
+    path.append((RESTRUCTURE, (node.value, pivot.value)))
+    return pivot
+
+
+def rotate_right(node, path):
+    """
+    rotate the left child of node up into its place.
+
+    parameters:
+        node (Node): the root of the subtree to rotate.
+        path [(string, int)]: the path the rotation is recorded in.
+
+    returns (Node):
+        the new root of the subtree.
+    """
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    update(node)
+    update(pivot)
+    path.append((RESTRUCTURE, (node.value, pivot.value)))
+    return pivot
+
+
+def rebalance(node, path):
+    """
+    restore the avl property at a node whose subtrees may differ in height by
+    two, refreshing its cached height and size.
+
+    parameters:
+        node (Node): the root of the subtree to rebalance.
+        path [(string, int)]: the path any rotations are recorded in.
+
+    returns (Node):
+        the new root of the subtree.
+    """
+    update(node)
+    balance = balance_factor(node)
+
+    if balance > 1:
+        if balance_factor(node.left) < 0:
+            node.left = rotate_left(node.left, path)
+        return rotate_right(node, path)
+    elif balance < -1:
+        if balance_factor(node.right) > 0:
+            node.right = rotate_right(node.right, path)
+        return rotate_left(node, path)
+
+    return node
+
+
+def retrace(root, ancestors, path):
+    """
+    walk back up from a mutation, rebalancing every ancestor and relinking
+    rotated subtrees to their parents.
+
+    parameters:
+        root (Node): the root of the tree.
+        ancestors ([Node]): the nodes on the path from the root down to the
+            mutation.
+        path [(string, int)]: the path any rotations are recorded in.
+
+    returns (Node):
+        the (possibly new) root of the tree.
+    """
+    for index in range(len(ancestors) - 1, -1, -1):
+        node = ancestors[index]
+        subtree = rebalance(node, path)
+
+        if subtree is node:
+            continue
+
+        if index == 0:
+            root = subtree
+        elif ancestors[index - 1].left is node:
+            ancestors[index - 1].left = subtree
+        else:
+            ancestors[index - 1].right = subtree
+
+    return root
+
+
+def insert(root, value, max_height):
+    """
+    function to insert a node into an avl tree.
+
+    parameters:
+        root (Node): the tree to insert into.
+        value (int): the value to try and insert into the tree.
+        max_height (int): the maximum tree height allowed by the view
+
+    returns (Node, [(string, int)], int, int):
+        1st value is the new tree (possibly unchanged). 2nd is the operations
+        taken to perform this action on the tree. 3rd is height of tree after
+        operation. 4th is the level the new node was attached at, before any
+        restructuring.
+    """
+    if root == None:
+        return (Node(value), [(INSERT, value)], 1, 0)
+
+    path = []
+    ancestors = []
+    current = root
+
+    while current != None:
+        if current.value == value:
+            path.append((DUPLICATE, value))
+            return (root, path, node_height(root), len(ancestors))
+
+        path.append((SEARCH, current.value))
+        ancestors.append(current)
+        current = current.right if current.value < value else current.left
+
+    if len(ancestors) + 1 > max_height:
+        return (root, [], node_height(root), -sys.maxsize)
+
+    parent = ancestors[-1]
+    if parent.value < value:
+        parent.right = Node(value)
+    else:
+        parent.left = Node(value)
+    path.append((INSERT, value))
+
+    root = retrace(root, ancestors, path)
+
+    return (root, path, node_height(root), len(ancestors))
+
+
+def delete(root, value):
+    """
+    attempts to delete the node with a specified value in the avl tree
+
+    parameters:
+        root (Node): the tree to delete from
+        value (int): the value of the node to search for and delete
+
+    returns (Node, [(string, int)], int, int):
+        1st value is the new tree (possibly unchanged). 2nd is the operations
+        taken to perform this action on the tree. 3rd is height of tree after
+        operation. 4th is always -sys.maxsize as the value is no longer in the
+        tree.
+    """
+    path = []
+    ancestors = []
+    parent = None
+    current = root
+
+    while current != None:
+        if current.value < value:
+            path.append((SEARCH, current.value))
+            ancestors.append(current)
+            parent, current = current, current.right
+            continue
+        elif current.value > value:
+            path.append((SEARCH, current.value))
+            ancestors.append(current)
+            parent, current = current, current.left
+            continue
+
+        if current.both_children():
+            minimum_node = bst.min_node(current.right)
+            path.append((SWAP, (value, minimum_node.value)))
+            current.value = minimum_node.value
+            minimum_node.value = value
+            ancestors.append(current)
+            parent, current = current, current.right
+            continue
+
+        path.append((DELETE, value))
+        replacement = current.one_child()
+
+        if parent == None:
+            root = replacement
+        elif parent.left is current:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+
+        root = retrace(root, ancestors, path)
+        return (root, path, node_height(root), -sys.maxsize)
+
+    path.append((NOT_FOUND, value))
+    return (root, path, node_height(root), -sys.maxsize)
+
+
+def insert_many(root, values, max_height):
+    """
+    insert a batch of values into an avl tree, one at a time in ascending
+    order. a batch can't share its descents, as the rotations after each
+    insert move the nodes the next one would resume from.
+
+    parameters:
+        root (Node): the tree to insert into.
+        values (iterable of int): the values to try and insert.
+        max_height (int): values that would make the tree taller than this
+            are skipped.
+
+    returns (Node, [(string, int)], int):
+        1st value is the new tree. 2nd is the operations taken to insert every
+        value. 3rd is height of tree after the batch.
+    """
+    path = []
+
+    for value in sorted(set(values)):
+        root, steps, _, _ = insert(root, value, max_height)
+        path.extend(steps)
+
+    return (root, path, node_height(root))
+
+
+def delete_many(root, values):
+    """
+    delete a batch of values from an avl tree, one at a time in ascending
+    order.
+
+    parameters:
+        root (Node): the tree to delete from.
+        values (iterable of int): the values to search for and delete.
+
+    returns (Node, [(string, int)], int):
+        1st value is the new tree. 2nd is the operations taken to delete every
+        value, in ascending order of value. 3rd is height of tree after the 
+        batch.
+    """
+    path = []
+
+    for value in sorted(set(values)):
+        root, steps, _, _ = delete(root, value)
+        path.extend(steps)
+
+    return (root, path, node_height(root))
+
+
+def is_balanced(root):
+    """
+    returns (bool):
+        true if the heights of the two subtrees of every node differ by at
+        most one, going by the cached heights.
+    """
+    stack = [root] if root != None else []
+
+    while len(stack) > 0:
+        node = stack.pop()
+        if abs(balance_factor(node)) > 1:
+            return False
+
+        if node.left != None:
+            stack.append(node.left)
+        if node.right != None:
+            stack.append(node.right)
+
+    return True
+
+
+def from_preorder(values):
+    """
+    rebuild an avl tree from the values of its nodes in preorder. the saved
+    shape is kept if it is balanced, as it will be if it was saved from an
+    avl tree, and otherwise the values are built into a balanced tree.
+
+    parameters:
+        values (iterable of int): the values in preorder.
+
+    returns (Node):
+        the root of the tree. None if there were no values.
+
+    raises (ValueError):
+        if the values are not the preorder of a binary search tree.
+    """
+    root = bst.from_preorder(values)
+
+    if is_balanced(root):
+        return root
+
+    return bst.build((value for _, value in bst.iter_inorder(root)), 
+        presorted=True)
+
+
+"""
+searching doesn't depend on how the tree is balanced, and a perfectly
+balanced tree is already an avl tree.
+"""
+search = bst.search
+search_many = bst.search_many
+build = bst.build
@@ -0,0 +1,827 @@
+"""
+benchmarks for the data structure modules. run from the src directory, e.g.
+
+    python -m benchmark memory --size 1000000
+    python -m benchmark workload --sizes 1000 1000000 --json results.json
+"""
+
+import argparse
+import gc
+import heapq
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import binheap
+import bst
+import bstarray
+import bstview
+import metrics
+import pbst
+import renderer
+import tracefile
+
+
+class DictNode:
+    """
+    the original bst.Node layout: a plain object with a per-instance __dict__.
+    kept here as the baseline the compact layouts are measured against.
+    """
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+def build_balanced(size, new_node):
+    """
+    build a perfectly balanced tree holding the keys 0..size-1 without
+    recursion.
+
+    parameters:
+        size (int): the number of keys in the tree.
+        new_node (function): called with a value, returns a new node.
+
+    returns (Node):
+        the root of the tree.
+    """
+    if size == 0:
+        return None
+
+    root = new_node((size - 1) // 2)
+    stack = [(0, (size - 1) // 2 - 1, root, True),
+        ((size - 1) // 2 + 1, size - 1, root, False)]
+
+    while len(stack) > 0:
+        low, high, parent, is_left = stack.pop()
+        if low > high:
+            continue
+
+        middle = (low + high) // 2
+        node = new_node(middle)
+
+        if is_left:
+            parent.left = node
+        else:
+            parent.right = node
+
+        stack.append((low, middle - 1, node, True))
+        stack.append((middle + 1, high, node, False))
+
+    return root
+
+
+def measure_memory(build):
+    """
+    measure the memory still allocated once a build function returns.
+
+    parameters:
+        build (function): takes no arguments and returns the structure to
+            measure.
+
+    returns (int):
+        bytes allocated by the build and kept alive by its result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def bench_memory(size):
+    """
+    compare the memory used per key by each node layout for a balanced tree.
+
+    parameters:
+        size (int): the number of keys in each tree.
+
+    returns ({string: float}):
+        bytes per key for each layout.
+    """
+    layouts = {
+        "dict": lambda: build_balanced(size, DictNode),
+        "slots": lambda: build_balanced(size, bst.Node),
+        "array": lambda: build_balanced(size, bstarray.ArrayTree().allocate),
+    }
+
+    return {name: measure_memory(build) / size
+        for name, build in layouts.items()}
+
+
+def bench_heap(size, seed=0, measure=None):
+    """
+    time heapify, pushes and pops on BinHeap against the standard library's
+    heapq on the same random values.
+
+    parameters:
+        size (int): the number of values pushed and popped.
+        seed (int): seed for the random values.
+        measure (Metrics): also counts BinHeap's comparisons in each phase 
+            if given, which slows it down.
+
+    returns ({string: {string: float}}):
+        seconds taken by each implementation for each phase.
+    """
+    generator = random.Random(seed)
+    values = [generator.random() for _ in range(size)]
+    results = {}
+
+    heap = binheap.BinHeap()
+    if measure != None:
+        measure.count_heap("binheap.heapify", heap)
+    start = time.perf_counter()
+    heap.heapify(values)
+    heapify_time = time.perf_counter() - start
+    if measure != None:
+        measure.count_heap("binheap.heapify", heap)
+
+    heap = binheap.BinHeap()
+    if measure != None:
+        measure.count_heap("binheap.push", heap)
+    start = time.perf_counter()
+    for value in values:
+        heap.push(value)
+    push_time = time.perf_counter() - start
+    if measure != None:
+        measure.count_heap("binheap.push", heap)
+
+    start = time.perf_counter()
+    for _ in range(size):
+        heap.pop()
+    pop_time = time.perf_counter() - start
+    if measure != None:
+        measure.count_heap("binheap.pop", heap)
+    results["binheap"] = {"heapify": heapify_time, "push": push_time,
+        "pop": pop_time}
+
+    heap = list(values)
+    start = time.perf_counter()
+    heapq.heapify(heap)
+    heapify_time = time.perf_counter() - start
+    heap = []
+    start = time.perf_counter()
+    for value in values:
+        heapq.heappush(heap, value)
+    push_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(size):
+        heapq.heappop(heap)
+    results["heapq"] = {"heapify": heapify_time, "push": push_time,
+        "pop": time.perf_counter() - start}
+
+    return results
+
+
+"""
+heap backends compared by the heapmix benchmark, as (kind, arity). only DARY
+heaps take an arity.
+"""
+HEAP_BACKENDS = {
+    "binary": (binheap.BINARY, None),
+    "4-ary": (binheap.DARY, 4),
+    "8-ary": (binheap.DARY, 8),
+    "pairing": (binheap.PAIRING, None),
+}
+
+"""
+operation mixes for the heapmix benchmark, as the fraction of operations that
+are pushes. pop-heavy mixes start from a full heap.
+"""
+HEAP_MIXES = {
+    "push-heavy": 0.9,
+    "balanced": 0.5,
+    "pop-heavy": 0.1,
+}
+
+
+def bench_heap_mix(size, seed=0, measure=None):
+    """
+    time each heap backend on mixes of pushes and pops.
+
+    parameters:
+        size (int): the number of operations in each mix, and the number of
+            values the pop-heavy mixes start with.
+        seed (int): seed for the random operations.
+        measure (Metrics): also counts each backend's comparisons in each 
+            mix if given, which slows them down.
+
+    returns ({string: {string: float}}):
+        seconds taken by each backend for each mix.
+    """
+    results = {name: {} for name in HEAP_BACKENDS}
+
+    for mix, push_fraction in HEAP_MIXES.items():
+        generator = random.Random(seed)
+        initial = [generator.random() for _ in range(size)] \
+            if push_fraction < 0.5 else []
+        operations = [generator.random() for _ in range(size)]
+
+        for name, (kind, arity) in HEAP_BACKENDS.items():
+            if kind == binheap.DARY:
+                heap = binheap.create(kind, initial, arity)
+            else:
+                heap = binheap.create(kind, initial)
+            push = heap.push
+            pop = heap.pop
+            if measure != None:
+                measure.count_heap(name + "." + mix, heap)
+
+            start = time.perf_counter()
+            for operation in operations:
+                if operation < push_fraction or len(heap) == 0:
+                    push(operation)
+                else:
+                    pop()
+            results[name][mix] = time.perf_counter() - start
+
+            if measure != None:
+                measure.count_heap(name + "." + mix, heap)
+
+    return results
+
+
+def bench_render(size, count, seed=0, measure=None, skewed=False, model=bst):
+    """
+    time the view animating random inserts, deletes and searches on a tree,
+    drawing with a RecordingRenderer so no display is needed.
+
+    parameters:
+        size (int): the number of keys the tree starts with.
+        count (int): the number of operations animated.
+        seed (int): seed for the random operations.
+        measure (Metrics): also measures the model, layout and view if given.
+        skewed (bool): start from the chain left by inserting the keys in
+            ascending order rather than a balanced tree. a balancing model 
+            keeps its tree balanced either way.
+        model (module): one of tracefile.TREES, to operate with.
+
+    returns ({string: float}):
+        seconds taken, drawing calls made and figures left on the graph.
+    """
+    generator = random.Random(seed)
+    recorder = renderer.RecordingRenderer()
+    view = bstview.BSTView(renderer=recorder)
+    keys = range(0, 2 * size, 2)
+    if skewed:
+        root = model.insert_many(None, keys, size)[0]
+    else:
+        root = model.build(keys, presorted=True)
+    view.redraw_from_model(root, refit=True)
+    operations = [model.insert, model.delete, model.search]
+
+    if measure != None:
+        measure.instrument(view)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        operation = generator.choice(operations)
+        value = generator.randrange(2 * size)
+
+        if operation == model.insert:
+            root, path, height, level = model.insert(root, value, size)
+        elif operation == model.delete:
+            root, path, height, level = model.delete(root, value)
+        else:
+            root, path = model.search(root, value)
+            height, level = 0, 0
+
+        if measure != None:
+            path = measure.count_path(operation.__name__, path)
+
+        view.start_animation(path, height, level, root)
+        while view.step_animation():
+            pass
+
+    return {"seconds": time.perf_counter() - start,
+        "calls": sum(recorder.counts.values()),
+        "figures": len(recorder.figures)}
+
+
+"""
+distributions the keys of a workload are drawn from
+"""
+KEY_RANDOM = "random"
+KEY_SORTED = "sorted"
+KEY_ZIPFIAN = "zipfian"
+KEY_DISTRIBUTIONS = (KEY_RANDOM, KEY_SORTED, KEY_ZIPFIAN)
+ZIPF_EXPONENT = 1.1 #how strongly zipfian keys favour the most popular
+
+"""
+operation mixes for bst workloads, as the fractions of operations that are
+(inserts, deletes, searches)
+"""
+BST_MIXES = {
+    "insert-only": (1.0, 0.0, 0.0),
+    "read-heavy": (0.05, 0.05, 0.9),
+    "balanced": (0.25, 0.25, 0.5),
+    "write-heavy": (0.45, 0.45, 0.1),
+}
+
+"""
+traversals of the whole tree, timed once per size as they don't depend on the
+keys of a workload
+"""
+BST_TRAVERSALS = {
+    "preorder": bst.iter_preorder,
+    "inorder": bst.iter_inorder,
+    "postorder": bst.iter_postorder,
+    "bfs": bst.iter_breadth_first,
+}
+
+"""
+sizes of the structures workloads run against, from 10^3 to 10^6 keys
+"""
+WORKLOAD_SIZES = (1000, 10000, 100000, 1000000)
+TRAVERSAL_REPEATS = 5 #number of times each traversal is timed
+
+
+def workload_keys(distribution, count, universe, seed=0):
+    """
+    draw the keys a workload operates on.
+
+    parameters:
+        distribution (string): KEY_RANDOM for keys chosen uniformly,
+            KEY_SORTED for keys spread evenly over the universe in ascending
+            order, or KEY_ZIPFIAN for keys where a few are chosen far more
+            often than the rest.
+        count (int): the number of keys to draw.
+        universe (int): keys are drawn from 0..universe-1.
+        seed (int): seed for the random keys.
+
+    returns ([int]):
+        the keys.
+    """
+    generator = random.Random(seed)
+
+    if distribution == KEY_RANDOM:
+        return [generator.randrange(universe) for _ in range(count)]
+    elif distribution == KEY_SORTED:
+        return [index * universe // count for index in range(count)]
+    elif distribution == KEY_ZIPFIAN:
+        #popular keys are scattered over the universe rather than the smallest
+        keys = list(range(universe))
+        generator.shuffle(keys)
+        weights = itertools.accumulate(1 / rank ** ZIPF_EXPONENT
+            for rank in range(1, universe + 1))
+        return generator.choices(keys, cum_weights=list(weights), k=count)
+
+    raise ValueError("unknown key distribution: %s" % distribution)
+
+
+def percentile(ordered, fraction):
+    """
+    returns (float):
+        the value a fraction of the way through a sorted list.
+    """
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def summarise(latencies, operations):
+    """
+    turn the time taken by each timed call into rates and percentiles.
+
+    parameters:
+        latencies ([int]): nanoseconds each call took.
+        operations (int): the number of operations the calls did in total.
+
+    returns ({string: float}):
+        operations per second and the median and 99th percentile call in
+        microseconds.
+    """
+    ordered = sorted(latencies)
+    total = sum(ordered) / 1e9
+
+    return {"ops_per_sec": operations / total if total > 0 else 0.0,
+        "p50_us": percentile(ordered, 0.5) / 1000,
+        "p99_us": percentile(ordered, 0.99) / 1000}
+
+
+def run_bst_workload(size, keys, mix, seed=0, model=bst):
+    """
+    run a mix of operations against a balanced tree holding the even keys
+    0..2*size-2, so drawn keys are as likely to be missing as present.
+
+    parameters:
+        size (int): the number of keys the tree starts with.
+        keys ([int]): the key of each operation, from workload_keys.
+        mix (string): one of BST_MIXES.
+        seed (int): seed for choosing the operations.
+        model (module): one of tracefile.TREES, or pbst to keep every 
+            version of a bst.
+
+    returns ([int]):
+        nanoseconds each operation took.
+    """
+    inserts, deletes, _ = BST_MIXES[mix]
+    generator = random.Random(seed)
+    root = model.build(range(0, 2 * size, 2), presorted=True)
+    latencies = []
+    clock = time.perf_counter_ns
+
+    for key in keys:
+        choice = generator.random()
+        start = clock()
+        if choice < inserts:
+            root = model.insert(root, key, sys.maxsize)[0]
+        elif choice < inserts + deletes:
+            root = model.delete(root, key)[0]
+        else:
+            model.search(root, key)
+        latencies.append(clock() - start)
+
+    return latencies
+
+
+def run_heap_workload(size, keys, mix, seed=0, measure=None, name="heap"):
+    """
+    run a mix of pushes and pops against a binary heap. pop-heavy mixes start
+    from a heap of size keys.
+
+    parameters:
+        size (int): the number of keys pop-heavy mixes start with.
+        keys ([int]): the key of each push, from workload_keys.
+        mix (string): one of HEAP_MIXES.
+        seed (int): seed for choosing the operations.
+        measure (Metrics): also counts the heap's comparisons if given.
+        name (string): the name the comparisons are counted under.
+
+    returns ([int]):
+        nanoseconds each operation took.
+    """
+    push_fraction = HEAP_MIXES[mix]
+    generator = random.Random(seed)
+    heap = binheap.create(binheap.BINARY, range(0, 2 * size, 2)
+        if push_fraction < 0.5 else None)
+    latencies = []
+    clock = time.perf_counter_ns
+    if measure != None:
+        measure.count_heap(name, heap)
+
+    for key in keys:
+        push = generator.random() < push_fraction or len(heap) == 0
+        start = clock()
+        if push:
+            heap.push(key)
+        else:
+            heap.pop()
+        latencies.append(clock() - start)
+
+    if measure != None:
+        measure.count_heap(name, heap)
+    return latencies
+
+
+def run_traversal(size, traversal):
+    """
+    time whole traversals of a balanced tree.
+
+    parameters:
+        size (int): the number of keys in the tree.
+        traversal (string): one of BST_TRAVERSALS.
+
+    returns ([int]):
+        nanoseconds each of TRAVERSAL_REPEATS traversals took.
+    """
+    root = bst.build(range(size), presorted=True)
+    iterate = BST_TRAVERSALS[traversal]
+    latencies = []
+
+    for _ in range(TRAVERSAL_REPEATS):
+        start = time.perf_counter_ns()
+        for _ in iterate(root):
+            pass
+        latencies.append(time.perf_counter_ns() - start)
+
+    return latencies
+
+
+def peak_memory(run):
+    """
+    returns (int):
+        the most bytes allocated at once while a function runs, including
+        building the structure it works on.
+    """
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def bench_workloads(structures, sizes, distributions, mixes, operations,
+    memory=True, seed=0, measure=None):
+    """
+    run every combination of structure, size, key distribution and mix. 
+    timings are taken without tracemalloc, which slows allocation down, and
+    peak memory from a second run of the same workload under it.
+
+    parameters:
+        structures ([string]): "heap", "pbst" or any of tracefile.TREES. 
+            "pbst" runs the bst mixes on the persistent tree, and "avl" and
+            "rbtree" run them on the balanced trees.
+        sizes ([int]): the number of keys each structure starts with.
+        distributions ([string]): members of KEY_DISTRIBUTIONS.
+        mixes ([string]): members of BST_MIXES, HEAP_MIXES or BST_TRAVERSALS.
+            each structure runs the ones it supports.
+        operations (int): the number of operations in each workload.
+        memory (bool): also measure peak memory.
+        seed (int): seed for the keys and operations.
+        measure (Metrics): also counts the comparisons of each heap workload
+            in its timed run if given, under structure.size.keys.mix.
+
+    returns ([{string: object}]):
+        one result per workload, with what was run, operations per second,
+        median and 99th percentile latency and peak bytes.
+    """
+    results = []
+
+    for structure, size in itertools.product(structures, sizes):
+        #(keys, mix, operations, run, the same run counting comparisons)
+        runs = []
+        keys = {} #keys drawn from each distribution, shared between mixes
+
+        for mix in mixes:
+            if structure == "bst" and mix in BST_TRAVERSALS:
+                traverse = lambda mix=mix: run_traversal(size, mix)
+                runs.append(("-", mix, size * TRAVERSAL_REPEATS, traverse,
+                    traverse))
+                continue
+
+            if structure in tracefile.TREES and mix in BST_MIXES:
+                run_workload = partial(run_bst_workload, 
+                    model=tracefile.TREES[structure])
+            elif structure == "pbst" and mix in BST_MIXES:
+                run_workload = partial(run_bst_workload, model=pbst)
+            elif structure == "heap" and mix in HEAP_MIXES:
+                run_workload = run_heap_workload
+            else:
+                continue
+
+            for distribution in distributions:
+                if distribution not in keys:
+                    keys[distribution] = workload_keys(distribution,
+                        operations, 2 * size, seed)
+                run = lambda keys=keys[distribution], mix=mix, \
+                    run=run_workload: run(size, keys, mix, seed)
+                timed = run
+
+                if structure == "heap" and measure != None:
+                    timed = partial(run_heap_workload, size, 
+                        keys[distribution], mix, seed, measure, 
+                        "heap.%d.%s.%s" % (size, distribution, mix))
+
+                runs.append((distribution, mix, operations, run, timed))
+
+        for distribution, mix, count, run, timed in runs:
+            result = {"structure": structure, "size": size,
+                "keys": distribution, "mix": mix, "operations": count}
+            result.update(summarise(timed(), count))
+            result["peak_bytes"] = peak_memory(run) if memory else None
+            results.append(result)
+
+    return results
+
+
+def write_session(filename, size, distribution, mix, operations, seed=0,
+    variant="bst"):
+    """
+    record a session of random operations to replay with bench_replay: the
+    kind of tree, a load of size even keys and then a mix of single inserts,
+    deletes and searches.
+
+    parameters:
+        filename (string): the session file to write. added to if it exists.
+        size (int): the number of keys loaded.
+        distribution (string): one of KEY_DISTRIBUTIONS.
+        mix (string): one of BST_MIXES.
+        operations (int): the number of operations after the load.
+        seed (int): seed for the keys and operations.
+        variant (string): the kind of tree, one of tracefile.TREES.
+    """
+    inserts, deletes, _ = BST_MIXES[mix]
+    generator = random.Random(seed)
+    keys = list(range(0, 2 * size, 2))
+    model = tracefile.TREES[variant]
+    tree = model.build(keys, presorted=True)
+
+    with tracefile.TraceWriter(filename) as session:
+        session.write(bstview.BST_TREE, [tracefile.TREE_CODES[variant]], 
+            [])
+        session.write(bstview.BST_LOAD, keys, [])
+
+        for key in workload_keys(distribution, operations, 2 * size, seed):
+            choice = generator.random()
+            if choice < inserts:
+                method = bstview.BST_INSERT
+            elif choice < inserts + deletes:
+                method = bstview.BST_DELETE
+            else:
+                method = bstview.BST_SEARCH
+
+            tree, path, _, _ = tracefile.perform(tree, method, [key], model)
+            session.write(method, [key], path)
+
+
+def bench_replay(filename, view=False):
+    """
+    time reading a session on its own, then replaying it against the model
+    and, optionally, a headless view.
+
+    parameters:
+        filename (string): the session file to replay.
+        view (bool): also animate every operation on a BSTView drawing with
+            a RecordingRenderer.
+
+    returns ({string: float}):
+        the number of operations and instructions in the session, and the
+        seconds taken to read and to replay it.
+    """
+    results = {"operations": 0, "instructions": 0}
+
+    with tracefile.TraceReader(filename) as session:
+        start = time.perf_counter()
+        for _, _, path in session:
+            results["operations"] += 1
+            results["instructions"] += len(path)
+        results["read_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tracefile.replay(session, bstview.BSTView() if view else None)
+        results["replay_seconds"] = time.perf_counter() - start
+
+    return results
+
+
+def environment():
+    """
+    returns ({string: string}):
+        what the benchmarks ran on, so results from different commits and
+        machines can be told apart.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {"commit": commit, "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(), "time": time.strftime(
+        "%Y-%m-%dT%H:%M:%S")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark",
+        description="benchmarks for the tree and heap modules")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    memory = commands.add_parser("memory",
+        help="bytes per key for each bst node layout")
+    memory.add_argument("--size", type=int, default=1000000)
+
+    heap = commands.add_parser("heap",
+        help="BinHeap against heapq")
+    heap.add_argument("--size", type=int, default=100000)
+    heap.add_argument("--metrics", action="store_true",
+        help="also count comparisons, which slows the heaps down")
+
+    heap_mix = commands.add_parser("heapmix",
+        help="binary, d-ary and pairing heaps on push/pop mixes")
+    heap_mix.add_argument("--size", type=int, default=1000000)
+    heap_mix.add_argument("--metrics", action="store_true",
+        help="also count comparisons, which slows the heaps down")
+
+    render = commands.add_parser("render",
+        help="animating operations with the headless renderer")
+    render.add_argument("--size", type=int, default=100000)
+    render.add_argument("--count", type=int, default=100)
+    render.add_argument("--metrics", action="store_true",
+        help="also break the time down by model, layout, view and renderer")
+    render.add_argument("--skewed", action="store_true",
+        help="start from a tree built by inserting the keys in order")
+    render.add_argument("--tree", default="bst", choices=tracefile.TREES,
+        help="the kind of tree to operate on")
+
+    workload = commands.add_parser("workload",
+        help="ops/sec, latency and peak memory of bst and heap workloads")
+    workload.add_argument("--structures", nargs="+", default=["bst", "heap"],
+        choices=list(tracefile.TREES) + ["pbst", "heap"])
+    workload.add_argument("--sizes", nargs="+", type=int,
+        default=list(WORKLOAD_SIZES))
+    workload.add_argument("--keys", nargs="+", 
+        default=list(KEY_DISTRIBUTIONS), choices=KEY_DISTRIBUTIONS)
+    mixes = list(dict.fromkeys(itertools.chain(BST_MIXES, HEAP_MIXES,
+        BST_TRAVERSALS)))
+    workload.add_argument("--mixes", nargs="+", default=mixes, choices=mixes)
+    workload.add_argument("--operations", type=int, default=100000,
+        help="operations in each workload")
+    workload.add_argument("--no-memory", action="store_true",
+        help="skip the second run under tracemalloc for peak memory")
+    workload.add_argument("--seed", type=int, default=0)
+    workload.add_argument("--metrics", action="store_true",
+        help="also count the comparisons of heap workloads while timing them")
+    workload.add_argument("--json", metavar="PATH",
+        help="also write the results to a json file")
+
+    session = commands.add_parser("session",
+        help="record a session of random operations to replay")
+    session.add_argument("filename")
+    session.add_argument("--size", type=int, default=100000)
+    session.add_argument("--keys", default=KEY_RANDOM,
+        choices=KEY_DISTRIBUTIONS)
+    session.add_argument("--mix", default="balanced", choices=BST_MIXES)
+    session.add_argument("--operations", type=int, default=100000)
+    session.add_argument("--tree", default="bst", choices=tracefile.TREES,
+        help="the kind of tree the session operates on")
+
+    replay = commands.add_parser("replay",
+        help="read and replay a session file")
+    replay.add_argument("filename")
+    replay.add_argument("--view", action="store_true",
+        help="also animate the session on a headless view")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "memory":
+        results = bench_memory(args.size)
+        for name, per_key in results.items():
+            print("%-6s %8.1f bytes/key  %5.1fx" % (name, per_key,
+                results["dict"] / per_key))
+    elif args.command == "heap":
+        measure = metrics.Metrics() if args.metrics else None
+        results = bench_heap(args.size, measure=measure)
+        for name, phases in results.items():
+            print("%-8s " % name + "  ".join("%s %.3fs" % phase
+                for phase in phases.items()))
+        if measure != None:
+            print()
+            print(measure.report())
+    elif args.command == "heapmix":
+        measure = metrics.Metrics() if args.metrics else None
+        results = bench_heap_mix(args.size, measure=measure)
+        for name, mixes in results.items():
+            print("%-8s " % name + "  ".join("%s %.3fs" % mix
+                for mix in mixes.items()))
+        if measure != None:
+            print()
+            print(measure.report())
+    elif args.command == "render":
+        measure = metrics.Metrics() if args.metrics else None
+        results = bench_render(args.size, args.count, measure=measure,
+            skewed=args.skewed, model=tracefile.TREES[args.tree])
+        print("%d operations %.3fs (%.2f ms/op)  %d drawing calls  "
+            "%d figures" % (args.count, results["seconds"],
+            results["seconds"] / args.count * 1000, results["calls"],
+            results["figures"]))
+        if measure != None:
+            print()
+            print(measure.report())
+    elif args.command == "session":
+        write_session(args.filename, args.size, args.keys, args.mix,
+            args.operations, variant=args.tree)
+    elif args.command == "replay":
+        results = bench_replay(args.filename, args.view)
+        print("%d operations  %d instructions  read %.3fs (%.0f ops/s)  "
+            "replay %.3fs (%.0f ops/s)" % (results["operations"],
+            results["instructions"], results["read_seconds"],
+            results["operations"] / results["read_seconds"],
+            results["replay_seconds"],
+            results["operations"] / results["replay_seconds"]))
+    elif args.command == "workload":
+        measure = metrics.Metrics() if args.metrics else None
+        results = bench_workloads(args.structures, args.sizes, args.keys,
+            args.mixes, args.operations, not args.no_memory, args.seed,
+            measure)
+        for result in results:
+            peak = result["peak_bytes"]
+            print("%-6s %8d %-8s %-12s %12.0f ops/s  p50 %8.2fus  "
+                "p99 %8.2fus  %s" % (result["structure"], result["size"],
+                result["keys"], result["mix"], result["ops_per_sec"], 
+                result["p50_us"], result["p99_us"], "-" if peak == None 
+                else "%.1f MiB" % (peak / 2 ** 20)))
+
+        if measure != None:
+            print()
+            print(measure.report())
+
+        if args.json != None:
+            with open(args.json, "w") as file:
+                json.dump({"environment": environment(), "results": results,
+                    "counters": measure.counters if measure != None 
+                    else None}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,62 @@
 """
-for node at rank i:
+array based binary min-heap. for node at rank i:
     left child is at rank 2i + 1
     right child is at rank 2i + 2
+
+DaryHeap generalises this to d children per node, and create() selects
+between these and the pairing heap in pairingheap.py behind the same
+interface.
+
+every operation takes an optional path list. when one is given, the steps
+taken are appended to it in the same (INSTRUCTION, value) format as bst.py so
+they can be visualised.
 """
-import math
 
-class BinHeap:  
+import pairingheap
 
-    def __init__(self):
+"""
+instructions describing heap operations. SWAP values are the pair of values
+exchanged.
+"""
+FIND = "FIND"
+SWAP = "SWAP"
+INSERT = "INSERT"
+DELETE = "DELETE"
+
+"""
+heap layouts that can be chosen with create().
+"""
+BINARY = "binary"
+DARY = "dary"
+PAIRING = "pairing"
+DEFAULT_ARITY = 4
+
+
+class BinHeap:
+    """
+    a binary min-heap stored in a python list.
+
+    comparisons between entries made while moving them up and down the heap
+    are added to comparisons whenever it is set to a number. it is None by
+    default, when they aren't counted and cost nothing to leave out.
+    """
+    arity = 2 #children per node
+    comparisons = None
+
+    def __init__(self, values=None):
+        """
+        parameters:
+            values (iterable of int): initial contents of the heap, heapified
+                in O(n).
+        """
         self.heap = []
 
+        if values != None:
+            self.heapify(values)
+
+    def __len__(self):
+        return len(self.heap)
+
     def get_height(self):
         """
         function to get the height of the heap if respresented
@@ -18,102 +65,548 @@ class BinHeap:
         returns (int):
             the height of the heap represented as a tree.
         """
-        return math.floor(math.log(len(self.heap), 2)) + 1
+        return len(self.heap).bit_length()
+
+    def parent_of(self, index):
+        """
+        returns (int):
+            the rank of the parent of the entry at index. -1 for the root.
+        """
+        return (index - 1) // 2
+
+    def add_entry(self, value):
+        """
+        append a value to the end of the heap without restoring heap-order.
+        """
+        self.heap.append(value)
+
+    def remove_last(self):
+        """
+        remove and return the value at the end of the heap.
+        """
+        return self.heap.pop()
+
+    def swap(self, first, second, path):
+        """
+        exchange the entries at two ranks of the heap.
+
+        parameters:
+            first, second (int): the ranks to exchange.
+            path [(string, (int, int))]: records the swap if not None.
+        """
+        heap = self.heap
+        heap[first], heap[second] = heap[second], heap[first]
+
+        if path != None:
+            path.append((SWAP, (heap[second], heap[first])))
+
+    def count_up(self, start, end):
+        """
+        count the comparisons upheap made moving an entry from rank start to
+        rank end: one for each level it rose and one that stopped it, unless
+        it reached the root.
+        """
+        count = 1 if end > 0 else 0
+
+        while start != end:
+            start = self.parent_of(start)
+            count += 1
+
+        self.comparisons += count
+
+    def count_down(self, start, end):
+        """
+        count the comparisons downheap made moving an entry from rank start
+        to rank end: one with each child of every rank it passed through.
+        """
+        size = len(self.heap)
+        count = 0
+
+        while True:
+            count += min(self.arity, max(0, size - self.arity * end - 1))
+            if end == start:
+                break
+            end = self.parent_of(end)
+
+        self.comparisons += count
+
+    def upheap(self, index, path=None):
+        """
+        move the entry at index up until its parent is no larger, restoring
+        the heap-order property after an insertion.
+
+        parameters:
+            index (int): the rank of the entry to move.
+            path [(string, int)]: records the steps taken if not None.
+        """
+        heap = self.heap
+        start = index
 
-    def upheap(self):
+        while index > 0:
+            parent_index = (index - 1) // 2
+
+            if not heap[index] < heap[parent_index]:
+                break
+
+            self.swap(index, parent_index, path)
+            index = parent_index
+
+        if self.comparisons != None:
+            self.count_up(start, index)
+
+    def downheap(self, index, path=None):
         """
-        function performed after every insertion to the heap.
-        restores the heap-order property.
+        move the entry at index down until neither child is smaller,
+        restoring the heap-order property after a removal.
+
+        parameters:
+            index (int): the rank of the entry to move.
+            path [(string, int)]: records the steps taken if not None.
         """
-        current_index = len(self.heap) - 1
-        takeaway = 0
+        heap = self.heap
+        size = len(heap)
+        start = index
 
         while True:
+            smallest = index
+            left_child_index = 2 * index + 1
+            right_child_index = left_child_index + 1
+
+            if left_child_index < size and \
+                heap[left_child_index] < heap[smallest]:
+                smallest = left_child_index
+            if right_child_index < size and \
+                heap[right_child_index] < heap[smallest]:
+                smallest = right_child_index
 
-            #how much to take away to find parent
-            if current_index % 2 == 0:
-                takeaway = 2
-            else:
-                takeaway = 1
-            
-            #the parent of the current index
-            parent_index = max(int((current_index - takeaway) / 2), 0)
-
-            #examine the values at parent and child, possibly switch 
-            parent_value = self.heap[parent_index]
-            current_value = self.heap[current_index]
-
-            if current_value < parent_value:
-                self.heap[parent_index] = current_value
-                self.heap[current_index] = parent_value
-            else:
-                return True
-            
-            current_index = parent_index
-      
-    def insert(self, value):
+            if smallest == index:
+                break
+
+            self.swap(index, smallest, path)
+            index = smallest
+
+        if self.comparisons != None:
+            self.count_down(start, index)
+
+    def heapify(self, values, path=None):
+        """
+        replace the contents of the heap with values, arranging them bottom-up
+        in O(n).
+
+        parameters:
+            values (iterable of int): the new contents of the heap.
+            path [(string, int)]: records the steps taken if not None.
+        """
+        self.heap = list(values)
+
+        if path != None:
+            path.extend((INSERT, value) for value in self.heap)
+
+        for index in range(self.parent_of(len(self.heap) - 1), -1, -1):
+            self.downheap(index, path)
+
+    def push(self, value, path=None):
         """
         insert a new value into the heap structure.
 
         parameters:
             value (int): the new value to insert
+            path [(string, int)]: records the steps taken if not None.
         """
-        self.heap.append(value)
-        self.upheap()
-        print(self.heap)
+        self.add_entry(value)
+
+        if path != None:
+            path.append((INSERT, value))
 
-    def downheap(self):
+        self.upheap(len(self.heap) - 1, path)
+
+    def peek(self, path=None):
         """
-        for node at rank i:
-            left child is at rank 2i + 1
-            right child is at rank 2i + 2
+        returns (int):
+            the smallest value in the heap, without removing it.
+
+        raises (IndexError):
+            if the heap is empty.
         """
-        parent_index = 0
-        index_to_examine = 0
+        if len(self.heap) == 0:
+            raise IndexError("peek at empty heap")
+
+        if path != None:
+            path.append((FIND, self.heap[0]))
+
+        return self.heap[0]
+
+    def pop(self, path=None):
+        """
+        remove the smallest value from the heap.
+
+        parameters:
+            path [(string, int)]: records the steps taken if not None.
+
+        returns (int):
+            the value removed.
+
+        raises (IndexError):
+            if the heap is empty.
+        """
+        if len(self.heap) == 0:
+            raise IndexError("pop from empty heap")
+
+        #move the last entry to the root and let it sink
+        last_index = len(self.heap) - 1
+        if last_index > 0:
+            self.swap(0, last_index, path)
+
+        value = self.remove_last()
+
+        if path != None:
+            path.append((DELETE, value))
+
+        if len(self.heap) > 0:
+            self.downheap(0, path)
+
+        return value
+
+    def pushpop(self, value, path=None):
+        """
+        push a value then pop the smallest, faster than doing both in turn.
+
+        parameters:
+            value (int): the new value to insert.
+            path [(string, int)]: records the steps taken if not None.
+
+        returns (int):
+            the smallest of value and the heap's contents.
+        """
+        if self.comparisons != None and len(self.heap) > 0:
+            self.comparisons += 1
+
+        if len(self.heap) == 0 or not self.heap[0] < value:
+            if path != None:
+                path.append((INSERT, value))
+                path.append((DELETE, value))
+            return value
+
+        return self.replace(value, path)
+
+    def replace(self, value, path=None):
+        """
+        pop the smallest value then push a new one, faster than doing both in
+        turn. unlike pushpop the value returned may be larger than value.
+
+        parameters:
+            value (int): the new value to insert.
+            path [(string, int)]: records the steps taken if not None.
+
+        returns (int):
+            the value removed.
+
+        raises (IndexError):
+            if the heap is empty.
+        """
+        if len(self.heap) == 0:
+            raise IndexError("replace on empty heap")
+
+        #push at the back, swap into the root and let it sink
+        self.add_entry(value)
+        if path != None:
+            path.append((INSERT, value))
+
+        self.swap(0, len(self.heap) - 1, path)
+        removed = self.remove_last()
+        if path != None:
+            path.append((DELETE, removed))
+
+        self.downheap(0, path)
+        return removed
+
+
+class DaryHeap(BinHeap):
+    """
+    an array based min-heap where every node has up to d children, at ranks
+    d*i + 1 to d*i + d. wider nodes make the heap shallower, so pushes do
+    fewer swaps and the children compared on the way down sit next to each
+    other in memory.
+    """
+    def __init__(self, values=None, arity=DEFAULT_ARITY):
+        """
+        parameters:
+            values (iterable of int): initial contents of the heap.
+            arity (int): the number of children per node, at least 2.
+        """
+        if arity < 2:
+            raise ValueError("a heap needs at least two children per node")
+
+        self.arity = arity
+        super().__init__(values)
+
+    def get_height(self):
+        """
+        returns (int):
+            the height of the heap represented as a tree.
+        """
+        height = 0
+        capacity = 0
+        level_size = 1
+
+        while capacity < len(self.heap):
+            capacity += level_size
+            level_size *= self.arity
+            height += 1
+
+        return height
+
+    def parent_of(self, index):
+        return (index - 1) // self.arity
+
+    def upheap(self, index, path=None):
+        heap = self.heap
+        arity = self.arity
+        start = index
+
+        while index > 0:
+            parent_index = (index - 1) // arity
+
+            if not heap[index] < heap[parent_index]:
+                break
+
+            self.swap(index, parent_index, path)
+            index = parent_index
+
+        if self.comparisons != None:
+            self.count_up(start, index)
+
+    def downheap(self, index, path=None):
+        heap = self.heap
+        size = len(heap)
+        arity = self.arity
+        start = index
 
         while True:
-            #determine which child index to examine
-            left_child_index = 2 * parent_index + 1
-            right_child_index = 2 * parent_index + 2
+            smallest = index
+            first_child = arity * index + 1
+
+            for child in range(first_child, min(first_child + arity, size)):
+                if heap[child] < heap[smallest]:
+                    smallest = child
+
+            if smallest == index:
+                break
+
+            self.swap(index, smallest, path)
+            index = smallest
+
+        if self.comparisons != None:
+            self.count_down(start, index)
+
+
+class IndexedHeap(BinHeap):
+    """
+    a binary min-heap whose entries can be located by handle, so the priority
+    of any entry can be changed or the entry removed in O(log n). handles are
+    returned by push and stay valid until the entry leaves the heap.
+    """
+    def __init__(self, values=None):
+        """
+        parameters:
+            values (iterable of int): initial contents of the heap, given
+                handles 0, 1, 2... in order.
+        """
+        self.handles = [] #handle of the entry at each rank
+        self.positions = {} #rank of the entry with each handle
+        self.next_handle = 0
+        super().__init__(values)
 
-            if self.heap[right_child_index] != None and \
-                self.heap[right_child_index] < self.heap[left_child_index]:
-                index_to_examine = right_child_index
-            else:
-                index_to_examine = left_child_index
+    def __contains__(self, handle):
+        return handle in self.positions
 
-            #switch if necessary
-            examine_value = self.heap[index_to_examine]
-            parent_value = self.heap[parent_index]
+    def add_entry(self, value):
+        """
+        append a value to the end of the heap under a new handle.
 
-            if parent_value > examine_value:
-                self.heap[parent_index] = parent_value
-                self.heap[index_to_examine] = examine_value
+        returns (int):
+            the handle of the new entry.
+        """
+        handle = self.next_handle
+        self.next_handle += 1
+        self.positions[handle] = len(self.heap)
+        self.handles.append(handle)
+        self.heap.append(value)
+        return handle
 
-            parent_index = index_to_examine
-                            
-        
+    def remove_last(self):
+        del self.positions[self.handles.pop()]
+        return self.heap.pop()
 
+    def swap(self, first, second, path):
+        handles = self.handles
+        handles[first], handles[second] = handles[second], handles[first]
+        self.positions[handles[first]] = first
+        self.positions[handles[second]] = second
+        super().swap(first, second, path)
 
-    def remove_min(self, value):
+    def heapify(self, values, path=None):
         """
+        replace the contents of the heap with values, arranging them bottom-up
+        in O(n).
+
+        parameters:
+            values (iterable of int): the new contents of the heap.
+            path [(string, int)]: records the steps taken if not None.
+
+        returns ([int]):
+            the handle given to each value, in the order they were supplied.
         """
-        if len(self.heap) == None:
-            return False
+        self.heap = []
+        self.handles = []
+        self.positions = {}
+        handles = [self.add_entry(value) for value in values]
+
+        if path != None:
+            path.extend((INSERT, value) for value in self.heap)
+
+        for index in range(self.parent_of(len(self.heap) - 1), -1, -1):
+            self.downheap(index, path)
+
+        return handles
+
+    def push(self, value, path=None):
+        """
+        insert a new value into the heap structure.
+
+        parameters:
+            value (int): the new value to insert
+            path [(string, int)]: records the steps taken if not None.
+
+        returns (int):
+            the handle of the new entry.
+        """
+        handle = self.next_handle
+        super().push(value, path)
+        return handle
+
+    def peek_item(self, path=None):
+        """
+        returns (int, int):
+            the handle and value of the smallest entry, without removing it.
+        """
+        value = self.peek(path)
+        return (self.handles[0], value)
+
+    def pop_item(self, path=None):
+        """
+        remove the smallest entry from the heap.
+
+        returns (int, int):
+            the handle and value of the entry removed.
+        """
+        if len(self.heap) == 0:
+            raise IndexError("pop from empty heap")
+
+        handle = self.handles[0]
+        return (handle, self.pop(path))
+
+    def get(self, handle):
+        """
+        returns (int):
+            the value of the entry with handle.
+
+        raises (KeyError):
+            if no entry in the heap has that handle.
+        """
+        return self.heap[self.positions[handle]]
+
+    def decrease_key(self, handle, value, path=None):
+        """
+        lower the value of an entry and move it up to its new place.
+
+        parameters:
+            handle (int): the entry to change.
+            value (int): its new value, no larger than the current one.
+            path [(string, int)]: records the steps taken if not None.
+
+        raises (ValueError):
+            if value is larger than the entry's current value.
+        """
+        index = self.positions[handle]
+
+        if self.heap[index] < value:
+            raise ValueError("new value is larger than the current value")
+
+        self.heap[index] = value
+        if path != None:
+            path.append((FIND, value))
+        self.upheap(index, path)
+
+    def increase_key(self, handle, value, path=None):
+        """
+        raise the value of an entry and move it down to its new place.
+
+        parameters:
+            handle (int): the entry to change.
+            value (int): its new value, no smaller than the current one.
+            path [(string, int)]: records the steps taken if not None.
+
+        raises (ValueError):
+            if value is smaller than the entry's current value.
+        """
+        index = self.positions[handle]
+
+        if value < self.heap[index]:
+            raise ValueError("new value is smaller than the current value")
+
+        self.heap[index] = value
+        if path != None:
+            path.append((FIND, value))
+        self.downheap(index, path)
+
+    def remove(self, handle, path=None):
+        """
+        remove an entry from anywhere in the heap.
+
+        parameters:
+            handle (int): the entry to remove.
+            path [(string, int)]: records the steps taken if not None.
+
+        returns (int):
+            the value of the entry removed.
+        """
+        index = self.positions[handle]
+        last_index = len(self.heap) - 1
+
+        #fill the hole with the last entry, which may need to go either way
+        if index != last_index:
+            self.swap(index, last_index, path)
+
+        value = self.remove_last()
+        if path != None:
+            path.append((DELETE, value))
+
+        if index < len(self.heap):
+            self.upheap(index, path)
+            self.downheap(index, path)
 
-        #make last element first one
-        self.heap[0] = self.heap[len(self.heap) - 1]
+        return value
 
-        self.downheap()
-        
 
-heap = BinHeap()
+def create(kind=BINARY, values=None, arity=DEFAULT_ARITY):
+    """
+    function to make an empty or prefilled min-heap of a chosen layout. every
+    layout offers push, pop, peek, pushpop, replace and heapify.
 
-heap.insert(3)
-heap.insert(4)
-heap.insert(6)
-heap.insert(2)
-heap.insert(1)
+    parameters:
+        kind (string): BINARY, DARY or PAIRING.
+        values (iterable of int): initial contents of the heap.
+        arity (int): the number of children per node of a DARY heap.
 
+    returns (BinHeap or PairingHeap):
+        the new heap.
+    """
+    if kind == BINARY:
+        return BinHeap(values)
+    elif kind == DARY:
+        return DaryHeap(values, arity)
+    elif kind == PAIRING:
+        return pairingheap.PairingHeap(values)
 
-        
\ No newline at end of file
+    raise ValueError("unknown heap kind: %s" % kind)
@@ -3,8 +3,9 @@ binary search tree implementation. contains all basic functionality
 required to operate the tree.
 """
 
-import copy
 import sys
+from bisect import bisect_left
+from collections import deque
 
 """
 instructions describing all binary search tree operations. used to describe the
@@ -24,8 +25,11 @@ class Node:
     """
     class representing a node in a binary tree structure.
     nodes have a value plus a left and right child, which can
-    be None or another node
+    be None or another node. each node also caches the height and size of the
+    subtree rooted at it, which tree operations keep up to date with update().
     """
+    __slots__ = ("value", "left", "right", "height", "size")
+
     def __init__(self, value, left=None, right=None):
         """
         parameters:
@@ -34,6 +38,11 @@ class Node:
         self.value = value
         self.left = left
         self.right = right
+        self.height = 1
+        self.size = 1
+
+        if left != None or right != None:
+            update(self)
     
     def one_child(self):
         """
@@ -70,6 +79,19 @@ class Node:
         """      
         return self.left != None and self.right != None
 
+    def new_node(self, value):
+        """
+        create a node living in the same storage as this one. lets the tree
+        functions grow trees whose nodes aren't plain Node objects.
+
+        parameters:
+            value (int): the value the new node stores.
+
+        returns (Node):
+            a new childless node.
+        """
+        return Node(value)
+
     """
     getters and setters
     """
@@ -92,6 +114,41 @@ class Node:
         return self.right
 
 
+def node_height(node):
+    """
+    returns (int):
+        the cached height of the subtree rooted at node (0 for an empty tree).
+    """
+    return 0 if node == None else node.height
+
+
+def node_size(node):
+    """
+    returns (int):
+        the cached number of nodes in the subtree rooted at node.
+    """
+    return 0 if node == None else node.size
+
+
+def update(node):
+    """
+    recompute the cached height and size of a node from its children. must be
+    called bottom-up on every node whose children changed.
+
+    parameters:
+        node (Node): the node to refresh.
+    """
+    left = node.left
+    right = node.right
+    left_height = 0 if left == None else left.height
+    right_height = 0 if right == None else right.height
+
+    node.height = 1 + (left_height if left_height > right_height 
+        else right_height)
+    node.size = 1 + (0 if left == None else left.size) + \
+        (0 if right == None else right.size)
+
+
 def create(value):
     """
     function to initialise an empty binary search tree.
@@ -102,9 +159,120 @@ def create(value):
     return Node(value)
 
 
+def build(values, presorted=False):
+    """
+    construct a perfectly balanced binary search tree from a collection of
+    values in one pass, without inserting them one at a time.
+
+    parameters:
+        values (iterable of int): the values to store. duplicates are dropped.
+        presorted (bool): the values are already in ascending order, so the
+            O(n log n) sort can be skipped.
+
+    returns (Node):
+        the root of the new tree. None if there were no values.
+    """
+    if presorted:
+        ordered = []
+        for value in values:
+            if len(ordered) == 0 or ordered[-1] != value:
+                ordered.append(value)
+    else:
+        ordered = sorted(set(values))
+
+    if len(ordered) == 0:
+        return None
+
+    #(first index, last index, parent, attach as left child)
+    root = None
+    stack = [(0, len(ordered) - 1, None, False)]
+
+    while len(stack) > 0:
+        low, high, parent, is_left = stack.pop()
+        if low > high:
+            continue
+
+        middle = (low + high) // 2
+        node = Node(ordered[middle])
+
+        #halves never differ by more than one node, so the subtree's shape
+        #follows from how many nodes it holds
+        node.size = high - low + 1
+        node.height = node.size.bit_length()
+
+        if parent == None:
+            root = node
+        elif is_left:
+            parent.left = node
+        else:
+            parent.right = node
+
+        stack.append((low, middle - 1, node, True))
+        stack.append((middle + 1, high, node, False))
+
+    return root
+
+
+def from_preorder(values):
+    """
+    rebuild a binary search tree from the values of its nodes in preorder,
+    giving back the same shape rather than a balanced tree. each node is
+    pushed and popped from a stack of nodes still waiting for a right child
+    at most once, so this takes O(n).
+
+    parameters:
+        values (iterable of int): the values in preorder, e.g. from
+            preorder() or a saved snapshot.
+
+    returns (Node):
+        the root of the tree. None if there were no values.
+
+    raises (ValueError):
+        if the values are not the preorder of a binary search tree.
+    """
+    root = None
+    nodes = [] #every node, in preorder
+    stack = [] #nodes that may still get a right child, values ascending up
+    lower = None #values must be larger than the last node given a right child
+
+    for value in values:
+        if lower != None and value <= lower:
+            raise ValueError("values are not the preorder of a binary "
+                "search tree")
+
+        node = Node(value)
+        nodes.append(node)
+
+        if root == None:
+            root = node
+        elif value < stack[-1].value:
+            stack[-1].left = node
+        else:
+            #the new node hangs right of the last node it is larger than
+            parent = stack.pop()
+            while len(stack) > 0 and stack[-1].value < value:
+                parent = stack.pop()
+            if parent.value == value or (len(stack) > 0 and 
+                stack[-1].value == value):
+                raise ValueError("values are not the preorder of a binary "
+                    "search tree")
+            parent.right = node
+            lower = parent.value
+
+        stack.append(node)
+
+    #descendants come after their ancestors in preorder
+    for node in reversed(nodes):
+        if node.left != None or node.right != None:
+            update(node)
+
+    return root
+
+
 def h_delete(root, value, path):
     """
-    attempts to delete the node with a specified value in the tree
+    attempts to delete the node with a specified value in the tree. the tree is
+    descended iteratively so degenerate trees don't exhaust the call stack.
 
     parameters:
         root (Node): the tree to delete from
@@ -117,33 +285,53 @@ def h_delete(root, value, path):
         tree will be returned in an identical state if the value
         requested for deletion does not exist.
     """
-    #value not found
-    if root == None:
-        path.append((NOT_FOUND, value))
-        return (root, path)
+    ancestors = [] #nodes whose cached height/size may change
+    parent = None
+    current = root
+
+    while current != None:
+        current_value = current.get_value()
+
+        if current_value < value:
+            path.append((SEARCH, current_value))
+            ancestors.append(current)
+            parent, current = current, current.get_right_child()
+            continue
+        elif current_value > value:
+            path.append((SEARCH, current_value))
+            ancestors.append(current)
+            parent, current = current, current.get_left_child()
+            continue
 
-    if root.get_value() < value:
-        path.append((SEARCH, root.get_value()))
-        root.right, path = h_delete(root.get_right_child(), value, path)
-    elif root.get_value() > value:
-        path.append((SEARCH, root.get_value()))
-        root.left, path = h_delete(root.get_left_child(), value, path)
-    else:
         #this is the one to delete
-        if root.no_children():
-            path.append((DELETE, value))
-            root = None
-        elif root.one_child():
-            child = root.one_child()
-            path.append((DELETE, root.get_value()))
-            root = child
+        if current.both_children():
+            #swap with the successor, then carry on down the right subtree
+            #where the value now lives in a node with at most one child
+            minimum_node = min_node(current.right)
+            path.append((SWAP, (current_value, minimum_node.get_value())))
+            current.set_value(minimum_node.get_value())
+            minimum_node.set_value(current_value)
+            ancestors.append(current)
+            parent, current = current, current.get_right_child()
+            continue
+
+        path.append((DELETE, current_value))
+        replacement = current.one_child()
+
+        if parent == None:
+            root = replacement
+        elif parent.left == current:
+            parent.set_left_child(replacement)
         else:
-            minimum_node = min_node(root.right)
-            root_value = root.get_value()
-            path.append((SWAP, (root_value, minimum_node.get_value())))
-            root.set_value(minimum_node.get_value())
-            minimum_node.set_value(root_value)
-            root.right, path = h_delete(root.right, root_value, path)
+            parent.set_right_child(replacement)
+
+        for ancestor in reversed(ancestors):
+            update(ancestor)
+
+        return (root, path)
+
+    #value not found
+    path.append((NOT_FOUND, value))
     return (root, path)
 
 
@@ -158,50 +346,79 @@ def delete(root, value):
     returns (Node, [(string, int)], int, int):
         1st value is the new tree (possibly unchanged). 2nd is the operations
         taken to perform this action on the tree. 3rd is height of tree after
-        operation. 4th is the level the newly inserted node is located on.
+        operation. 4th is the level the deleted value is located on, which is
+        always -sys.maxsize since it is no longer in the tree.
     """
     if root == None:
-        return (root, [(NOT_FOUND, value)])
+        return (root, [(NOT_FOUND, value)], 0, -sys.maxsize)
 
     root, path = h_delete(root, value, [])
-    height = get_height(root)
-    level = get_level(root, value) 
 
-    return (root, path, height, level)
+    return (root, path, node_height(root), -sys.maxsize)
 
 
-def h_insert(root, value, path):
+def h_insert(root, value, path, max_height=sys.maxsize):
     """
-    helper function to insert a node into a binary search tree.
+    helper function to insert a node into a binary search tree. the tree is
+    descended iteratively so degenerate trees don't exhaust the call stack.
 
     parameters:
         root (Node): the tree to insert into
         value (int): the value to try and insert into the tree
         path [(string, int)]: the path and operations taken to perform the
         insertion
+        max_height (int): the new node is not attached if it would make the
+            tree taller than this.
 
     returns (Node, [(string, int)]):
         the binary search tree with the new node inserted.
         if a duplicate is encountered, the tree will be returned
         in an identical state. second arg is the path and operations taken to 
-        perform the insertion.
+        perform the insertion. if the insert was refused because of
+        max_height the path ends on a SEARCH instruction and the tree is
+        untouched.
     """
     if root == None:
         path.append((INSERT, value))
         return (Node(value), path)
 
-    #make no changes if duplicate found
-    if root.get_value() == value:
-        path.append((DUPLICATE, value))
-        return (root, path)
+    ancestors = []
+    current = root
+
+    while True:
+        current_value = current.get_value()
 
-    path.append((SEARCH, root.get_value()))
+        #make no changes if duplicate found
+        if current_value == value:
+            path.append((DUPLICATE, value))
+            return (root, path)
 
-    if root.get_value() < value:
-        root.right, path = h_insert(root.right, value, path)
-    elif root.get_value() > value:
-        root.left, path = h_insert(root.left, value, path)
+        path.append((SEARCH, current_value))
+        ancestors.append(current)
 
+        if current_value < value:
+            child = current.right
+        else:
+            child = current.left
+
+        if child != None:
+            current = child
+            continue
+
+        #new node would sit one level below the deepest ancestor
+        if len(ancestors) + 1 > max_height:
+            return (root, path)
+
+        if current_value < value:
+            current.set_right_child(current.new_node(value))
+        else:
+            current.set_left_child(current.new_node(value))
+        break
+
+    for ancestor in reversed(ancestors):
+        update(ancestor)
+
+    path.append((INSERT, value))
     return (root, path)
 
 
@@ -222,16 +439,221 @@ def insert(root, value, max_height):
     if root == None:
         return (Node(value), [(INSERT, value)], 1, 0)
 
-    root, path = h_insert(root, value, [])
+    root, path = h_insert(root, value, [], max_height)
+
+    #the insert was refused before touching the tree
+    if path[-1][0] == SEARCH:
+        return (root, [], node_height(root), -sys.maxsize)
+
+    #every step before the last is a SEARCH of an ancestor
+    return (root, path, node_height(root), len(path) - 1)
+
+
+def insert_many(root, values, max_height):
+    """
+    insert a batch of values into a binary search tree. the values are
+    inserted in ascending order and each descent resumes from the deepest
+    ancestor of the previous insert that can still hold the next value, so
+    shared parts of the descent are only walked once.
+
+    parameters:
+        root (Node): the tree to insert into.
+        values (iterable of int): the values to try and insert.
+        max_height (int): values that would make the tree taller than this
+            are skipped.
+
+    returns (Node, [(string, int)], int):
+        1st value is the new tree. 2nd is the operations taken to insert every
+        value, with each descent starting from the node it resumed at. 3rd is
+        height of tree after the batch.
+    """
+    ordered = sorted(set(values))
+    path = []
+
+    if len(ordered) == 0:
+        return (root, path, node_height(root))
+
+    if root == None:
+        root = Node(ordered[0])
+        path.append((INSERT, ordered[0]))
+        ordered = ordered[1:]
+
+    #(node, upper bound on values in its subtree) from the root down. cached
+    #heights are refreshed as nodes are popped, once nothing below can change
+    stack = [(root, None)]
+
+    for value in ordered:
+        while stack[-1][1] != None and value >= stack[-1][1]:
+            update(stack.pop()[0])
+
+        node, high = stack[-1]
+
+        while True:
+            if node.value == value:
+                path.append((DUPLICATE, value))
+                break
+
+            path.append((SEARCH, node.value))
+
+            if node.value < value:
+                child = node.right
+                child_high = high
+            else:
+                child = node.left
+                child_high = node.value
+
+            if child == None:
+                #new node would sit one level below the deepest ancestor
+                if len(stack) + 1 > max_height:
+                    break
+
+                child = node.new_node(value)
+                if node.value < value:
+                    node.set_right_child(child)
+                else:
+                    node.set_left_child(child)
+                path.append((INSERT, value))
+                stack.append((child, child_high))
+                break
+
+            stack.append((child, child_high))
+            node, high = child, child_high
+
+    while len(stack) > 0:
+        update(stack.pop()[0])
+
+    return (root, path, node_height(root))
+
+
+def delete_many(root, values):
+    """
+    delete a batch of values from a binary search tree. the values are
+    deleted in ascending order and each descent resumes from the deepest
+    ancestor of the previous delete that is still in the tree and can hold 
+    the next value, so shared parts of the descent are only walked once.
+
+    parameters:
+        root (Node): the tree to delete from.
+        values (iterable of int): the values to search for and delete.
+
+    returns (Node, [(string, int)], int):
+        1st value is the new tree. 2nd is the operations taken to delete every
+        value, in ascending order of value, with each descent starting from 
+        the node it resumed at. 3rd is height of tree after the batch.
+    """
+    path = []
+
+    #(node, upper bound on values in its subtree) from the root down. cached
+    #heights are refreshed as nodes are popped, once nothing below can change
+    stack = []
+
+    for value in sorted(set(values)):
+        while len(stack) > 0 and stack[-1][1] != None and \
+            value >= stack[-1][1]:
+            update(stack.pop()[0])
+
+        if len(stack) == 0:
+            if root == None:
+                path.append((NOT_FOUND, value))
+                continue
+            stack.append((root, None))
+
+        #the descent starts again from the deepest ancestor left
+        node, high = stack.pop()
+        swapped = None #depth of the stack above a node given its successor
+
+        while node != None:
+            if node.value < value:
+                path.append((SEARCH, node.value))
+                stack.append((node, high))
+                node = node.right
+                continue
+            elif node.value > value:
+                path.append((SEARCH, node.value))
+                stack.append((node, high))
+                node, high = node.left, node.value
+                continue
+
+            if node.both_children():
+                #swap with the successor, then carry on down the right subtree
+                #where the value now lives in a node with at most one child
+                minimum_node = min_node(node.right)
+                path.append((SWAP, (value, minimum_node.value)))
+                node.set_value(minimum_node.value)
+                minimum_node.set_value(value)
+                stack.append((node, high))
+                swapped = len(stack)
+                node = node.right
+                continue
+
+            path.append((DELETE, value))
+            replacement = node.one_child()
+
+            if len(stack) == 0:
+                root = replacement
+            elif stack[-1][0].left == node:
+                stack[-1][0].set_left_child(replacement)
+            else:
+                stack[-1][0].set_right_child(replacement)
+            break
+        else:
+            path.append((NOT_FOUND, value))
+
+        #values in the subtree right of a node given its successor are now 
+        #bounded below by the successor, so later descents don't resume in it
+        while swapped != None and len(stack) > swapped:
+            update(stack.pop()[0])
+
+    while len(stack) > 0:
+        update(stack.pop()[0])
 
-    height = get_height(root)
-    level = get_level(root, value)
+    return (root, path, node_height(root))
 
-    if height > max_height:
-        root, path, height, level = delete(root, value)
-        path = []
 
-    return (root, path, height, level)
+def search_many(root, values):
+    """
+    search a binary search tree for a batch of values in a single traversal.
+    the values are split at every node so each node on the way to any of them
+    is visited once.
+
+    parameters:
+        root (Node): the tree to search.
+        values (iterable of int): the values to try and locate.
+
+    returns (Node, [(string, int)]):
+        the tree, and the path taken to search for every value. nodes holding
+        a requested value are reported with FIND, nodes passed through with
+        SEARCH and values missing from the tree with NOT_FOUND.
+    """
+    ordered = sorted(set(values))
+    path = []
+
+    #(subtree, first and one past last index of the values it may hold)
+    stack = [(root, 0, len(ordered))]
+
+    while len(stack) > 0:
+        node, low, high = stack.pop()
+        if low >= high:
+            continue
+
+        if node == None:
+            for index in range(low, high):
+                path.append((NOT_FOUND, ordered[index]))
+            continue
+
+        split = bisect_left(ordered, node.value, low, high)
+        after = split
+
+        if split < high and ordered[split] == node.value:
+            path.append((FIND, node.value))
+            after += 1
+        else:
+            path.append((SEARCH, node.value))
+
+        stack.append((node.right, after, high))
+        stack.append((node.left, low, split))
+
+    return (root, path)
 
 
 def h_search(root, value, path):
@@ -247,23 +669,25 @@ def h_search(root, value, path):
     returns ((string, int)...):
         the path taken in performing this search operation on the tree.
     """
-    #value can't be found in the tree
-    if root == None:
-        path.append((NOT_FOUND, value))
-        return path
+    current = root
 
-    root_value = root.get_value()
+    while current != None:
+        current_value = current.get_value()
 
-    #determine which node to search next
-    if root_value == value:
-        path.append((FIND, value))
-        return path
-    else:
-        path.append((SEARCH, root_value))
-        if root_value < value:
-            return h_search(root.get_right_child(), value, path)
+        if current_value == value:
+            path.append((FIND, value))
+            return path
+
+        #determine which node to search next
+        path.append((SEARCH, current_value))
+        if current_value < value:
+            current = current.get_right_child()
         else:
-            return h_search(root.get_left_child(), value, path)
+            current = current.get_left_child()
+
+    #value can't be found in the tree
+    path.append((NOT_FOUND, value))
+    return path
 
 
 def search(root, value):
@@ -297,10 +721,10 @@ def min_node(root):
     returns (Node):
         the node with the lowest value in the tree
     """
-    if root.left == None:
-        return root
+    while root.left != None:
+        root = root.left
 
-    return min_node(root.left)
+    return root
 
 
 def get_level(root, value):
@@ -312,17 +736,21 @@ def get_level(root, value):
         value (int): the value to be located in the tree.
 
     returns (int):
-        the level that the given node is on in the tree.
+        the level that the given node is on in the tree. -sys.maxsize if the
+        value is not in the tree.
     """
-    if root == None:
-        return -sys.maxsize
-    
-    if value < root.value:
-        return 1 + get_level(root.get_left_child(), value)
-    elif value > root.value:
-        return 1 + get_level(root.get_right_child(), value)
+    level = 0
+
+    while root != None:
+        if value < root.value:
+            root = root.get_left_child()
+        elif value > root.value:
+            root = root.get_right_child()
+        else:
+            return level
+        level += 1
 
-    return 0
+    return -sys.maxsize
 
 
 def get_height(root):
@@ -335,10 +763,152 @@ def get_height(root):
     returns (int):
         the height of the binary tree (leaf node height = 1).
     """
-    if root == None:
-        return 0
+    return node_height(root)
+
+def morris_step(current):
+    """
+    advance a morris traversal by one step. threads are added to the right
+    child of in-order predecessors on the way down and removed on the way
+    back up, so the tree is restored once the walk reaches the end.
+
+    parameters:
+        current (Node): the node the walk is at.
+
+    returns (Node, int, int):
+        the next node to visit, the value visited in order at this step and
+        the value visited in preorder at this step. either value is None if
+        nothing was visited in that order.
+    """
+    if current.left == None:
+        return (current.right, current.value, current.value)
+
+    predecessor = current.left
+    while predecessor.right != None and predecessor.right != current:
+        predecessor = predecessor.right
+
+    #first time here, thread the predecessor back to us and go left
+    if predecessor.right == None:
+        predecessor.right = current
+        return (current.left, None, current.value)
+
+    #back from the left subtree, remove the thread
+    predecessor.right = None
+    return (current.right, current.value, None)
+
+
+def iter_morris(root, preorder):
+    """
+    stream an inorder or preorder traversal using O(1) extra memory. the tree
+    is temporarily threaded while the traversal runs and must not be changed
+    until the generator is exhausted or closed.
+
+    parameters:
+        root (Node): the tree on which the traversal will be performed
+        preorder (bool): visit in preorder rather than inorder.
+
+    returns (generator of (string, int)):
+        the path taken to perform this traversal.
+    """
+    current = root
+
+    try:
+        while current != None:
+            current, inorder_value, preorder_value = morris_step(current)
+            value = preorder_value if preorder else inorder_value
+
+            if value != None:
+                yield (SEARCH, value)
+    finally:
+        #finish the walk without visiting so no threads are left behind
+        while current != None:
+            current = morris_step(current)[0]
+
+
+def iter_inorder(root, morris=False):
+    """
+    lazily perform an inorder traversal of the given binary search tree.
+
+    parameters:
+        root (Node): the tree on which the traversal will be performed
+        morris (bool): use a morris traversal, needing no stack at all.
+
+    returns (generator of (string, int)):
+        the path taken to perform this traversal.
+    """
+    if morris:
+        yield from iter_morris(root, False)
+        return
+
+    stack = []
+    current = root
+
+    while current != None or len(stack) > 0:
+        while current != None:
+            stack.append(current)
+            current = current.left
+
+        current = stack.pop()
+        yield (SEARCH, current.value)
+        current = current.right
+
+
+def iter_preorder(root, morris=False):
+    """
+    lazily perform a preorder traversal of the given binary search tree.
+
+    parameters:
+        root (Node): the tree on which the traversal will be performed
+        morris (bool): use a morris traversal, needing no stack at all.
+
+    returns (generator of (string, int)):
+        the path taken to perform this traversal.
+    """
+    if morris:
+        yield from iter_morris(root, True)
+        return
+
+    stack = [root] if root != None else []
+
+    while len(stack) > 0:
+        current = stack.pop()
+        yield (SEARCH, current.value)
+
+        if current.right != None:
+            stack.append(current.right)
+        if current.left != None:
+            stack.append(current.left)
+
+
+def iter_postorder(root):
+    """
+    lazily perform a postorder traversal of the given binary search tree.
+
+    parameters:
+        root (Node): the tree on which the traversal will be performed
+
+    returns (generator of (string, int)):
+        the path taken to perform this traversal.
+    """
+    stack = []
+    current = root
+    last_visited = None
+
+    while current != None or len(stack) > 0:
+        while current != None:
+            stack.append(current)
+            current = current.left
+
+        top = stack[-1]
+
+        #go right first unless we've just come back from there
+        if top.right != None and top.right != last_visited:
+            current = top.right
+            continue
+
+        stack.pop()
+        yield (SEARCH, top.value)
+        last_visited = top
 
-    return max(1 + get_height(root.left), 1 + get_height(root.right))
 
 def inorder(root):
     """
@@ -350,15 +920,7 @@ def inorder(root):
     returns ((string, int)):
         the path taken to perform this traversal.
     """
-    if root == None:
-        return []
-
-    left_list = inorder(root.left)
-    middle_value = root.value
-    right_list = inorder(root.right)
-
-    
-    return left_list + [(SEARCH, middle_value)] + right_list
+    return list(iter_inorder(root))
 
 
 def preorder(root):
@@ -371,17 +933,10 @@ def preorder(root):
     returns ((string, int)):
         the path taken to perform this traversal.
     """
-    if root == None:
-        return []
-
-    middle_value = root.value
-    left_list = preorder(root.left)
-    right_list = preorder(root.right)
+    return list(iter_preorder(root))
 
-    return [(SEARCH, middle_value)] + left_list + right_list
 
-
-def postorder(root):    
+def postorder(root):
     """
     perform a postorder traversal on a given binary search tree.
 
@@ -391,14 +946,7 @@ def postorder(root):
     returns ((string, int)):
         the path taken to perform this traversal.
     """
-    if root == None:
-        return []
-
-    left_list = postorder(root.left)
-    right_list = postorder(root.right)
-    middle_value = root.value
-
-    return left_list + right_list + [(SEARCH, middle_value)]
+    return list(iter_postorder(root))
 
 
 def level_values(root, level):
@@ -407,37 +955,81 @@ def level_values(root, level):
 
     parameters:
         root (Node): the binary search tree to get the values for
-        level (int): the level to get the values for in the tree
+        level (int): the level to get the values for in the tree (root = 1)
 
     returns ([int]):
         the list of values at the requested level in the search tree
     """
-    if root == None:
-        return []
-    elif level == 1:
-        return [root.get_value()]
+    level_nodes = [root] if root != None else []
+
+    while level > 1 and len(level_nodes) > 0:
+        next_level = []
+        for node in level_nodes:
+            if node.left != None:
+                next_level.append(node.left)
+            if node.right != None:
+                next_level.append(node.right)
+
+        level_nodes = next_level
+        level -= 1
 
-    return level_values(root.left, level - 1) + \
-        level_values(root.right, level - 1)
+    return [node.value for node in level_nodes]
 
 
-def breadth_first(root):
+def iter_breadth_first(root):
     """
-    performs a breadth-first traversal of a given binary tree
+    lazily perform a breadth-first traversal of a given binary tree.
 
     parameters:
         root (Node): the binary tree to perform the traversal on
 
-    returns ((string, int)):
+    returns (generator of (string, int)):
         the path taken to perform this traversal.
     """
-    height = get_height(root)
-    node_values = []
-    level = 1
+    queue = deque()
 
-    while level <= height:
-        node_values += map(lambda value: (SEARCH, value), 
-            level_values(root, level))
-        level += 1
+    if root != None:
+        queue.append(root)
+
+    while len(queue) > 0:
+        node = queue.popleft()
+        yield (SEARCH, node.value)
+
+        if node.left != None:
+            queue.append(node.left)
+        if node.right != None:
+            queue.append(node.right)
+
+
+def breadth_first(root, by_level=False):
+    """
+    performs a breadth-first traversal of a given binary tree, visiting every
+    node exactly once.
+
+    parameters:
+        root (Node): the binary tree to perform the traversal on
+        by_level (bool): group the path into one list per level of the tree.
+
+    returns ((string, int)):
+        the path taken to perform this traversal. if by_level is set, a list
+        holding the path for each level from the root down.
+    """
+    if not by_level:
+        return list(iter_breadth_first(root))
+
+    levels = []
+    level_nodes = [root] if root != None else []
+
+    while len(level_nodes) > 0:
+        levels.append([(SEARCH, node.value) for node in level_nodes])
+        next_level = []
+
+        for node in level_nodes:
+            if node.left != None:
+                next_level.append(node.left)
+            if node.right != None:
+                next_level.append(node.right)
+
+        level_nodes = next_level
 
-    return node_values
\ No newline at end of file
+    return levels
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+struct-of-arrays storage for binary search trees. every node lives at an
+integer handle indexing parallel typed arrays, so a tree costs a few dozen
+bytes per key instead of a full python object per node. ArrayNode is a small
+handle exposing the same interface as bst.Node, so the functions in bst.py
+(insert, delete, search, traversals) work on these trees unchanged.
+"""
+
+from array import array
+
+"""
+handle used in the child arrays to mark a missing child.
+"""
+NO_NODE = -1
+
+
+class ArrayTree:
+    """
+    the storage backing one or more array trees. values are stored as signed
+    64 bit integers. handles of deleted nodes are not reused.
+    """
+    __slots__ = ("values", "lefts", "rights", "heights", "sizes")
+
+    def __init__(self):
+        self.values = array("q")
+        self.lefts = array("i")
+        self.rights = array("i")
+        self.heights = array("i")
+        self.sizes = array("i")
+
+    def allocate(self, value):
+        """
+        append a new childless node to the storage.
+
+        parameters:
+            value (int): the value the new node stores.
+
+        returns (ArrayNode):
+            a handle to the new node.
+        """
+        handle = len(self.values)
+        self.values.append(value)
+        self.lefts.append(NO_NODE)
+        self.rights.append(NO_NODE)
+        self.heights.append(1)
+        self.sizes.append(1)
+        return ArrayNode(self, handle)
+
+    def node(self, handle):
+        """
+        returns (ArrayNode):
+            the node stored at handle, or None for NO_NODE.
+        """
+        if handle == NO_NODE:
+            return None
+        return ArrayNode(self, handle)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class ArrayNode:
+    """
+    handle to a node stored in an ArrayTree. handles are created on demand
+    and compare equal when they refer to the same slot.
+    """
+    __slots__ = ("tree", "handle")
+
+    def __init__(self, tree, handle):
+        """
+        parameters:
+            tree (ArrayTree): the storage this node lives in.
+            handle (int): the index of this node in the storage arrays.
+        """
+        self.tree = tree
+        self.handle = handle
+
+    def __eq__(self, other):
+        if not isinstance(other, ArrayNode):
+            return NotImplemented
+        return self.handle == other.handle and self.tree is other.tree
+
+    def __hash__(self):
+        return hash((id(self.tree), self.handle))
+
+    """
+    fields of bst.Node, read from and written to the storage arrays
+    """
+    @property
+    def value(self):
+        return self.tree.values[self.handle]
+
+    @value.setter
+    def value(self, value):
+        self.tree.values[self.handle] = value
+
+    @property
+    def left(self):
+        return self.tree.node(self.tree.lefts[self.handle])
+
+    @left.setter
+    def left(self, left):
+        self.tree.lefts[self.handle] = NO_NODE if left == None else left.handle
+
+    @property
+    def right(self):
+        return self.tree.node(self.tree.rights[self.handle])
+
+    @right.setter
+    def right(self, right):
+        self.tree.rights[self.handle] = NO_NODE if right == None else \
+            right.handle
+
+    @property
+    def height(self):
+        return self.tree.heights[self.handle]
+
+    @height.setter
+    def height(self, height):
+        self.tree.heights[self.handle] = height
+
+    @property
+    def size(self):
+        return self.tree.sizes[self.handle]
+
+    @size.setter
+    def size(self, size):
+        self.tree.sizes[self.handle] = size
+
+    def one_child(self):
+        """
+        returns (ArrayNode):
+            the one child if found. None if the node doesn't have exactly one
+            child.
+        """
+        left = self.tree.lefts[self.handle]
+        right = self.tree.rights[self.handle]
+
+        if left != NO_NODE and right == NO_NODE:
+            return self.tree.node(left)
+        elif left == NO_NODE and right != NO_NODE:
+            return self.tree.node(right)
+
+        return None
+
+    def no_children(self):
+        return self.tree.lefts[self.handle] == NO_NODE and \
+            self.tree.rights[self.handle] == NO_NODE
+
+    def both_children(self):
+        return self.tree.lefts[self.handle] != NO_NODE and \
+            self.tree.rights[self.handle] != NO_NODE
+
+    def new_node(self, value):
+        return self.tree.allocate(value)
+
+    """
+    getters and setters
+    """
+    def set_value(self, value):
+        self.value = value
+
+    def set_left_child(self, left):
+        self.left = left
+
+    def set_right_child(self, right):
+        self.right = right
+
+    def get_value(self):
+        return self.value
+
+    def get_left_child(self):
+        return self.left
+
+    def get_right_child(self):
+        return self.right
+
+
+def create(value, tree=None):
+    """
+    function to initialise an array backed binary search tree.
+
+    parameters:
+        value (int): the value stored at the root.
+        tree (ArrayTree): storage to allocate the root in. a new one is created
+            if not given.
+
+    returns (ArrayNode):
+        the root of the new tree. pass it to the functions in bst.py like any
+        other root.
+    """
+    if tree == None:
+        tree = ArrayTree()
+    return tree.allocate(value)
@@ -4,9 +4,29 @@ describe a node in the context of the gui and BSTView to handle the display of
 the entire tree.
 """
 
-import PySimpleGUI as sg
 import math
 import time
+from collections import deque
+
+"""
+speed limits for the animation speed control, and the timing of node movement.
+"""
+from animation import DEFAULT_SPEED, MIN_SPEED, MAX_SPEED, Tween
+
+"""
+works out where each node of the tree belongs.
+"""
+from layout import TidyLayout, MIN_SEPARATION
+
+"""
+the part of the tree shown on the graph.
+"""
+from viewport import Viewport
+
+"""
+backends the tree is drawn with.
+"""
+from renderer import GraphRenderer, RecordingRenderer
 
 
 """
@@ -18,11 +38,15 @@ NODE_RADIUS = 19
 GRAPH_BORDER = 50
 GRAPH_DRAWABLE_DIMENSIONS = (GRAPH_DIMENSION - 2 * GRAPH_BORDER, 
     GRAPH_DIMENSION - 2 * GRAPH_BORDER)
-ROOT_COORDS = (((GRAPH_DIMENSION - 2 * GRAPH_BORDER) / 2) + GRAPH_BORDER, 
-    GRAPH_DIMENSION - GRAPH_BORDER)
 
-HEIGHT_LIMIT = 5
-NODE_Y_GAP = GRAPH_DRAWABLE_DIMENSIONS[0] / (HEIGHT_LIMIT - 1)
+PATH_LOOKBACK = 1 #number of executed instructions kept while animating
+MAX_NODE_SPACING = 4 * NODE_RADIUS #widest gap between neighbouring nodes
+MAX_NODE_Y_GAP = GRAPH_DRAWABLE_DIMENSIONS[1] / 4
+MIN_NODE_RADIUS = 4 #below this, narrow subtrees are drawn as glyphs
+MIN_LABEL_RADIUS = 8 #nodes smaller than this are too small to label
+GLYPH_SIZE = 16 #smallest width and height of a glyph summarising a subtree
+GLYPH_LABEL_SIZE = (64, 30) #room kept clear around each glyph's label
+MAX_DRAWN_NODES = 400 #nodes below the first this many are summarised
 
 """
 colours for various animations
@@ -37,13 +61,22 @@ DELETE_NODE_COLOUR = "purple4"
 THEME = "DarkBlue"
 NODE_SWAP_COLOUR = "goldenrod2"
 NODE_DUP_COLOUR = "midnight blue"
+GLYPH_COLOUR = "grey60"
+GLYPH_TEXT_COLOUR = "grey30"
 
 """
 error messages
 """
 NOT_FOUND_MESSAGE = "Value not found in tree"
 DUPLICATE_MESSAGE = "Value already exists in tree"
-MAX_HEIGHT_MESSAGE = "Tree exceeds maximum height"
+SNAPSHOT_MESSAGE = "Could not open snapshot"
+
+"""
+files trees are saved to, as offered by the open and save dialogs
+"""
+SNAPSHOT_EXTENSION = ".bst"
+SNAPSHOT_FILE_TYPES = (("Tree snapshots", "*" + SNAPSHOT_EXTENSION),
+    ("All files", "*.*"))
 
 """
 identifiers for our gui elements. will also be the name of events that happen
@@ -54,6 +87,21 @@ BST_GRAPH = "BST_TREE_CANVAS"
 BST_METHOD = "BST_METHOD"
 BST_ACTION_VAL = "BST_ACTION_VAL"
 BST_FORWARD = "BST_FORWARD"
+BST_PAUSE = "BST_PAUSE"
+BST_SKIP = "BST_SKIP"
+BST_SPEED = "BST_SPEED"
+BST_ZOOM_IN = "BST_ZOOM_IN"
+BST_ZOOM_OUT = "BST_ZOOM_OUT"
+BST_FIT = "BST_FIT"
+BST_DRAG_END = BST_GRAPH + "+UP"
+BST_WHEEL = BST_GRAPH + "+WHEEL"
+BST_WHEEL_UP = BST_GRAPH + "+WHEEL_UP"
+BST_WHEEL_DOWN = BST_GRAPH + "+WHEEL_DOWN"
+BST_OPEN_FILE = "BST_OPEN_FILE"
+BST_SAVE_FILE = "BST_SAVE_FILE"
+BST_UNDO = "BST_UNDO"
+BST_REDO = "BST_REDO"
+BST_HISTORY = "BST_HISTORY"
 
 """
 methods on bst tree
@@ -65,6 +113,10 @@ BST_BFS = "BFS"
 BST_PREORDER = "Preorder"
 BST_POSTORDER = "Postorder"
 BST_INORDER = "Inorder"
+BST_LOAD = "Load"
+BST_OPEN = "Open" #replaces the tree with one from a snapshot
+BST_GOTO = "Goto" #returns to a version of the tree in its history
+BST_TREE = "Tree" #starts again from an empty tree of another variant
 
 """
 instructions describing all binary search tree operations. used to describe the
@@ -79,35 +131,111 @@ DUPLICATE = "DUPLICATE"
 DELETE = "DELETE"
 RESTRUCTURE = "RESTRUCTURE"
 
+"""
+instructions after which the shape of the tree may have changed
+"""
+CHANGES = (SWAP, INSERT, DELETE, RESTRUCTURE)
+
 
 
 
 """
-code defining the structure of the gui so it can be displayed by PySimpleGUI.
+labels of the pause button
 """
-sg.theme(THEME)
-
-INPUT_LAYOUT = [
-    [sg.Text("Binary search tree")],
-    [sg.OptionMenu(values=(BST_INSERT, BST_DELETE, BST_SEARCH, BST_BFS, 
-        BST_PREORDER, BST_INORDER, BST_POSTORDER), 
-        default_value=BST_INSERT, key=BST_METHOD)
-    ],
-    [sg.Input(key=BST_ACTION_VAL, enable_events=True), 
-        sg.Button("Perform action", enable_events=True, key=BST_TREE_ACTION)
+PAUSE_LABEL = "Pause"
+RESUME_LABEL = "Resume"
+
+
+
+
+def changed_values(path):
+    """
+    work out which nodes an operation may have moved from the path it took,
+    so the layout only redoes those. every node whose children an operation
+    replaces is searched past, swapped, inserted, deleted or rotated, so its
+    value is in the path.
+
+    parameters:
+        path (iterable of (string, int)): the instructions of the operation.
+
+    returns (set of int):
+        the values in the path, empty if it changed nothing. None if the path
+        is a generator, which can't be looked through without using it up.
+    """
+    if not isinstance(path, list):
+        return None
+
+    if not any(instruction in CHANGES for instruction, _ in path):
+        return set()
+
+    values = set()
+    for instruction, operand in path:
+        if instruction in (SWAP, RESTRUCTURE):
+            values.update(operand)
+        else:
+            values.add(operand)
+
+    return values
+
+
+def build_layout():
+    """
+    code defining the structure of the gui so it can be displayed by 
+    PySimpleGUI. PySimpleGUI is only imported here, so the view can be used 
+    without a display when it is given some other renderer.
+
+    returns ([[PSG::Element]]):
+        a new layout for the window.
+    """
+    import PySimpleGUI as sg
+
+    sg.theme(THEME)
+
+    input_layout = [
+        [sg.Text("Binary search tree")],
+        [sg.OptionMenu(values=(BST_INSERT, BST_DELETE, BST_SEARCH, BST_BFS, 
+            BST_PREORDER, BST_INORDER, BST_POSTORDER, BST_LOAD), 
+            default_value=BST_INSERT, key=BST_METHOD)
+        ],
+        [sg.Input(key=BST_ACTION_VAL, enable_events=True), 
+            sg.Button("Perform action", enable_events=True, 
+                key=BST_TREE_ACTION)
+        ],
+        [sg.Button(PAUSE_LABEL, enable_events=True, key=BST_PAUSE),
+            sg.Button("Step", enable_events=True, key=BST_FORWARD),
+            sg.Button("Skip to end", enable_events=True, key=BST_SKIP),
+            sg.Text("Steps per second"),
+            sg.Slider(range=(MIN_SPEED, MAX_SPEED), 
+                default_value=DEFAULT_SPEED, resolution=MIN_SPEED, 
+                orientation="h", enable_events=True, key=BST_SPEED)
+        ],
+        [sg.Button("Zoom in", enable_events=True, key=BST_ZOOM_IN),
+            sg.Button("Zoom out", enable_events=True, key=BST_ZOOM_OUT),
+            sg.Button("Fit", enable_events=True, key=BST_FIT),
+            sg.Text("Drag the tree to pan, scroll to zoom")
+        ],
+        [sg.Button("Open snapshot", enable_events=True, key=BST_OPEN_FILE),
+            sg.Button("Save snapshot", enable_events=True, key=BST_SAVE_FILE)
+        ],
+        [sg.Button("Undo", enable_events=True, key=BST_UNDO),
+            sg.Button("Redo", enable_events=True, key=BST_REDO),
+            sg.Text("History"),
+            sg.Slider(range=(0, 0), default_value=0, resolution=1, 
+                orientation="h", enable_events=True, key=BST_HISTORY)
+        ]
     ]
-]
 
-GRAPHING_LAYOUT = [
-    sg.Graph(
-        GRAPH_DIMENSIONS, (0,0), GRAPH_DIMENSIONS,
-        background_color=BACKGROUND_COLOUR, 
-        key=BST_GRAPH, 
-        enable_events=True 
-    )
-]
+    graphing_layout = [
+        sg.Graph(
+            GRAPH_DIMENSIONS, (0,0), GRAPH_DIMENSIONS,
+            background_color=BACKGROUND_COLOUR, 
+            key=BST_GRAPH, 
+            enable_events=True,
+            drag_submits=True
+        )
+    ]
 
-LAYOUT = INPUT_LAYOUT + [GRAPHING_LAYOUT]
+    return input_layout + [graphing_layout]
 
 
 
@@ -115,28 +243,38 @@ LAYOUT = INPUT_LAYOUT + [GRAPHING_LAYOUT]
 class BSTNode:
     """
     a class describing a node positioned on the graph element. includes
-    coordinates as well as lines connecting nodes.
+    coordinates as well as lines connecting nodes. the figures are kept for as
+    long as the node is on the graph and updated in place.
     """
+    __slots__ = ("node_id", "text_id", "line_id", "line_coords", "x_coord", 
+        "y_coord", "radius", "level", "value", "colour", "parent")
+
     def __init__(self, node_id, text_id, level, x_coord, 
-            y_coord, radius, value):
+            y_coord, radius, value, colour=NEUTRAL_COLOUR):
         """
         parameters:
             node_id (int): the pysimplegui id returned from calling 
                 create_circle.
-            text_id (int): the pysimplegui id returned from calling create_text
+            text_id (int): the pysimplegui id returned from calling create_text,
+                or None if the node is too small to be labelled.
             level (int): the level this node is located at in the tree.
             x_coord, y_coord (int): coordinates for the center of this node on 
                 the graph.
             radius (int): the radius of this node on the graph.
             value (int): the value this node holds.
+            colour (string): the fill colour of the node's circle.
         """
         self.node_id = node_id
         self.text_id = text_id
+        self.line_id = None #line up to the parent node, if any
+        self.line_coords = None #end points of that line
         self.x_coord = x_coord
         self.y_coord = y_coord
         self.radius = radius
         self.level = level
         self.value = value
+        self.colour = colour
+        self.parent = None #BSTNode the line goes up to, if any
 
 
     """
@@ -200,126 +338,544 @@ class BSTView:
     """
     this is a class capable of displaying a binary search tree upon a PSG graph
     element and performing various animations to display the process of
-    performing various actions on the tree.
+    performing various actions on the tree. given a renderer instead of a 
+    window, it draws with that and needs no display.
     """
-    def __init__(self, window):
+    def __init__(self, window=None, renderer=None):
         """
         initialise the view of the BST
 
         parameters:
             window (PSG::Window): the window to draw the app in.
+            renderer (GraphRenderer or RecordingRenderer): what to draw with.
+                defaults to the window's graph, or a RecordingRenderer if 
+                there is no window.
         """
         self.window = window
-        self.graph = None
-        self.setup_window()
+        self.graph = None #the PSG graph element, if there is a window
+        self.renderer = renderer
+
+        if window != None:
+            self.setup_window()
+        if self.renderer == None:
+            self.renderer = RecordingRenderer()
+
         self.tree_vals = {} #mapping of node values to BSTNode objects
+        self.message_ids = [] #error messages currently on the graph
+        self.animation = None #(steps, level, tree, changed values) playing
+        self.history = deque(maxlen=PATH_LOOKBACK)
+        self.tween = None #timing of the nodes currently moving
+        self.tween_duration = 0 #seconds nodes moved by a step take to settle
+        self.moves = [] #(value, start, end, parent, x space, level) of nodes
+        self.label_moves = [] #[text id, start, end, position] of labels
+        self.label_swaps = [] #pairs of nodes exchanging labels once moved
+        self.layout = TidyLayout()
+        self.viewport = Viewport(GRAPH_DIMENSION, GRAPH_DIMENSION, 
+            GRAPH_BORDER, MAX_NODE_SPACING, MAX_NODE_Y_GAP)
+        self.tree_model = None #tree last drawn
+        self.glyphs = {} #(figure ids, state) of each summarised subtree
+        self.x_space = NODE_RADIUS #space each node had in the last layout
+        self.y_gap = MAX_NODE_Y_GAP #gap between levels in the last layout
 
     def setup_window(self):
         """
         when the window is passed in at initialisation, this function will apply
         the layout to it so that it can be displayed.
         """
-        self.window.layout(LAYOUT)
+        self.window.layout(build_layout())
         self.window.finalize()
         self.graph = self.window[BST_GRAPH]
 
-    def get_x_space(self, level):
+        if self.renderer == None:
+            self.renderer = GraphRenderer(self.graph, self.window)
+
+        #windows and mac report the wheel as one event, x11 as two buttons
+        self.graph.bind("<MouseWheel>", BST_WHEEL[len(BST_GRAPH):])
+        self.graph.bind("<Button-4>", BST_WHEEL_UP[len(BST_GRAPH):])
+        self.graph.bind("<Button-5>", BST_WHEEL_DOWN[len(BST_GRAPH):])
+
+    def compute_layout(self, tree_model):
         """
-        get the space available to a node in the x-direction based on its level
-        in the tree.
+        work out where the nodes of a tree that can be seen belong on the 
+        graph. subtrees off the graph, too narrow for their nodes to be told
+        apart or beyond the first MAX_DRAWN_NODES nodes are summarised by 
+        glyphs instead. only the nodes drawn are visited, so this is quick
+        however large the tree is.
 
         parameters:
-            level (int): the level this node is located at.
+            tree_model (bst.Node): the tree to lay out, which must have been
+                passed to self.layout.update.
+
+        returns ([(int, float, float, int, float, int)], 
+            [(Node, [(float, float)], string, (float, float), int, 
+            (float, float))]):
+            1st value is the value, x and y coordinates, level, x space and 
+            parent value of each node on the graph, parents before children.
+            2nd is the root of each summarised subtree with the corners of 
+            its glyph, the glyph's label (None if there is no room for it) 
+            and where it goes, the value of its parent and the parent's 
+            coordinates.
+        """
+        viewport = self.viewport
+        node_space = min(NODE_RADIUS, viewport.scale * MIN_SEPARATION / 2)
+        min_width = 0.0
+
+        #nodes would be too small to see, so narrow subtrees are summarised
+        if node_space < MIN_NODE_RADIUS:
+            min_width = GLYPH_SIZE / viewport.scale
+
+        self.x_space = max(node_space, MIN_NODE_RADIUS)
+        self.y_gap = viewport.level_gap
+        low, high = viewport.visible_x(NODE_RADIUS)
+        placed, hidden = self.layout.positions(tree_model, low, high, 
+            viewport.last_level(NODE_RADIUS), min_width, MAX_DRAWN_NODES)
+
+        nodes = []
+        for node, x, level, parent in placed:
+            draw_x, draw_y = viewport.to_screen(x, level)
+            nodes.append((node.value, draw_x, draw_y, level, self.x_space,
+                parent.value if parent != None else None))
+
+        glyphs = []
+        labelled = set() #cells of the graph already holding a glyph's label
+        half = GLYPH_SIZE / 2
+
+        for node, x, level, parent in hidden:
+            shape = self.layout.shapes[node]
+            draw_x, draw_y = viewport.to_screen(x, level)
+
+            #glyphs cover the area the subtree's nodes would have been drawn in
+            left = min(draw_x + shape.min_x * viewport.scale, draw_x - half)
+            right = max(draw_x + shape.max_x * viewport.scale, draw_x + half)
+            bottom = min(draw_y - (shape.height - 1) * viewport.level_gap,
+                draw_y - GLYPH_SIZE)
+
+            #subtrees entirely off the graph are summarised at its edge
+            if right < 0 or left > GRAPH_DIMENSION or draw_y < 0 or \
+                bottom > GRAPH_DIMENSION:
+                draw_x = min(max(draw_x, GLYPH_SIZE), 
+                    GRAPH_DIMENSION - GLYPH_SIZE)
+                draw_y = min(max(draw_y, GLYPH_SIZE), GRAPH_DIMENSION)
+                left = draw_x - half
+                right = draw_x + half
+                bottom = draw_y - GLYPH_SIZE
+            else:
+                left = max(left, 0)
+                right = min(right, GRAPH_DIMENSION)
+                bottom = max(bottom, 0)
+                draw_x = min(max(draw_x, left), right)
+                draw_y = min(draw_y, GRAPH_DIMENSION)
+
+            points = [(draw_x, draw_y), (left, bottom), (right, bottom)]
+
+            label = None
+            label_coords = ((left + right) / 2, max(bottom - 
+                GLYPH_LABEL_SIZE[1] / 2, GLYPH_LABEL_SIZE[1] / 2))
+            cells = [(cell_x, cell_y) 
+                for cell_x in range(int((label_coords[0] - 
+                    GLYPH_LABEL_SIZE[0] / 2) // GLYPH_LABEL_SIZE[0]),
+                    int((label_coords[0] + GLYPH_LABEL_SIZE[0] / 2) // 
+                    GLYPH_LABEL_SIZE[0]) + 1)
+                for cell_y in range(int((label_coords[1] - 
+                    GLYPH_LABEL_SIZE[1] / 2) // GLYPH_LABEL_SIZE[1]),
+                    int((label_coords[1] + GLYPH_LABEL_SIZE[1] / 2) // 
+                    GLYPH_LABEL_SIZE[1]) + 1)]
+
+            #labels that would overlap one already placed are left off
+            if not any(cell in labelled for cell in cells):
+                labelled.update(cells)
+                label = str(node.value)
+                if node.size > 1:
+                    label = "%d\n%s..%s" % (node.size, shape.first.value,
+                        shape.last.value)
+
+            parent_value = None
+            parent_coords = None
+            if parent != None:
+                parent_value = parent.value
+                parent_coords = viewport.to_screen(
+                    x + self.layout.shapes[parent].offset * 
+                    (1 if node.value < parent.value else -1), level - 1)
+
+            glyphs.append((node, points, label, label_coords, parent_value, 
+                parent_coords))
+
+        return (nodes, glyphs)
+
+
+    def remove_node(self, value):
+        """
+        delete every figure belonging to a node from the graph.
+
+        parameters:
+            value (int): the value of the node to remove.
+        """
+        view_node = self.tree_vals.pop(value)
+        self.renderer.delete_figure(view_node.node_id)
+        if view_node.text_id != None:
+            self.renderer.delete_figure(view_node.text_id)
+        self.remove_line(view_node)
 
-        returns (int):
-            the space available to the node in the x direction.
+
+    def remove_line(self, view_node):
+        """
+        delete the line connecting a node to its parent, if there is one.
+        """
+        if view_node.line_id != None:
+            self.renderer.delete_figure(view_node.line_id)
+            view_node.line_id = None
+            view_node.line_coords = None
+
+
+    def remove_glyph(self, value):
+        """
+        delete the glyph summarising a subtree from the graph.
+
+        parameters:
+            value (int): the value at the root of the subtree.
         """
-        return GRAPH_DRAWABLE_DIMENSIONS[0] / (2 * (2 ** level))
+        figure_ids, _ = self.glyphs.pop(value)
+        for figure_id in figure_ids:
+            self.renderer.delete_figure(figure_id)
 
 
-    def h_redraw_from_model(self, root, parent, level):
+    def draw_glyph(self, node, points, label, label_coords, parent_value,
+        parent_coords):
         """
-        a recursive helper function for redraw_from_model.
+        draw a glyph standing in for a whole subtree, labelled with how many 
+        nodes it holds and the smallest and largest of their values. a glyph
+        that is already on the graph is only redrawn if it has changed.
 
         parameters:
-            root (Node): the bst to draw on the graph
-            parent (Node): the parent node of the current root node
-            level (int): the level that root node is on in the greater tree
+            node (Node): the root of the subtree.
+            points ([(float, float)]): the corners of the glyph, the first 
+                being where it hangs from its parent.
+            label (string): the summary of the subtree, or None for no label.
+            label_coords (float, float): where the label is centred.
+            parent_value (int): the value of the subtree's parent, or None.
+            parent_coords (float, float): where the parent is drawn.
         """
-        #nothing more to draw
-        if root == None:
+        state = (points, label, label_coords, parent_coords)
+        glyph = self.glyphs.get(node.value)
+
+        if glyph != None and glyph[1] == state:
             return
-        
-        draw_x = ROOT_COORDS[0]
-        draw_y = ROOT_COORDS[1]
-        x_offset = self.get_x_space(level)
-        parent_value = None
-
-        if parent != None:
-            parent_value = parent.value
-            parent_viewnode = self.tree_vals[parent_value]
-
-            if root.value > parent.value:
-                draw_x = parent_viewnode.x_coord + x_offset
-                draw_y = parent_viewnode.y_coord - NODE_Y_GAP
-            else:
-                draw_x = parent_viewnode.x_coord - x_offset
-                draw_y = parent_viewnode.y_coord - NODE_Y_GAP
-      
-        self.draw_node(draw_x, draw_y, root.value, parent_value, 
-            NEUTRAL_COLOUR, x_offset, level)
+        if glyph != None:
+            self.remove_glyph(node.value)
+
+        figure_ids = [self.renderer.draw_polygon(points, fill_color=GLYPH_COLOUR)]
 
-        self.h_redraw_from_model(root.left, root, level + 1)
-        self.h_redraw_from_model(root.right, root, level + 1)
-            
+        if label != None:
+            figure_ids.append(self.renderer.draw_text(label, label_coords, 
+                color=GLYPH_TEXT_COLOUR))
 
-    def redraw_from_model(self, tree_model):
+        #lines run from the middle of the parent, so keep them underneath
+        if parent_value != None:
+            line_id = self.renderer.draw_line(parent_coords, points[0])
+            self.renderer.send_figure_to_back(line_id)
+            figure_ids.append(line_id)
+
+        self.glyphs[node.value] = (figure_ids, state)
+
+
+    def clear_messages(self):
+        """
+        remove any error messages from the graph.
+        """
+        for message_id in self.message_ids:
+            self.renderer.delete_figure(message_id)
+        self.message_ids = []
+
+
+    def redraw_from_model(self, tree_model, duration=0, refit=False, 
+        changed=None):
         """
-        given the underlying model of a bst, erases the current tree from the 
-        graph and redraws it. used after after animation to restore the tree to
-        its most recent state
+        given the underlying model of a bst, brings the graph in line with it
+        after an animation. figures of nodes that are unchanged are left alone,
+        moved nodes are moved and recoloured nodes recoloured, so the work done
+        is proportional to what changed rather than the size of the tree.
 
         parameters:
             tree_model (bst.Node): a recursive representation of the bst defined
             in bst.py
+            duration (float): seconds moved nodes take to glide into their new
+                places, drawn by step_frame. 0 moves them straight away.
+            refit (bool): fit the whole tree on the graph, even if the user 
+                has zoomed or panned.
+            changed (iterable of int): the values of the nodes the tree has
+                changed around since it was last drawn, from changed_values.
+                None if they aren't known, when the whole tree is checked.
+        """
+        self.tree_model = tree_model
+        self.layout.update(tree_model, changed)
+
+        if refit or self.viewport.fitted:
+            self.viewport.fit(*self.layout.bounds(tree_model))
+
+        self.draw_visible(duration)
+
+
+    def draw_visible(self, duration=0):
+        """
+        bring the graph in line with the part of the last tree drawn that is
+        in the viewport.
+
+        parameters:
+            duration (float): seconds moved nodes take to glide into their new
+                places, drawn by step_frame. 0 moves them straight away.
+        """
+        self.end_tween()
+        self.clear_messages()
+        layout, glyphs = self.compute_layout(self.tree_model)
+        present = set(entry[0] for entry in layout)
+        summarised = set(glyph[0].value for glyph in glyphs)
+        moving = set()
+
+        for value in [value for value in self.glyphs 
+            if value not in summarised]:
+            self.remove_glyph(value)
+
+        for value in [value for value in self.tree_vals 
+            if value not in present]:
+            self.remove_node(value)
+
+        for value, draw_x, draw_y, level, x_offset, parent_value in layout:
+            view_node = self.tree_vals.get(value)
+            start = (draw_x, draw_y)
+            if duration > 0 and view_node != None:
+                start = view_node.get_coords()
+
+            self.draw_node(start[0], start[1], value, parent_value, 
+                NEUTRAL_COLOUR, x_offset, level)
+
+            if parent_value == None:
+                self.remove_line(self.tree_vals[value])
+                self.tree_vals[value].parent = None
+
+            #lines to the children of a moving node have to follow it
+            if start != (draw_x, draw_y) or parent_value in moving:
+                moving.add(value)
+                self.moves.append((value, start, (draw_x, draw_y), 
+                    parent_value, x_offset, level))
+
+        for glyph in glyphs:
+            self.draw_glyph(*glyph)
+
+        if len(self.moves) > 0:
+            self.tween = Tween(time.monotonic(), duration)
+
+
+    def pan(self, dx, dy):
+        """
+        move the tree across the graph. while an animation plays the graph 
+        catches up once it has finished.
+
+        parameters:
+            dx, dy (float): pixels to move the tree right and up by.
+        """
+        self.viewport.pan(dx, dy)
+        if not self.animating():
+            self.draw_visible()
+
+
+    def zoom(self, factor, anchor=None):
+        """
+        zoom the graph in or out around a point on it.
+
+        parameters:
+            factor (float): how many times larger to draw the tree.
+            anchor (float, float): graph coordinates to keep still. defaults
+                to the middle of the graph.
         """
-        self.graph.erase() #erase all figures from graph
-        self.tree_vals = {}
+        self.viewport.zoom(factor, anchor)
+        if not self.animating():
+            self.draw_visible()
 
-        if tree_model == None:
+
+    def fit(self):
+        """
+        zoom and pan so the whole tree fits on the graph, and keep it fitted
+        as it changes.
+        """
+        self.viewport.fit(*self.layout.bounds(self.tree_model))
+        if not self.animating():
+            self.draw_visible()
+
+
+    def tweening(self):
+        """
+        returns (bool):
+            true while nodes or labels are moving into place.
+        """
+        return self.tween != None
+
+
+    def draw_frame(self, progress):
+        """
+        put every moving node and label where it should be at some point of
+        the current movement.
+
+        parameters:
+            progress (float): how far along the movement is, from 0 to 1.
+        """
+        for value, start, end, parent_value, x_space, level in self.moves:
+            self.draw_node(start[0] + (end[0] - start[0]) * progress,
+                start[1] + (end[1] - start[1]) * progress, value, 
+                parent_value, self.tree_vals[value].colour, x_space, level)
+
+        for label_move in self.label_moves:
+            text_id, start, end, position = label_move
+            new_position = (start[0] + (end[0] - start[0]) * progress,
+                start[1] + (end[1] - start[1]) * progress)
+            self.renderer.move_figure(text_id, new_position[0] - position[0],
+                new_position[1] - position[1])
+            label_move[3] = new_position
+
+
+    def step_frame(self):
+        """
+        draw the next frame of the current movement, wherever the nodes should
+        be at this moment. a frame that comes late skips ahead rather than
+        slowing the movement down.
+
+        returns (bool):
+            true if the movement is not yet finished.
+        """
+        if self.tween == None:
+            return False
+
+        progress = self.tween.progress(time.monotonic())
+        if progress >= 1:
+            self.end_tween()
+            return False
+
+        self.draw_frame(progress)
+        return True
+
+
+    def end_tween(self):
+        """
+        move everything still moving straight to where it belongs.
+        """
+        if self.tween == None:
             return
 
-        self.h_redraw_from_model(tree_model, None, 0)
+        self.draw_frame(1)
+
+        #each label has moved onto the node it now belongs to
+        for node1, node2 in self.label_swaps:
+            node1.text_id, node2.text_id = node2.text_id, node1.text_id
+
+        self.tween = None
+        self.moves = []
+        self.label_moves = []
+        self.label_swaps = []
 
 
-    def animation_loop(self, path, height, level, tree_model):
+    def start_animation(self, path, height, level, tree_model):
         """
-        function to automatically animate a binary search tree operation
+        get ready to animate a binary search tree operation one step at a time
+        with step_animation. any animation still playing is skipped to its 
+        end first.
 
         parameters:
-            path ([(string, int)]): the list of instructions to process in the
-                animation.
+            path (iterable of (string, int)): the instructions to process in 
+                the animation. may be a generator, which is consumed one 
+                instruction at a time as the animation plays.
             height (int): the height of the tree.
             level (int): the level of the node that is being acted upon in this
                 animation process.
             tree_model (Node): recursive representation of the tree.
+
+        returns (bool):
+            true if there is an animation to play.
+        """
+        self.finish_animation()
+
+        self.animation = (iter(path), level, tree_model, 
+            changed_values(path))
+        self.history = deque(maxlen=PATH_LOOKBACK) #most recent instructions
+        return True
+
+
+    def animating(self):
+        """
+        returns (bool):
+            true while an animation started by start_animation is unfinished.
+        """
+        return self.animation != None
+
+
+    def step_animation(self, duration=0):
+        """
+        play the next instruction of the current animation. once there are
+        none left the tree is restored to the state of the model.
+
+        parameters:
+            duration (float): seconds nodes moved by this step take to get 
+                into place, drawn by step_frame. 0 moves them straight away.
+
+        returns (bool):
+            true if the animation may have more steps to play.
+        """
+        if self.animation == None:
+            return False
+
+        self.end_tween()
+        self.tween_duration = duration
+        path, level, tree_model, changed = self.animation
+        current = next(path, None)
+
+        if current == None:
+            self.animation = None
+            self.history.clear()
+            self.redraw_from_model(tree_model, duration, changed=changed)
+            return False
+
+        previous = self.history[-1] if len(self.history) > 0 else None
+        self.animate_path(previous, current, level)
+        self.history.append(current)
+        return True
+
+
+    def finish_animation(self):
+        """
+        skip whatever is left of the current animation and show the tree in
+        its final state.
         """
-        if height > HEIGHT_LIMIT:
+        self.end_tween()
+
+        if self.animation == None:
             return
 
-        previous = None
-        current = None
+        _, _, tree_model, changed = self.animation
+        self.animation = None
+        self.history.clear()
+        self.redraw_from_model(tree_model, changed=changed)
+
 
-        while len(path) > 0:
-            
-            current = path[0]
-            self.animate_path(previous, current, level)
-            self.window.refresh()
-            time.sleep(1)
+    def animation_loop(self, path, height, level, tree_model, delay=1):
+        """
+        function to automatically animate a binary search tree operation,
+        blocking until it has finished. the gui drives animations through
+        start_animation and step_animation instead so it stays responsive.
 
-            previous = path.pop(0)
+        parameters:
+            path (iterable of (string, int)): the instructions to process in 
+                the animation.
+            height (int): the height of the tree.
+            level (int): the level of the node that is being acted upon in this
+                animation process.
+            tree_model (Node): recursive representation of the tree.
+            delay (float): seconds to wait after each step.
+        """
+        if not self.start_animation(path, height, level, tree_model):
+            return
 
-        self.redraw_from_model(tree_model)
+        while self.step_animation():
+            self.renderer.refresh()
+            if delay > 0:
+                time.sleep(delay)
 
 
     def animate_path(self, previous, current, level):
@@ -352,7 +908,7 @@ class BSTView:
         elif instruction == DELETE:
             self.animate_delete(current)
         elif instruction == RESTRUCTURE:
-            self.animate_swap(current)
+            self.animate_rotation(current)
 
 
     def display_error_string(self, display_string):
@@ -363,33 +919,33 @@ class BSTView:
         parameters:
             display_string (string): the error message to display to the user.
         """
-        self.graph.draw_text(display_string, 
-            (3 * GRAPH_BORDER, GRAPH_DIMENSION - GRAPH_BORDER))
+        self.message_ids.append(self.renderer.draw_text(display_string, 
+            (3 * GRAPH_BORDER, GRAPH_DIMENSION - GRAPH_BORDER)))
 
 
     def animate_delete(self, new_instruction):
         """
         animate the process of deleting a node from the tree. not really much
-        of an animation but simply involves removing the node from the view
+        of an animation but simply involves highlighting the node, which is 
+        removed from the view once the tree is redrawn.
 
         parameters:
             new_instruction (string, int): the new instruction to process. the
                 string is the name of the instruction and the int is the value 
                 of the node to delete.
         """
-        delete_value = new_instruction[1]
-        delete_node = self.tree_vals[delete_value]
-        delete_coords = delete_node.get_coords()
+        view_node = self.tree_vals.get(new_instruction[1])
 
-        self.draw_node(delete_coords[0], delete_coords[1], delete_value, None, 
-            DELETE_NODE_COLOUR, self.get_x_space(delete_node.level), 
-            delete_node.level)
+        #nodes outside the viewport aren't drawn
+        if view_node != None:
+            self.recolour_node(view_node, DELETE_NODE_COLOUR)
 
 
     def animate_swap(self, new_instruction):
         """
         when deleting, node values sometimes need to be swapped. this function 
-        animates that process.
+        animates that process by sliding the labels of the two nodes past each
+        other.
 
         parameters:
             new_instruction (string, (int, int)): the new instruction to
@@ -397,20 +953,120 @@ class BSTView:
                 the two ints are the values to swap on the tree.
         """
         swap_vals = new_instruction[1]
-        node1 = self.tree_vals[swap_vals[0]]
-        node2 = self.tree_vals[swap_vals[1]]
+        node1 = self.tree_vals.pop(swap_vals[0], None)
+        node2 = self.tree_vals.pop(swap_vals[1], None)
+
+        #either node may be outside the viewport and not drawn
+        if node1 != None:
+            node1.value = swap_vals[1]
+            self.tree_vals[node1.value] = node1
+        if node2 != None:
+            node2.value = swap_vals[0]
+            self.tree_vals[node2.value] = node2
+
+        swapped = [view_node for view_node in (node1, node2) 
+            if view_node != None]
+
+        for view_node in swapped:
+            self.recolour_node(view_node, NODE_SWAP_COLOUR)
+
+        if self.tween_duration <= 0 or len(swapped) < 2 or node1 is node2 \
+            or node1.text_id == None or node2.text_id == None:
+            for view_node in swapped:
+                self.set_text(view_node.text_id, view_node.value)
+            return
 
-        node1_coords = node1.get_coords()
-        node2_coords = node2.get_coords()
+        #labels pass over other nodes on their way, so keep them on top
+        for start_node, end_node in ((node1, node2), (node2, node1)):
+            self.renderer.bring_figure_to_front(start_node.text_id)
+            self.label_moves.append([start_node.text_id, 
+                start_node.get_coords(), end_node.get_coords(), 
+                start_node.get_coords()])
 
-        tmp_node1_val = node1.value
-        node1.value = node2.value
-        node2.value = tmp_node1_val
+        self.label_swaps.append((node1, node2))
+        self.tween = Tween(time.monotonic(), self.tween_duration)
 
-        self.draw_node(node1_coords[0], node1_coords[1], node1.value, 
-            None, NODE_SWAP_COLOUR, 2 * node1.radius, node1.level)
-        self.draw_node(node2_coords[0], node2_coords[1], node2.value, 
-            None, NODE_SWAP_COLOUR, 2 * node2.radius, node2.level)
+
+    def animate_rotation(self, new_instruction):
+        """
+        animate a rotation by moving the pivot and its subtree up into the 
+        place of the node rotated, and the node and its other subtree down to
+        the pivot's other side. the subtree between them slides across to 
+        hang from the node, so every line joins a parent to a child on the 
+        correct side throughout. nodes take their places in the tidy layout 
+        once the animation ends.
+
+        parameters:
+            new_instruction (string, (int, int)): the new instruction to
+                process. the string is simply the name of the instruction and
+                the two ints are the values of the node rotated down and the
+                child rotated up in its place.
+        """
+        value, pivot_value = new_instruction[1]
+        node = self.tree_vals.get(value)
+        pivot = self.tree_vals.get(pivot_value)
+
+        #either node may be outside the viewport and not drawn
+        if node == None or pivot == None or pivot.parent is not node:
+            return
+
+        children = {} #drawn children of each drawn node, by id
+        for view_node in self.tree_vals.values():
+            if view_node.parent != None:
+                children.setdefault(id(view_node.parent), []).append(view_node)
+
+        #the pivot's child on the side of the node moves across to it
+        inner = None
+        for child in children.get(id(pivot), []):
+            if (pivot_value < child.value) == (pivot_value < value):
+                inner = child
+
+        node_x, node_y = node.get_coords()
+        pivot_x, pivot_y = pivot.get_coords()
+        down_x = node_x + (node_x - pivot_x)
+        shifts = {id(pivot): (node_x - pivot_x, node_y - pivot_y, -1), 
+            id(node): (node_x - pivot_x, pivot_y - node_y, 1)}
+        if inner != None:
+            shifts[id(inner)] = (down_x - (inner.x_coord - pivot_x) - 
+                inner.x_coord, 0, 0)
+
+        #parents are moved before their children so lines follow them
+        parents = {id(pivot): node.parent, id(node): pivot}
+        if inner != None:
+            parents[id(inner)] = node
+        queue = deque([pivot])
+
+        if node.parent == None:
+            self.remove_line(pivot)
+            pivot.parent = None
+
+        while len(queue) > 0:
+            view_node = queue.popleft()
+            dx, dy, levels = shifts[id(view_node)]
+            parent = parents.get(id(view_node), view_node.parent)
+            start = view_node.get_coords()
+
+            view_node.level += levels
+            self.moves.append((view_node.value, start, (start[0] + dx, 
+                start[1] + dy), parent.value if parent != None else None, 
+                view_node.radius, view_node.level))
+
+            for child in children.get(id(view_node), []):
+                if child is node or child is pivot or child is inner:
+                    continue
+                shifts.setdefault(id(child), shifts[id(view_node)])
+                queue.append(child)
+            if view_node is pivot:
+                queue.append(node)
+            elif view_node is node and inner != None:
+                queue.append(inner)
+
+        for view_node in (node, pivot):
+            self.recolour_node(view_node, NODE_SWAP_COLOUR)
+
+        self.tween = Tween(time.monotonic(), self.tween_duration)
+        if self.tween_duration <= 0:
+            self.end_tween()
 
 
     def animate_access(self, new_instruction, colour):
@@ -423,12 +1079,11 @@ class BSTView:
             colour (string): the node could be part of a search path or could be
                 the value being searched for. each has a different colour.
         """
-        search_val = new_instruction[1]
-        search_node = self.tree_vals[search_val]
-        coords = search_node.get_coords()
+        view_node = self.tree_vals.get(new_instruction[1])
 
-        self.draw_node(coords[0], coords[1], search_val, None, 
-            colour, self.get_x_space(search_node.level), search_node.level)
+        #nodes outside the viewport aren't drawn
+        if view_node != None:
+            self.recolour_node(view_node, colour)
 
 
     def animate_insert(self, prev_instruction, new_instruction, level):
@@ -441,11 +1096,12 @@ class BSTView:
                 value acted upon in the previous instruction.
             new_instruction ((string, int)): the current instruction to be 
                 executed. int is the value to insert. 
-            level (int): the level that the new node is located at
+            level (int): the level that the new node is located at. the node 
+                is always placed one level below its parent, so batches can
+                insert at many levels.
         """
         prev_val = None
         new_val = new_instruction[1]
-        x_offset = self.get_x_space(level)
 
         #the tree is not empty
         if prev_instruction != None:
@@ -453,62 +1109,152 @@ class BSTView:
             new_y = 0
 
             prev_val = prev_instruction[1]
-            prev_node = self.tree_vals[prev_val]
+            prev_node = self.tree_vals.get(prev_val)
+
+            #the parent is outside the viewport, so the new node is too
+            if prev_node == None:
+                return
 
+            level = prev_node.level + 1
+            x_offset = self.x_space
+
+            #nodes take their place in the tidy layout once the animation ends
             if prev_val > new_val:
                 new_x = prev_node.x_coord - x_offset
-                new_y = prev_node.y_coord - NODE_Y_GAP
+                new_y = prev_node.y_coord - self.y_gap
             else:
                 new_x = prev_node.x_coord + x_offset
-                new_y = prev_node.y_coord - NODE_Y_GAP
+                new_y = prev_node.y_coord - self.y_gap
         
         #tree empty, add root element
         else:
-            new_x = ROOT_COORDS[0]
-            new_y = ROOT_COORDS[1]
+            new_x, new_y = self.viewport.to_screen(0, 0)
+            level = 0
+            x_offset = NODE_RADIUS
+
+        #the new node drops out of its parent into place
+        start = (new_x, new_y)
+        if prev_val != None and self.tween_duration > 0:
+            start = prev_node.get_coords()
 
         #draw necessary shapes on graph
-        self.draw_node(new_x, new_y, new_val, prev_val, 
+        self.draw_node(start[0], start[1], new_val, prev_val, 
             NEW_INSERT_COLOUR, x_offset, level)
         self.tree_vals[new_val].level = level
 
+        if start != (new_x, new_y):
+            self.moves.append((new_val, start, (new_x, new_y), prev_val, 
+                x_offset, level))
+            self.tween = Tween(time.monotonic(), self.tween_duration)
+
+
+    def set_fill(self, figure_id, colour):
+        """
+        change the fill colour of a figure already on the graph.
+        """
+        self.renderer.set_fill(figure_id, colour)
+
+
+    def set_text(self, figure_id, text):
+        """
+        change the text shown by a text figure already on the graph. nodes too
+        small to be labelled have no text figure to change.
+        """
+        if figure_id == None:
+            return
+        self.renderer.set_text(figure_id, text)
+
+
+    def recolour_node(self, view_node, colour):
+        """
+        change the colour of a node on the graph, if it isn't already that 
+        colour.
+
+        parameters:
+            view_node (BSTNode): the node to recolour.
+            colour (string): the new fill colour.
+        """
+        if view_node.colour != colour:
+            self.set_fill(view_node.node_id, colour)
+            view_node.colour = colour
+
 
     def draw_node(self, x_coord, y_coord, new_val, connecting_val, 
         node_colour, x_space, level):
         """
-        when a node insertion is triggered, this function will draw the shapes
-        upon the graph element.
+        draws a node upon the graph element. a node that is already on the 
+        graph keeps its figures, which are only moved, resized or recoloured
+        where they differ from what is requested.
 
         parameters:
             x_coord, y_coord (int): x and y coords
             new_val (string): the new value to insert into the node
             connecting_val (string): the value of the node connected to the
-                newly inserted node
+                newly inserted node. None keeps whatever line the node already
+                has.
             node_colour (string): bst nodes can have one of many colours to 
                 represent their current state. this is where the 
                 colour is specified
             x_space (int): the space along the x-axis that is available to the
                 node for drawing. node may need resizing to fit the available
-                space.
+                space, and is left unlabelled if it ends up smaller than 
+                MIN_LABEL_RADIUS.
             level (int): the level this node is located on in the tree.
         """
-        connecting_node = self.tree_vals.get(connecting_val)
-
         radius = min(NODE_RADIUS, x_space)
+        view_node = self.tree_vals.get(new_val)
+
+        #a resized circle is cheaper to recreate than to reshape
+        if view_node != None and view_node.radius != radius:
+            self.renderer.delete_figure(view_node.node_id)
+            if view_node.text_id != None:
+                self.renderer.delete_figure(view_node.text_id)
+            view_node.node_id = None
+
+        if view_node == None or view_node.node_id == None:
+            node_id = self.renderer.draw_circle((x_coord, y_coord),
+                fill_color=node_colour, radius=radius)
+            text_id = None
+            if radius >= MIN_LABEL_RADIUS:
+                text_id = self.renderer.draw_text(new_val, (x_coord, y_coord), 
+                    color=TEXT_COLOUR)
+
+            if view_node == None:
+                view_node = BSTNode(node_id, text_id, level, x_coord, 
+                    y_coord, radius, new_val, node_colour)
+                self.tree_vals[new_val] = view_node
+            else:
+                view_node.node_id = node_id
+                view_node.text_id = text_id
+                view_node.set_coords((x_coord, y_coord))
+                view_node.radius = radius
+                view_node.colour = node_colour
+        else:
+            x_move = x_coord - view_node.x_coord
+            y_move = y_coord - view_node.y_coord
+
+            if x_move != 0 or y_move != 0:
+                self.renderer.move_figure(view_node.node_id, x_move, y_move)
+                if view_node.text_id != None:
+                    self.renderer.move_figure(view_node.text_id, x_move, y_move)
+                view_node.set_coords((x_coord, y_coord))
+
+            self.recolour_node(view_node, node_colour)
 
-        node_id = self.graph.draw_circle((x_coord, y_coord),
-            fill_color=node_colour, radius=radius)
-        text_id = self.graph.draw_text(new_val, (x_coord, y_coord), 
-            color=TEXT_COLOUR)
-        self.tree_vals[new_val] = BSTNode(node_id, text_id, level, 
-            x_coord, y_coord, radius, new_val)
+        view_node.level = level
 
         #if a line is required to be drawn between nodes
         if connecting_val != None:
+            connecting_node = self.tree_vals[connecting_val]
+            view_node.parent = connecting_node
             up_coords = connecting_node.get_btm_lft_coords()
-            down_coords = self.tree_vals[new_val].get_top_coords()
+            down_coords = view_node.get_top_coords()
 
             if connecting_val < new_val:
                 up_coords = connecting_node.get_btm_rgt_coords()
 
-            self.graph.draw_line(down_coords, up_coords)
\ No newline at end of file
+            if view_node.line_coords != (down_coords, up_coords):
+                self.remove_line(view_node)
+                view_node.line_id = self.renderer.draw_line(down_coords, 
+                    up_coords)
+                view_node.line_coords = (down_coords, up_coords)
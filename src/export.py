@@ -0,0 +1,394 @@
+"""
+exports animations of bst operations to files without a display. each trace
+builds a tree, then plays its operations through BSTView onto a
+RecordingRenderer, writing what is on the graph after every frame as an svg
+and, if Pillow is installed, all the frames together as an animated gif. many
+traces can be exported at once, spread over several processes.
+
+traces are read from a file with one json object per line, e.g.
+
+    {"name": "small", "load": [1, 2, 3], "operations": [["insert", 4]]}
+
+a trace may also name the kind of tree it plays on with "tree", one of
+tracefile.TREES, in place of the one given with --tree. traces are exported
+from the src directory with
+
+    python -m export traces.jsonl --out exports --gif
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from xml.sax.saxutils import escape
+
+import bst
+import tracefile
+from animation import DEFAULT_SPEED, TWEEN_FRACTION
+from bstview import BSTView, GRAPH_DIMENSION, BACKGROUND_COLOUR
+from renderer import RecordingRenderer
+
+"""
+timing of exported animations
+"""
+EXPORT_FRAME_RATE = 20 #frames drawn per second while nodes are moving
+
+"""
+appearance of figures where the graph leaves it to tk's defaults
+"""
+OUTLINE_COLOUR = "black"
+FONT_FAMILY = "Helvetica"
+FONT_SIZE = 13 #pixels
+LINE_SPACING = 1.2 #height of each line of text, in multiples of FONT_SIZE
+
+"""
+tk colour names used by the view that svg and Pillow don't know
+"""
+COLOURS = {
+    "snow": "#fffafa",
+    "lime green": "#32cd32",
+    "firebrick2": "#ee2c2c",
+    "purple4": "#551a8b",
+    "blue": "#0000ff",
+    "goldenrod2": "#eeb422",
+    "midnight blue": "#191970",
+    "grey60": "#999999",
+    "grey30": "#4d4d4d",
+    "black": "#000000",
+}
+
+"""
+operations a trace can perform, by name
+"""
+TRAVERSALS = {
+    "bfs": bst.iter_breadth_first,
+    "preorder": bst.iter_preorder,
+    "inorder": bst.iter_inorder,
+    "postorder": bst.iter_postorder,
+}
+
+
+def colour(name, default="none"):
+    """
+    returns (string):
+        a colour the graph was given, in a form svg and Pillow understand.
+    """
+    if name == None:
+        return default
+    return COLOURS.get(name, name.replace(" ", ""))
+
+
+def run_operation(tree, method, value=None, model=bst):
+    """
+    perform one operation of a trace on a tree.
+
+    parameters:
+        tree (Node): the tree to operate on.
+        method (string): insert, delete, search or one of the TRAVERSALS.
+        value (int): the value inserted, deleted or searched for.
+        model (module): one of tracefile.TREES, to operate with.
+
+    returns (Node, iterable of (string, int), int, int):
+        the tree afterwards, the path taken, the height of the tree and the
+        level of the node acted upon, as BSTView.start_animation takes them.
+    """
+    if method == "insert":
+        return model.insert(tree, value, sys.maxsize)
+    elif method == "delete":
+        return model.delete(tree, value)
+    elif method == "search":
+        tree, path = model.search(tree, value)
+        return (tree, path, 0, 0)
+    elif method in TRAVERSALS:
+        return (tree, TRAVERSALS[method](tree), 0, 0)
+
+    raise ValueError("unknown operation: %s" % method)
+
+
+def snapshot(recorder):
+    """
+    returns ([(string, {string: object})]):
+        a copy of the figures on a recorder's graph, back first.
+    """
+    return [(kind, dict(attributes))
+        for kind, attributes in recorder.stacked()]
+
+
+def frames(values, operations, speed=DEFAULT_SPEED,
+    frame_rate=EXPORT_FRAME_RATE, model=bst):
+    """
+    play a trace without a display, producing each frame of its animation.
+    frames are timed as the gui would play them at the same speed.
+
+    parameters:
+        values ([int]): the values the tree is built from.
+        operations ([(string, int)]): the (method, value) operations to
+            animate, in order. traversals take no value.
+        speed (float): the number of animation steps per second.
+        frame_rate (float): frames per second while nodes are moving.
+        model (module): one of tracefile.TREES, to build the tree and
+            operate on it with.
+
+    returns (generator of ([(string, {string: object})], float)):
+        the figures on the graph in each frame, from snapshot, and how many
+        seconds the frame is shown for.
+    """
+    recorder = RecordingRenderer()
+    view = BSTView(renderer=recorder)
+    tree = model.build(values) if len(values) > 0 else None
+    view.redraw_from_model(tree, refit=True)
+
+    step_seconds = 1 / speed
+    duration = step_seconds * TWEEN_FRACTION
+    moving_frames = max(1, round(duration * frame_rate))
+    yield (snapshot(recorder), step_seconds)
+
+    for operation in operations:
+        tree, path, height, level = run_operation(tree, *operation, 
+            model=model)
+        view.start_animation(path, height, level, tree)
+        playing = True
+
+        while playing:
+            playing = view.step_animation(duration)
+            shown = step_seconds
+
+            #the view moves nodes by the clock, so move them by hand instead
+            if view.tweening():
+                tween = view.tween
+                for frame in range(1, moving_frames):
+                    view.draw_frame(tween.progress(tween.start +
+                        duration * frame / moving_frames))
+                    yield (snapshot(recorder), duration / moving_frames)
+                view.end_tween()
+                shown -= duration * (moving_frames - 1) / moving_frames
+
+            yield (snapshot(recorder), shown)
+
+
+def svg_text(attributes):
+    """
+    returns (string):
+        an svg text element centred on its location like tk's, one line per
+        line of the text.
+    """
+    x, y = attributes["location"]
+    lines = attributes["text"].split("\n")
+    first_dy = -(len(lines) - 1) / 2 * LINE_SPACING
+    spans = "".join('<tspan x="%g" dy="%gem">%s</tspan>' % (x,
+        first_dy if i == 0 else LINE_SPACING, escape(line))
+        for i, line in enumerate(lines))
+
+    return ('<text x="%g" y="%g" fill="%s" font-family="%s" font-size="%d" '
+        'text-anchor="middle" dominant-baseline="central">%s</text>' % (x,
+        GRAPH_DIMENSION - y, colour(attributes["colour"], OUTLINE_COLOUR),
+        FONT_FAMILY, FONT_SIZE, spans))
+
+
+def svg_frame(figures, size=GRAPH_DIMENSION):
+    """
+    draw the figures on the graph as an svg document. the graph's origin is
+    at its bottom left, so y coordinates are flipped.
+
+    parameters:
+        figures ([(string, {string: object})]): the figures, from snapshot.
+        size (int): the width and height of the graph.
+
+    returns (string):
+        the svg document.
+    """
+    elements = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" '
+        'height="%d" viewBox="0 0 %d %d">' % (size, size, size, size),
+        '<rect width="100%%" height="100%%" fill="%s"/>' %
+        colour(BACKGROUND_COLOUR)]
+
+    for kind, attributes in figures:
+        if kind == "circle":
+            x, y = attributes["centre"]
+            elements.append('<circle cx="%g" cy="%g" r="%g" fill="%s" '
+                'stroke="%s"/>' % (x, size - y, attributes["radius"],
+                colour(attributes["fill"]), OUTLINE_COLOUR))
+        elif kind == "line":
+            (x1, y1), (x2, y2) = attributes["points"]
+            elements.append('<line x1="%g" y1="%g" x2="%g" y2="%g" '
+                'stroke="%s"/>' % (x1, size - y1, x2, size - y2,
+                OUTLINE_COLOUR))
+        elif kind == "polygon":
+            elements.append('<polygon points="%s" fill="%s"/>' % (
+                " ".join("%g,%g" % (x, size - y)
+                for x, y in attributes["points"]),
+                colour(attributes["fill"])))
+        elif kind == "text":
+            elements.append(svg_text(attributes))
+
+    elements.append("</svg>")
+    return "\n".join(elements)
+
+
+def image_frame(figures, size=GRAPH_DIMENSION):
+    """
+    draw the figures on the graph as an image. needs Pillow.
+
+    parameters:
+        figures ([(string, {string: object})]): the figures, from snapshot.
+        size (int): the width and height of the graph.
+
+    returns (PIL::Image):
+        the frame.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("RGB", (size, size), colour(BACKGROUND_COLOUR))
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(FONT_SIZE)
+
+    for kind, attributes in figures:
+        if kind == "circle":
+            x, y = attributes["centre"]
+            radius = attributes["radius"]
+            draw.ellipse((x - radius, size - y - radius, x + radius,
+                size - y + radius), fill=colour(attributes["fill"], None),
+                outline=OUTLINE_COLOUR)
+        elif kind == "line":
+            draw.line([(x, size - y) for x, y in attributes["points"]],
+                fill=OUTLINE_COLOUR)
+        elif kind == "polygon":
+            draw.polygon([(x, size - y) for x, y in attributes["points"]],
+                fill=colour(attributes["fill"], None))
+        elif kind == "text":
+            x, y = attributes["location"]
+            draw.multiline_text((x, size - y), attributes["text"],
+                fill=colour(attributes["colour"], OUTLINE_COLOUR), font=font,
+                anchor="mm", align="center")
+
+    return image
+
+
+def export_trace(trace, directory, svg=True, gif=False, speed=DEFAULT_SPEED,
+    frame_rate=EXPORT_FRAME_RATE, tree="bst"):
+    """
+    export the animation of one trace into a directory of its own, as
+    frame_00000.svg onwards and animation.gif.
+
+    parameters:
+        trace ({string: object}): the trace, with its name, the values to
+            load and the operations to animate.
+        directory (string): where each trace's directory is made.
+        svg (bool): write each frame as an svg.
+        gif (bool): write the whole animation as a gif. needs Pillow.
+        speed (float): the number of animation steps per second.
+        frame_rate (float): frames per second while nodes are moving.
+        tree (string): the kind of tree, one of tracefile.TREES, for a trace
+            that doesn't name one.
+
+    returns (int):
+        the number of frames exported.
+
+    raises (ValueError):
+        if the trace names a kind of tree that isn't in tracefile.TREES.
+    """
+    variant = trace.get("tree", tree)
+    if variant not in tracefile.TREES:
+        raise ValueError("unknown tree: %s" % variant)
+
+    out = os.path.join(directory, str(trace["name"]))
+    os.makedirs(out, exist_ok=True)
+    images = []
+    durations = []
+    count = 0
+
+    for count, (figures, seconds) in enumerate(frames(trace.get("load", []),
+        trace.get("operations", []), speed, frame_rate, 
+        tracefile.TREES[variant]), 1):
+        if svg:
+            with open(os.path.join(out, "frame_%05d.svg" % (count - 1)),
+                "w") as file:
+                file.write(svg_frame(figures))
+        if gif:
+            images.append(image_frame(figures))
+            durations.append(round(seconds * 1000))
+
+    if gif and len(images) > 0:
+        images[0].save(os.path.join(out, "animation.gif"), save_all=True,
+            append_images=images[1:], duration=durations, loop=0)
+
+    return count
+
+
+def export_many(traces, directory, processes=None, **options):
+    """
+    export many traces at once, each in a process of its own.
+
+    parameters:
+        traces ([{string: object}]): the traces, as export_trace takes them.
+        directory (string): where each trace's directory is made.
+        processes (int): the most processes to use. defaults to one per cpu.
+        options: passed on to export_trace.
+
+    returns ([int]):
+        the number of frames exported for each trace.
+    """
+    with ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(partial(export_trace, directory=directory,
+            **options), traces))
+
+
+def read_traces(path):
+    """
+    returns ([{string: object}]):
+        the traces in a file of one json object per line. traces without a
+        name are named after their line.
+    """
+    traces = []
+
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            if line.strip() == "":
+                continue
+            trace = json.loads(line)
+            trace.setdefault("name", "trace_%05d" % number)
+            traces.append(trace)
+
+    return traces
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("traces",
+        help="file with one json trace per line")
+    parser.add_argument("--out", default="exports",
+        help="directory to export into")
+    parser.add_argument("--gif", action="store_true",
+        help="also write an animated gif of each trace (needs Pillow)")
+    parser.add_argument("--no-svg", action="store_true",
+        help="don't write svg frames")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED,
+        help="animation steps per second")
+    parser.add_argument("--frame-rate", type=float, default=EXPORT_FRAME_RATE,
+        help="frames per second while nodes move")
+    parser.add_argument("--processes", type=int, default=None,
+        help="most processes to export with")
+    parser.add_argument("--tree", default="bst", choices=tracefile.TREES,
+        help="the kind of tree for traces that don't name one")
+    args = parser.parse_args(argv)
+
+    if args.gif:
+        try:
+            import PIL
+        except ImportError:
+            parser.error("--gif needs Pillow installed")
+
+    traces = read_traces(args.traces)
+    counts = export_many(traces, args.out, args.processes,
+        svg=not args.no_svg, gif=args.gif, speed=args.speed,
+        frame_rate=args.frame_rate, tree=args.tree)
+
+    print("exported %d frames of %d traces to %s" % (sum(counts),
+        len(traces), args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+tidy layout of binary trees in the style of reingold and tilford. every
+subtree is laid out on its own and then pushed as close to its sibling as its
+contours allow, so trees take up space in proportion to their number of nodes
+rather than doubling in width with every level.
+
+contours are kept as chains of (dx, next) cells, one per level, where dx is
+the horizontal distance from the cell above. chains are never changed once
+made, so a parent shares the deeper of its children's chains instead of
+copying it and the whole tree is laid out in O(n). the shape worked out for
+each node is cached, so laying out a tree again after an operation only
+visits the nodes on the way down to what it changed.
+"""
+
+import math
+import sys
+from bisect import bisect_left
+from collections import deque
+
+"""
+the narrowest horizontal gap allowed between two nodes on the same level. all
+positions are in these units, scaled to the graph by the view.
+"""
+MIN_SEPARATION = 1.0
+
+"""
+how many shapes of nodes no longer in the tree are kept, on top of one for
+every node in it, before they are cleared out.
+"""
+STALE_SHAPES = 1024
+
+
+class Shape:
+    """
+    the layout of a subtree relative to its root.
+    """
+    __slots__ = ("left", "right", "left_contour", "right_contour", "height",
+        "offset", "min_x", "max_x", "first", "last")
+
+    def __init__(self, left, right, left_contour, right_contour, height,
+        offset, min_x=0.0, max_x=0.0):
+        """
+        parameters:
+            left, right (Shape): the shapes of the root's children it was
+                made from.
+            left_contour, right_contour ((float, tuple)): chains of the
+                leftmost and rightmost node on each level.
+            height (int): the number of levels in the subtree.
+            offset (float): how far each child sits to either side of the
+                root.
+            min_x, max_x (float): the furthest any node of the subtree sits
+                to the left and right of the root.
+
+        first and last are the subtree's first and last nodes in order, set
+        once the shape is attached to a node.
+        """
+        self.left = left
+        self.right = right
+        self.left_contour = left_contour
+        self.right_contour = right_contour
+        self.height = height
+        self.offset = offset
+        self.min_x = min_x
+        self.max_x = max_x
+        self.first = None
+        self.last = None
+
+
+"""
+the contour of a single node.
+"""
+LEAF_CONTOUR = (0.0, None)
+
+
+def shift(contour, dx):
+    """
+    returns ((float, tuple)):
+        a contour moved sideways by dx. only the first cell is new.
+    """
+    return (contour[0] + dx, contour[1])
+
+
+def separation(right_contour, left_contour):
+    """
+    work out how far apart the roots of two subtrees must be so that no level
+    has nodes closer than MIN_SEPARATION. only the levels both subtrees have
+    are compared.
+
+    parameters:
+        right_contour ((float, tuple)): the right contour of the left subtree.
+        left_contour ((float, tuple)): the left contour of the right subtree.
+
+    returns (float):
+        the distance between the two roots.
+    """
+    overlap = 0.0
+    right_x = 0.0
+    left_x = 0.0
+
+    while right_contour != None and left_contour != None:
+        right_x += right_contour[0]
+        left_x += left_contour[0]
+        overlap = max(overlap, right_x - left_x)
+        right_contour = right_contour[1]
+        left_contour = left_contour[1]
+
+    return overlap + MIN_SEPARATION
+
+
+def splice(short, short_height, long):
+    """
+    join the levels of a contour below the bottom of a shorter one on to it.
+    both contours must start from the same position. takes time in proportion
+    to the shorter contour, as the deeper levels are shared rather than
+    copied.
+
+    parameters:
+        short ((float, tuple)): the contour that is used where it exists.
+        short_height (int): the number of levels in short.
+        long ((float, tuple)): the contour used for the levels below.
+
+    returns ((float, tuple)):
+        the joined contour.
+    """
+    cells = []
+    short_x = 0.0
+    long_x = 0.0
+
+    for _ in range(short_height):
+        cells.append(short[0])
+        short_x += short[0]
+        long_x += long[0]
+        short = short[1]
+        long = long[1]
+
+    contour = (long_x + long[0] - short_x, long[1])
+    while len(cells) > 0:
+        contour = (cells.pop(), contour)
+
+    return contour
+
+
+def combine(left, right):
+    """
+    lay out a node from the shapes of its two subtrees.
+
+    parameters:
+        left, right (Shape): the shapes of the node's children, or None.
+
+    returns (Shape):
+        the shape of the subtree rooted at the node.
+    """
+    if left == None and right == None:
+        return Shape(None, None, LEAF_CONTOUR, LEAF_CONTOUR, 1, 0.0)
+
+    #an only child still leans the way it hangs from its parent
+    if left == None or right == None:
+        offset = MIN_SEPARATION / 2
+        child = left if left != None else right
+        dx = -offset if left != None else offset
+        return Shape(left, right, (0.0, shift(child.left_contour, dx)),
+            (0.0, shift(child.right_contour, dx)), child.height + 1, offset,
+            min(0.0, child.min_x + dx), max(0.0, child.max_x + dx))
+
+    offset = separation(left.right_contour, right.left_contour) / 2
+
+    left_contour = shift(left.left_contour, -offset)
+    if left.height < right.height:
+        left_contour = splice(left_contour, left.height,
+            shift(right.left_contour, offset))
+
+    right_contour = shift(right.right_contour, offset)
+    if right.height < left.height:
+        right_contour = splice(right_contour, right.height,
+            shift(left.right_contour, -offset))
+
+    return Shape(left, right, (0.0, left_contour), (0.0, right_contour),
+        max(left.height, right.height) + 1, offset, 
+        min(left.min_x - offset, right.min_x + offset),
+        max(left.max_x - offset, right.max_x + offset))
+
+
+class TidyLayout:
+    """
+    lays out a tree, remembering the shape of every subtree so the next
+    layout of the same tree only redoes the subtrees that have changed since.
+    """
+    def __init__(self):
+        self.shapes = {} #shape of the subtree below each node
+
+    def update(self, root, changed=None):
+        """
+        bring the cached shapes in line with a tree. a node is laid out again
+        only if one of its children has been replaced or laid out again.
+
+        given the values an operation changed, only the nodes on the way down
+        to them and nodes never laid out before are visited, so laying out a
+        balanced tree again after an insert, delete or rotation takes
+        O(log n). the descents to every value are shared, so no node is
+        visited twice however many values overlap on a path. every other node
+        is trusted to have the same children as when it was last laid out.
+        otherwise every node is checked, and the shapes of nodes no longer in
+        the tree are forgotten, which is also done once enough of them have 
+        built up.
+
+        parameters:
+            root (Node): the tree to lay out.
+            changed (iterable of int): values from the path of the operation
+                that include every node whose children it replaced. the 
+                tree must be a binary search tree to find them by value. 
+                None to check every node.
+
+        returns (Shape):
+            the shape of the whole tree, or None if it is empty.
+        """
+        if root == None:
+            self.shapes = {}
+            return None
+
+        cached = self.shapes
+
+        #values are split at every node, as in bst.search_many, so the nodes
+        #on the way down to any of them are each visited once
+        if changed == None:
+            shapes = {}
+            every = True
+            ordered = []
+        else:
+            shapes = cached
+            every = False
+            ordered = sorted(set(changed))
+
+        #(node, first and one past last index of the values below it, 
+        #whether its children have been laid out)
+        stack = [(root, 0, len(ordered), False)]
+
+        while len(stack) > 0:
+            node, low, high, children_done = stack.pop()
+
+            if not children_done:
+                if not every and low >= high and node in cached:
+                    continue
+
+                split = bisect_left(ordered, node.value, low, high)
+                after = split
+                if split < high and ordered[split] == node.value:
+                    after += 1
+
+                stack.append((node, low, high, True))
+                if node.right != None:
+                    stack.append((node.right, after, high, False))
+                if node.left != None:
+                    stack.append((node.left, low, split, False))
+                continue
+
+            left = shapes[node.left] if node.left != None else None
+            right = shapes[node.right] if node.right != None else None
+            shape = cached.get(node)
+
+            if shape == None or shape.left is not left or \
+                shape.right is not right:
+                shape = combine(left, right)
+                shape.first = left.first if left != None else node
+                shape.last = right.last if right != None else node
+
+            shapes[node] = shape
+
+        self.shapes = shapes
+
+        #forget nodes that have left the tree before they outnumber it
+        if not every and len(shapes) > 2 * root.size + STALE_SHAPES:
+            return self.update(root)
+
+        return shapes[root]
+
+    def bounds(self, root):
+        """
+        parameters:
+            root (Node): the tree last passed to update.
+
+        returns (float, float, int):
+            the smallest and largest x positions in the tree, where the root
+            is at x = 0, and its number of levels.
+        """
+        if root == None:
+            return (0.0, 0.0, 0)
+
+        shape = self.shapes[root]
+        return (shape.min_x, shape.max_x, shape.height)
+
+    def positions(self, root, low=-math.inf, high=math.inf, 
+        last_level=sys.maxsize, min_width=0.0, limit=sys.maxsize):
+        """
+        place the nodes of a tree that fall inside a window, using the shapes
+        from the last call to update. subtrees entirely outside the window, 
+        and those narrower than min_width, are not descended into, so the 
+        time taken depends on what is in the window rather than the size of 
+        the tree. nodes are placed level by level, so if there are more than
+        limit the deepest are left out.
+
+        parameters:
+            root (Node): the tree last passed to update.
+            low, high (float): the x positions at the sides of the window, 
+                where the root is at x = 0.
+            last_level (int): the deepest level in the window.
+            min_width (float): subtrees of more than one node narrower than 
+                this are left whole.
+            limit (int): the most nodes to place.
+
+        returns ([(Node, float, int, Node)], [(Node, float, int, Node)]):
+            1st value is each node placed with its x position, level and 
+            parent, level by level. 2nd is the roots of the subtrees left out,
+            in the same form.
+        """
+        placed = []
+        hidden = []
+        queue = deque([(root, 0.0, 0, None)] if root != None else [])
+
+        while len(queue) > 0:
+            node, x, level, parent = queue.popleft()
+            shape = self.shapes[node]
+
+            if x + shape.max_x < low or x + shape.min_x > high or \
+                level > last_level or (shape.height > 1 and 
+                shape.max_x - shape.min_x < min_width) or \
+                len(placed) >= limit:
+                hidden.append((node, x, level, parent))
+                continue
+
+            placed.append((node, x, level, parent))
+
+            if node.left != None:
+                queue.append((node.left, x - shape.offset, level + 1, node))
+            if node.right != None:
+                queue.append((node.right, x + shape.offset, level + 1, node))
+
+        return (placed, hidden)
@@ -1,4 +1,8 @@
 import PySimpleGUI as sg
+import argparse
+import re
+import time
+from collections import deque
 
 """
 implementation of binary search tree that also returns the actions taken to
@@ -6,11 +10,41 @@ perform a certain action.
 """
 import bst
 
+"""
+performs tree methods on the model, and records and replays sessions of them.
+"""
+import tracefile
+
 """
 class responsible for displaying the tree on the graph.
 """
 from bstview import *
 
+"""
+decides when each step of an animation is played.
+"""
+from animation import AnimationScheduler
+
+"""
+how far each zoom step scales the tree.
+"""
+from viewport import ZOOM_STEP
+
+"""
+optional measurements of where the time of each interaction goes.
+"""
+from metrics import Metrics
+
+"""
+saving trees to files and opening them again.
+"""
+import snapshot
+
+"""
+persistent tree operations, which keep every version of the tree for undo.
+"""
+import pbst
+
 """
 identifiers for our gui elements. will also be the name of events that happen
 on the elements.
@@ -30,6 +64,12 @@ BST_BFS = "BFS"
 BST_PREORDER = "Preorder"
 BST_POSTORDER = "Postorder"
 BST_INORDER = "Inorder"
+BST_LOAD = "Load"
+
+"""
+pattern matching a range of values typed by the user, e.g. "1-10" or "-5--1"
+"""
+VALUE_RANGE = re.compile(r"^(-?\d+)\s*-\s*(-?\d+)$")
 
 
 
@@ -38,16 +78,39 @@ class BSTController:
     """
     coordinating class enabling communication between view and model for BST.
     """
-    def __init__(self, window):
+    def __init__(self, window, metrics=None, session=None, replaying=None,
+        variant="bst"):
         """
         initialise a controller that aids in displaying a BST
 
         parameters:
             window (PSG::Window): the window in which to draw the BST
+            metrics (Metrics): measures the model and view if given.
+            session (TraceWriter): every operation performed is recorded to
+                this if given.
+            replaying (iterable of (string, [int], [(string, int)])): a 
+                recorded session to play back, such as a TraceReader.
+            variant (string): the kind of tree to start with, one of 
+                tracefile.TREES.
         """
         self.window = window 
         self.view = BSTView(window) #tree display
+        self.metrics = metrics
+        self.session = session
+        self.replaying = iter(replaying) if replaying != None else None
+        self.model = None #module performing operations on tree_model
         self.tree_model = None #underlying search tree data structure
+        self.history = None #every version of tree_model, if they are kept
+        self.scheduler = AnimationScheduler()
+        self.operations = deque() #(method, value) waiting to be performed
+        self.tree_height = 0
+        self.current_node_level = 0
+        self.drag_from = None #graph coordinates the mouse was last dragged to
+
+        if self.metrics != None:
+            self.metrics.instrument(self.view)
+
+        self.use_variant(variant)
 
 
     def validate_input(self, value):
@@ -68,61 +131,425 @@ class BSTController:
             return False
 
 
-    def main_loop(self):
+    def parse_values(self, value):
+        """
+        function to read a list of values typed by the user, separated by
+        commas. each entry is either a single value or an inclusive range of
+        values such as 1-10.
+
+        parameters:
+            value (string): the user input to parse.
+
+        returns ([int]):
+            the values entered. None if any entry isn't an integer or range.
+        """
+        values = []
+
+        for part in value.split(","):
+            part = part.strip()
+            if part == "":
+                continue
+
+            value_range = VALUE_RANGE.match(part)
+
+            if value_range != None:
+                start, end = sorted(map(int, value_range.groups()))
+                values.extend(range(start, end + 1))
+            elif self.validate_input(part):
+                values.append(int(part))
+            else:
+                return None
+
+        return values
+
+
+    def record_operation(self, method, keys, start, path):
+        """
+        time a model operation and count what its path did, if metrics are
+        being collected.
+
+        parameters:
+            method (string): the tree method performed.
+            keys ([int]): the values given with the method.
+            start (float): time.perf_counter() when the operation began.
+            path (iterable of (string, int)): the instructions it produced.
+
+        returns (iterable of (string, int)):
+            the path, to be animated in place of the one passed in.
+        """
+        if self.metrics == None:
+            return path
+
+        seconds = time.perf_counter() - start
+        self.metrics.add_time("model." + method.lower(), seconds)
+        self.metrics.emit("operation", method=method, keys=len(keys), 
+            seconds=seconds)
+        return self.metrics.count_path(method.lower(), path, 
+            method not in tracefile.TRAVERSALS)
+
+
+    def perform(self, method, value):
+        """
+        run a tree method typed by the user on the model and start animating
+        it.
+
+        parameters:
+            method (string): the tree method requested.
+            value (string): the user input given with the method.
+        """
+        keys = []
+
+        if method in (BST_INSERT, BST_DELETE, BST_SEARCH, BST_LOAD):
+            keys = self.parse_values(value)
+            if keys == None or len(keys) == 0:
+                return
+
+        self.run(method, keys)
+
+
+    def run(self, method, keys):
+        """
+        run a tree method on the model and start animating it. several keys
+        are run as one batch with a single animation, and loading replaces
+        the tree with a balanced tree of the keys, drawn at once rather than
+        animating each insert.
+
+        parameters:
+            method (string): the tree method requested.
+            keys ([int]): the values given with the method.
+        """
+        start = time.perf_counter()
+        self.tree_model, instruction_queue, self.tree_height, \
+            self.current_node_level = tracefile.perform(self.tree_model, 
+            method, keys, self.model)
+        self.add_version()
+
+        if self.session != None:
+            self.session.write(method, keys, instruction_queue)
+            self.session.flush()
+
+        instruction_queue = self.record_operation(method, keys, start, 
+            instruction_queue)
+
+        if method in (BST_LOAD, BST_OPEN):
+            self.view.redraw_from_model(self.tree_model, refit=True)
+            return
+
+        if self.view.start_animation(instruction_queue, self.tree_height, 
+            self.current_node_level, self.tree_model):
+            self.scheduler.start(time.monotonic())
+
+
+    def handle_event(self, event, values):
+        """
+        respond to an event from the window. tree methods are queued and 
+        performed once any animation already playing has finished.
+
+        parameters:
+            event (string): the key of the element that raised the event.
+            values (dict): the values of the window's input elements.
+        """
+        if event == BST_TREE_ACTION:
+            self.operations.append((values[BST_METHOD], 
+                values[BST_ACTION_VAL]))
+        elif event == BST_PAUSE:
+            paused = self.scheduler.toggle_pause()
+            self.window[BST_PAUSE].update(
+                text=RESUME_LABEL if paused else PAUSE_LABEL)
+        elif event == BST_FORWARD:
+            self.scheduler.request_step()
+        elif event == BST_SKIP:
+            self.scheduler.request_skip()
+        elif event == BST_SPEED:
+            self.scheduler.set_speed(values[BST_SPEED])
+        elif event == BST_GRAPH:
+            #dragging over the graph pans it
+            position = values[BST_GRAPH]
+            if self.drag_from != None:
+                self.view.pan(position[0] - self.drag_from[0], 
+                    position[1] - self.drag_from[1])
+            self.drag_from = position
+        elif event == BST_DRAG_END:
+            self.drag_from = None
+        elif event in (BST_WHEEL, BST_WHEEL_UP, BST_WHEEL_DOWN):
+            wheel = self.view.graph.user_bind_event
+            zoom_in = event == BST_WHEEL_UP or (event == BST_WHEEL and 
+                wheel.delta > 0)
+            self.view.zoom(ZOOM_STEP if zoom_in else 1 / ZOOM_STEP, 
+                (wheel.x, GRAPH_DIMENSION - wheel.y))
+        elif event == BST_ZOOM_IN:
+            self.view.zoom(ZOOM_STEP)
+        elif event == BST_ZOOM_OUT:
+            self.view.zoom(1 / ZOOM_STEP)
+        elif event == BST_FIT:
+            self.view.fit()
+        elif event == BST_UNDO and self.history != None:
+            self.travel(self.history.index - 1)
+        elif event == BST_REDO and self.history != None:
+            self.travel(self.history.index + 1)
+        elif event == BST_HISTORY and self.history != None:
+            self.travel(int(values[BST_HISTORY]))
+        elif event == BST_OPEN_FILE:
+            filename = sg.popup_get_file("Open a tree snapshot", 
+                file_types=SNAPSHOT_FILE_TYPES)
+            if filename:
+                self.open_snapshot(filename)
+        elif event == BST_SAVE_FILE:
+            filename = sg.popup_get_file("Save the tree as a snapshot", 
+                save_as=True, default_extension=SNAPSHOT_EXTENSION, 
+                file_types=SNAPSHOT_FILE_TYPES)
+            if filename:
+                self.save_snapshot(filename)
+
+
+    def stepping(self):
+        """
+        returns (bool):
+            true while an animation is playing, or operations are queued and 
+            ready to start one.
+        """
+        return self.view.animating() or ((len(self.operations) > 0 or 
+            self.replaying != None) and not self.view.tweening())
+
+
+    def tick(self):
         """
-        the main loop processing input from window and displaying tree.
+        draw the next frame of any nodes moving into place, advance the 
+        current animation if a step is due, or start the next queued operation 
+        once the current animation is over.
         """
-        instruction_queue = []
-        tree_height = 0
-        current_node_level = 0
+        now = time.monotonic()
 
+        if self.scheduler.skip_requested:
+            self.view.finish_animation()
+            self.scheduler.skip_requested = False
+
+        if self.view.tweening() and self.scheduler.frame_due(now):
+            self.view.step_frame()
+            self.scheduler.mark_frame(now)
+
+        if not self.view.animating() and not self.view.tweening():
+            if len(self.operations) > 0:
+                self.perform(*self.operations.popleft())
+            elif self.replaying != None:
+                self.replay_next()
+
+        if self.view.animating() and self.scheduler.due(now):
+            self.view.step_animation(self.scheduler.tween_duration())
+            self.scheduler.mark_step(now)
+
+
+    def open_snapshot(self, filename):
+        """
+        replace the tree with one saved in a snapshot file, drawing it once.
+        any animation playing is skipped to its end first.
+
+        parameters:
+            filename (string): the snapshot to open.
+        """
+        start = time.perf_counter()
+
+        try:
+            tree = snapshot.load(filename)
+        except (OSError, ValueError):
+            self.view.display_error_string(SNAPSHOT_MESSAGE)
+            return
+
+        if self.model != pbst:
+            #a snapshot is a plain bst, without what the variant keeps to
+            #balance it
+            tree = self.model.from_preorder(value for _, value in 
+                bst.iter_preorder(tree))
+
+        self.view.finish_animation()
+        self.tree_model = tree
+        self.tree_height = bst.node_height(tree)
+        self.record_operation(BST_OPEN, [], start, [])
+
+        if self.session != None:
+            self.session.write(BST_OPEN, [value for _, value in 
+                bst.iter_preorder(tree)], [])
+            self.session.flush()
+
+        self.add_version()
+        self.view.redraw_from_model(self.tree_model, refit=True)
+
+
+    def use_variant(self, variant):
+        """
+        start again from an empty tree of another variant. undo, redo and 
+        the history are only offered for a bst, as the other variants change
+        their trees in place and can't keep earlier versions of them.
+
+        parameters:
+            variant (string): one of tracefile.TREES.
+        """
+        model = tracefile.TREES[variant]
+
+        self.view.finish_animation()
+        self.model = pbst if model == bst else model
+        self.history = pbst.History() if self.model == pbst else None
+        self.tree_model = None
+        self.tree_height = 0
+        self.current_node_level = 0
+
+        if self.session != None:
+            self.session.write(BST_TREE, [tracefile.TREE_CODES[variant]], [])
+            self.session.flush()
+
+        if self.window != None:
+            for key in (BST_UNDO, BST_REDO, BST_HISTORY):
+                self.window[key].update(disabled=self.history == None)
+
+        self.show_history()
+        self.view.redraw_from_model(self.tree_model, refit=True)
+
+
+    def add_version(self):
+        """
+        keep the tree as a new version in the history if it has changed and
+        versions are being kept.
+        """
+        if self.history != None and self.history.push(self.tree_model):
+            self.show_history()
+
+
+    def show_history(self):
+        """
+        set the history slider to the versions there are and the current one.
+        """
+        if self.window != None and self.history != None:
+            self.window[BST_HISTORY].update(value=self.history.index, 
+                range=(0, len(self.history) - 1))
+
+
+    def travel(self, index):
+        """
+        go back or forward to another version of the tree, moving the nodes 
+        to where they are in it. any animation playing is skipped to its end
+        first. only the position of the version is recorded to the session, 
+        so this takes the same time whatever the size of the tree.
+
+        parameters:
+            index (int): the position of the version in the history. 
+                nothing happens if there is no version there or it is 
+                already current.
+        """
+        if self.history == None or index == self.history.index or \
+            not 0 <= index < len(self.history):
+            return
+
+        self.view.finish_animation()
+        self.tree_model = self.history.goto(index)
+        self.tree_height = bst.node_height(self.tree_model)
+
+        if self.session != None:
+            self.session.write(BST_GOTO, [index], [])
+            self.session.flush()
+
+        self.show_history()
+        #versions are never changed once made, so only the nodes of this one
+        #that have never been drawn need laying out
+        self.view.redraw_from_model(self.tree_model, 
+            self.scheduler.tween_duration(), changed=())
+
+
+    def save_snapshot(self, filename):
+        """
+        save the tree to a snapshot file.
+
+        parameters:
+            filename (string): the file to write.
+        """
+        snapshot.save(self.tree_model, filename)
+
+
+    def replay_next(self):
+        """
+        start the next operation of the session being replayed. the model
+        takes the same path again, so the recorded path isn't needed.
+        """
+        operation = next(self.replaying, None)
+
+        if operation == None:
+            self.replaying = None
+            return
+
+        method, keys, _ = operation
+        if method == BST_GOTO:
+            self.travel(keys[0])
+        elif method == BST_TREE:
+            self.use_variant(tracefile.TREE_NAMES[keys[0]])
+        else:
+            self.run(method, keys)
+
+
+    def main_loop(self):
+        """
+        the main loop processing input from window and displaying tree. the
+        window is polled while an animation plays rather than blocking on it.
+        """
         while True:
-            #await events on the window
-            event, values = self.window.read()
+            #await events on the window, the next animation step or frame
+            event, values = self.window.read(timeout=self.scheduler.timeout(
+                time.monotonic(), self.stepping(), self.view.tweening()))
 
             if event == sg.WIN_CLOSED:
                 break
-            
-            value = values[BST_ACTION_VAL]
-            if not self.validate_input(value):
-                continue
 
-            #a tree method has been requested
-            if event == BST_TREE_ACTION:
-                method = values[BST_METHOD]
-
-                if method == BST_INSERT:
-                    self.tree_model, instruction_queue, tree_height, \
-                        current_node_level = bst.insert(self.tree_model, 
-                        int(value), HEIGHT_LIMIT)
-                elif method == BST_SEARCH:
-                    self.tree_model, instruction_queue = \
-                        bst.search(self.tree_model, int(value))
-                elif method == BST_DELETE:
-                    self.tree_model, instruction_queue, tree_height, \
-                        current_node_level = bst.delete(self.tree_model, 
-                        int(value))
-                elif method == BST_BFS:
-                    instruction_queue = bst.breadth_first(self.tree_model)
-                elif method == BST_PREORDER:
-                    instruction_queue = bst.preorder(self.tree_model)
-                elif method == BST_INORDER:
-                    instruction_queue = bst.inorder(self.tree_model)
-                elif method == BST_POSTORDER:
-                    instruction_queue = bst.postorder(self.tree_model)
-
-                self.view.animation_loop(instruction_queue, tree_height, 
-                    current_node_level, self.tree_model)
-
-
-
-
-#create the Window
-window = sg.Window("Binary search tree")
-
-#controller class to coordinate between view and model
-controller = BSTController(window)
-controller.main_loop()
-
-#when window has been exited
-window.close()
\ No newline at end of file
+            self.handle_event(event, values)
+            self.tick()
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="binary search tree "
+        "visualisation")
+    parser.add_argument("--metrics", metavar="PATH",
+        help="measure the model and view, writing an event per operation "
+        "and animation step to PATH and a summary when the window closes")
+    parser.add_argument("--record", metavar="PATH",
+        help="append every operation performed to a session file")
+    parser.add_argument("--replay", metavar="PATH",
+        help="play back the operations of a session file")
+    parser.add_argument("--open", metavar="PATH",
+        help="start with the tree saved in a snapshot file")
+    parser.add_argument("--tree", default="bst", choices=tracefile.TREES,
+        help="the kind of tree to operate on. undo and the history are only "
+        "kept for a bst")
+    args = parser.parse_args()
+
+    metrics = None
+    if args.metrics != None:
+        metrics = Metrics(open(args.metrics, "w"))
+
+    session = None
+    if args.record != None:
+        session = tracefile.TraceWriter(args.record)
+
+    replaying = None
+    if args.replay != None:
+        replaying = tracefile.TraceReader(args.replay)
+
+    #create the Window
+    window = sg.Window("Binary search tree")
+
+    #controller class to coordinate between view and model
+    controller = BSTController(window, metrics, session, replaying, 
+        args.tree)
+    if args.open != None:
+        controller.open_snapshot(args.open)
+    controller.main_loop()
+
+    #when window has been exited
+    window.close()
+
+    if session != None:
+        session.close()
+    if replaying != None:
+        replaying.close()
+
+    if metrics != None:
+        metrics.stream.close()
+        print(metrics.report())
@@ -0,0 +1,276 @@
+"""
+opt-in instrumentation for telling where the time of an interaction goes:
+the tree model, the layout, the view or the canvas.
+
+model operations are counted from the paths they already return, so bst.py
+is not slowed down at all: on the way down a tree every node searched past is
+compared with the key once, so the path holds a step for every comparison.
+heaps don't record their comparisons in their paths, so they count them
+themselves while their comparisons attribute is set. the view is measured by wrapping
+its methods and renderer on the instance with instrument(), so a view that
+is never instrumented runs exactly as before.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+from bst import FIND, SEARCH, SWAP, INSERT, NOT_FOUND, DUPLICATE, DELETE, \
+    RESTRUCTURE
+
+"""
+the counters each instruction of a path adds to. heaps use the same
+instruction names as trees. nodes visited on the way down a tree were also
+compared with the key.
+"""
+PATH_COUNTERS = {
+    SEARCH: ("visited",),
+    FIND: ("visited",),
+    DUPLICATE: ("visited",),
+    SWAP: ("swaps",),
+    RESTRUCTURE: ("rotations",),
+    INSERT: ("allocations",),
+    DELETE: ("frees",),
+    NOT_FOUND: ("misses",),
+}
+
+
+class Metrics:
+    """
+    counters and timers collected while the app runs. timers are inclusive,
+    so view.draw_visible includes the view.draw_node and renderer time spent
+    inside it. if given a stream, an event is written to it as a line of json
+    for every operation and animation step.
+    """
+    def __init__(self, stream=None):
+        """
+        parameters:
+            stream (file): where events are written as they happen.
+        """
+        self.counters = {} #count of each thing by name
+        self.timers = {} #[calls, total seconds, longest call] by name
+        self.stream = stream
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name, seconds):
+        """
+        record one call to something timed.
+        """
+        timer = self.timers.get(name)
+
+        if timer == None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    def emit(self, event, **fields):
+        """
+        write an event to the stream, if there is one.
+        """
+        if self.stream != None:
+            fields["event"] = event
+            self.stream.write(json.dumps(fields) + "\n")
+
+    def count_instruction(self, operation, instruction, compared):
+        self.count(operation + ".instructions")
+        for counter in PATH_COUNTERS.get(instruction[0], ()):
+            self.count(operation + "." + counter)
+        if compared and instruction[0] in (SEARCH, FIND, DUPLICATE):
+            self.count(operation + ".comparisons")
+
+    def count_path(self, operation, path, compared=True):
+        """
+        count the nodes visited, comparisons, swaps, rotations and nodes
+        allocated and freed by an operation from the path it took. batch 
+        operations also compare keys with the bounds of the descent they
+        resume from, which aren't counted.
+
+        parameters:
+            operation (string): the name the counters are kept under.
+            path (iterable of (string, int)): the instructions of the
+                operation. a path that isn't a list, such as a traversal's
+                generator, is counted as it is consumed.
+            compared (bool): whether the nodes visited were compared with a
+                key, as on the way down a tree. traversals and heaps visit 
+                nodes without doing so.
+
+        returns (iterable of (string, int)):
+            the path, to be used in place of the one passed in.
+        """
+        self.count(operation + ".operations")
+
+        if not isinstance(path, list):
+            return self.counting(operation, path, compared)
+
+        for instruction in path:
+            self.count_instruction(operation, instruction, compared)
+        return path
+
+    def counting(self, operation, path, compared):
+        """
+        returns (generator of (string, int)):
+            the instructions of a path, counted as they are produced.
+        """
+        for instruction in path:
+            self.count_instruction(operation, instruction, compared)
+            yield instruction
+
+    def count_heap(self, operation, heap):
+        """
+        count the comparisons a heap has made since it was last counted, and
+        start it counting them if it wasn't.
+
+        parameters:
+            operation (string): the name the counter is kept under.
+            heap (BinHeap or PairingHeap): the heap the operation was 
+                performed on.
+        """
+        if heap.comparisons != None:
+            self.count(operation + ".comparisons", heap.comparisons)
+        heap.comparisons = 0
+
+    @contextmanager
+    def timer(self, name):
+        """
+        time the body of a with statement.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed(self, name, function):
+        """
+        returns (function):
+            function, timed under name every time it is called.
+        """
+        clock = time.perf_counter
+        add_time = self.add_time
+
+        def timed_function(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add_time(name, clock() - start)
+
+        return timed_function
+
+    def instrument(self, view):
+        """
+        start measuring a BSTView: its layout, the nodes it draws, each step
+        of its animations and every call to its renderer.
+
+        parameters:
+            view (BSTView): the view to measure.
+
+        returns (BSTView):
+            the view.
+        """
+        view.renderer = InstrumentedRenderer(view.renderer, self)
+        view.layout.update = self.timed("layout.update", view.layout.update)
+        view.draw_visible = self.timed("view.draw_visible",
+            view.draw_visible)
+        view.draw_node = self.timed("view.draw_node", view.draw_node)
+        animate_path = view.animate_path
+        clock = time.perf_counter
+
+        def timed_animate_path(previous, current, level):
+            calls = self.counters.get("renderer.calls", 0)
+            start = clock()
+            try:
+                animate_path(previous, current, level)
+            finally:
+                seconds = clock() - start
+                self.add_time("view.animate_path", seconds)
+                self.emit("step", instruction=current[0], seconds=seconds,
+                    renderer_calls=self.counters.get("renderer.calls", 0) -
+                    calls)
+
+        view.animate_path = timed_animate_path
+        return view
+
+    def snapshot(self):
+        """
+        returns ({string: object}):
+            every counter, and the calls, total seconds and longest call of
+            every timer.
+        """
+        return {"counters": dict(self.counters),
+            "timers": {name: {"calls": calls, "seconds": seconds,
+            "max_seconds": longest} for name, (calls, seconds, longest)
+            in self.timers.items()}}
+
+    def dump(self, file):
+        """
+        write a snapshot to a file as json.
+        """
+        json.dump(self.snapshot(), file, indent=2)
+
+    def report(self):
+        """
+        returns (string):
+            the timers, slowest first, and counters as a table.
+        """
+        lines = ["%-24s %8s %10s %10s" % ("timer", "calls", "total ms",
+            "max ms")]
+        for name, (calls, seconds, longest) in sorted(self.timers.items(),
+            key=lambda item: -item[1][1]):
+            lines.append("%-24s %8d %10.2f %10.3f" % (name, calls,
+                seconds * 1000, longest * 1000))
+
+        lines.append("")
+        for name, value in sorted(self.counters.items()):
+            lines.append("%-32s %10d" % (name, value))
+
+        return "\n".join(lines)
+
+    def reset(self):
+        self.counters = {}
+        self.timers = {}
+
+
+class InstrumentedRenderer:
+    """
+    passes every call on to another renderer, counting the calls made, the
+    figures created and the time spent in the renderer.
+    """
+    def __init__(self, renderer, metrics):
+        """
+        parameters:
+            renderer (GraphRenderer or RecordingRenderer): what draws.
+            metrics (Metrics): where the calls are counted.
+        """
+        self.renderer = renderer
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        method = getattr(self.renderer, name)
+        if not callable(method):
+            return method
+
+        metrics = self.metrics
+        counter = "renderer." + name
+        creates = name.startswith("draw_")
+        clock = time.perf_counter
+
+        def instrumented(*args, **kwargs):
+            metrics.count("renderer.calls")
+            metrics.count(counter)
+            if creates:
+                metrics.count("renderer.figures_created")
+
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                metrics.add_time("renderer", clock() - start)
+
+        #later calls find the wrapper without coming back here
+        setattr(self, name, instrumented)
+        return instrumented
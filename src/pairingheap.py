@@ -0,0 +1,260 @@
+"""
+pairing heap implementation. a min-heap made of a tree where each node keeps
+its children in a linked list, so pushing and melding just link two roots in
+O(1) and all the tidying up is deferred to pop.
+
+offers the same interface as binheap.BinHeap, including the optional path
+list recording each step in the same (INSTRUCTION, value) format as bst.py.
+"""
+
+"""
+instructions describing heap operations. RESTRUCTURE values are the two roots
+linked, the smaller first.
+"""
+FIND = "FIND"
+INSERT = "INSERT"
+DELETE = "DELETE"
+RESTRUCTURE = "RESTRUCTURE"
+
+
+class PairingNode:
+    """
+    a node of a pairing heap. child is the first of its children and sibling
+    the next child of its parent.
+    """
+    __slots__ = ("value", "child", "sibling")
+
+    def __init__(self, value):
+        """
+        parameters:
+            value (int): the value that this node stores.
+        """
+        self.value = value
+        self.child = None
+        self.sibling = None
+
+
+def link(first, second, path):
+    """
+    make the root with the larger value the first child of the other.
+
+    parameters:
+        first, second (PairingNode): roots of the two heaps to link.
+        path [(string, (int, int))]: records the link if not None.
+
+    returns (PairingNode):
+        the root of the linked heap.
+    """
+    if second.value < first.value:
+        first, second = second, first
+
+    second.sibling = first.child
+    first.child = second
+
+    if path != None:
+        path.append((RESTRUCTURE, (first.value, second.value)))
+
+    return first
+
+
+class PairingHeap:
+    """
+    a min-heap with O(1) push and meld and O(log n) amortised pop.
+
+    every link compares the two roots once, and those comparisons are added
+    to comparisons whenever it is set to a number, as in binheap.BinHeap.
+    """
+    comparisons = None
+
+    def __init__(self, values=None):
+        """
+        parameters:
+            values (iterable of int): initial contents of the heap.
+        """
+        self.root = None
+        self.size = 0
+
+        if values != None:
+            self.heapify(values)
+
+    def __len__(self):
+        return self.size
+
+    def heapify(self, values, path=None):
+        """
+        replace the contents of the heap with values in O(n).
+
+        parameters:
+            values (iterable of int): the new contents of the heap.
+            path [(string, int)]: records the steps taken if not None.
+        """
+        self.root = None
+        self.size = 0
+
+        for value in values:
+            self.push(value, path)
+
+    def push(self, value, path=None):
+        """
+        insert a new value into the heap.
+
+        parameters:
+            value (int): the new value to insert
+            path [(string, int)]: records the steps taken if not None.
+        """
+        node = PairingNode(value)
+        self.size += 1
+
+        if path != None:
+            path.append((INSERT, value))
+
+        if self.root == None:
+            self.root = node
+        else:
+            self.root = link(self.root, node, path)
+            if self.comparisons != None:
+                self.comparisons += 1
+
+    def meld(self, other, path=None):
+        """
+        move every value of another pairing heap into this one in O(1). the
+        other heap is left empty.
+
+        parameters:
+            other (PairingHeap): the heap to take the values from.
+            path [(string, int)]: records the steps taken if not None.
+        """
+        if other.root == None:
+            return
+
+        if self.root == None:
+            self.root = other.root
+        else:
+            self.root = link(self.root, other.root, path)
+            if self.comparisons != None:
+                self.comparisons += 1
+
+        self.size += other.size
+        other.root = None
+        other.size = 0
+
+    def peek(self, path=None):
+        """
+        returns (int):
+            the smallest value in the heap, without removing it.
+
+        raises (IndexError):
+            if the heap is empty.
+        """
+        if self.root == None:
+            raise IndexError("peek at empty heap")
+
+        if path != None:
+            path.append((FIND, self.root.value))
+
+        return self.root.value
+
+    def pop(self, path=None):
+        """
+        remove the smallest value from the heap, pairing up its children left
+        to right and then linking the pairs right to left.
+
+        parameters:
+            path [(string, int)]: records the steps taken if not None.
+
+        returns (int):
+            the value removed.
+
+        raises (IndexError):
+            if the heap is empty.
+        """
+        if self.root == None:
+            raise IndexError("pop from empty heap")
+
+        value = self.root.value
+        self.size -= 1
+
+        if path != None:
+            path.append((DELETE, value))
+
+        pairs = []
+        node = self.root.child
+        unpaired = 0 #1 if the last child was left without a partner
+
+        while node != None:
+            first = node
+            second = first.sibling
+
+            if second == None:
+                first.sibling = None
+                pairs.append(first)
+                unpaired = 1
+                break
+
+            node = second.sibling
+            first.sibling = None
+            second.sibling = None
+            pairs.append(link(first, second, path))
+
+        if self.comparisons != None and len(pairs) > 0:
+            #a link for every pair, then one fewer to join the pairs
+            self.comparisons += 2 * len(pairs) - unpaired - 1
+
+        root = pairs.pop() if len(pairs) > 0 else None
+        while len(pairs) > 0:
+            root = link(pairs.pop(), root, path)
+
+        self.root = root
+        return value
+
+    def pushpop(self, value, path=None):
+        """
+        push a value then pop the smallest.
+
+        returns (int):
+            the smallest of value and the heap's contents.
+        """
+        if self.comparisons != None and self.root != None:
+            self.comparisons += 1
+
+        if self.root == None or not self.root.value < value:
+            if path != None:
+                path.append((INSERT, value))
+                path.append((DELETE, value))
+            return value
+
+        return self.replace(value, path)
+
+    def replace(self, value, path=None):
+        """
+        pop the smallest value then push a new one.
+
+        returns (int):
+            the value removed.
+
+        raises (IndexError):
+            if the heap is empty.
+        """
+        removed = self.pop(path)
+        self.push(value, path)
+        return removed
+
+    def get_height(self):
+        """
+        returns (int):
+            the height of the heap's tree, where children hang below their
+            parent. found by walking the whole heap.
+        """
+        height = 0
+        stack = [(self.root, 1)] if self.root != None else []
+
+        while len(stack) > 0:
+            node, depth = stack.pop()
+            height = max(height, depth)
+
+            child = node.child
+            while child != None:
+                stack.append((child, depth + 1))
+                child = child.sibling
+
+        return height
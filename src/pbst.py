@@ -0,0 +1,440 @@
+"""
+persistent binary search tree. offers the same functions as bst.py, taking
+and returning trees of the same nodes and giving the same paths to animate,
+but never changes a node once it is in a tree. an insert or delete copies
+only the nodes on the way down to where the tree changes and shares the rest
+with the tree it started from, so every earlier version of the tree stays
+intact for O(log n) extra memory per operation on a balanced tree.
+
+History keeps those versions so they can be undone, redone and scrubbed
+through.
+"""
+
+import sys
+
+from bst import Node, node_height, update, min_node
+from bst import SEARCH, SWAP, INSERT, DUPLICATE, DELETE, NOT_FOUND
+
+"""
+functions that never change a tree, shared with bst.py
+"""
+from bst import build, from_preorder, search, search_many
+
+
+def rebuild(ancestors, subtree):
+    """
+    copy the nodes above a changed subtree, bottom up, so they lead to it.
+
+    parameters:
+        ancestors ([(Node, bool)]): each node on the way down from the root
+            and whether the way went right from it.
+        subtree (Node): the new subtree below the last ancestor.
+
+    returns (Node):
+        the root of the new version of the tree.
+    """
+    for node, went_right in reversed(ancestors):
+        if went_right:
+            subtree = Node(node.value, node.left, subtree)
+        else:
+            subtree = Node(node.value, subtree, node.right)
+
+    return subtree
+
+
+def insert(root, value, max_height):
+    """
+    insert a value into a new version of a tree.
+
+    parameters:
+        root (Node): the tree to insert into. left unchanged.
+        value (int): the value to try and insert into the tree.
+        max_height (int): the maximum tree height allowed by the view
+
+    returns (Node, [(string, int)], int, int):
+        1st value is the new version of the tree, or root itself if nothing
+        changed. 2nd is the operations taken to perform this action on the
+        tree. 3rd is height of tree after operation. 4th is the level the
+        newly inserted node is located on.
+    """
+    if root == None:
+        return (Node(value), [(INSERT, value)], 1, 0)
+
+    path = []
+    ancestors = []
+    current = root
+
+    while current != None:
+        if current.value == value:
+            path.append((DUPLICATE, value))
+            return (root, path, node_height(root), len(path) - 1)
+
+        path.append((SEARCH, current.value))
+        went_right = current.value < value
+        ancestors.append((current, went_right))
+        current = current.right if went_right else current.left
+
+    #new node would sit one level below the deepest ancestor
+    if len(ancestors) + 1 > max_height:
+        return (root, [], node_height(root), -sys.maxsize)
+
+    path.append((INSERT, value))
+    root = rebuild(ancestors, Node(value))
+    return (root, path, node_height(root), len(path) - 1)
+
+
+def delete(root, value):
+    """
+    delete a value from a new version of a tree. a node with two children
+    takes its successor's value, as in bst.delete, and the path describes
+    it the same way.
+
+    parameters:
+        root (Node): the tree to delete from. left unchanged.
+        value (int): the value of the node to search for and delete
+
+    returns (Node, [(string, int)], int, int):
+        1st value is the new version of the tree, or root itself if nothing
+        changed. 2nd is the operations taken to perform this action on the
+        tree. 3rd is height of tree after operation. 4th is the level the
+        deleted value is located on, which is always -sys.maxsize since it is
+        no longer in the tree.
+    """
+    if root == None:
+        return (root, [(NOT_FOUND, value)], 0, -sys.maxsize)
+
+    path = []
+    ancestors = []
+    current = root
+
+    while current != None and current.value != value:
+        path.append((SEARCH, current.value))
+        went_right = current.value < value
+        ancestors.append((current, went_right))
+        current = current.right if went_right else current.left
+
+    if current == None:
+        path.append((NOT_FOUND, value))
+        return (root, path, node_height(root), -sys.maxsize)
+
+    if current.left != None and current.right != None:
+        #nodes passed on the way down to the successor are copied to lead to
+        #its right subtree instead
+        spine = []
+        successor = current.right
+        while successor.left != None:
+            spine.append(successor)
+            successor = successor.left
+
+        path.append((SWAP, (value, successor.value)))
+        path.extend((SEARCH, node.value) for node in spine)
+
+        subtree = successor.right
+        for node in reversed(spine):
+            subtree = Node(node.value, subtree, node.right)
+        replacement = Node(successor.value, current.left, subtree)
+    else:
+        replacement = current.left if current.left != None else current.right
+
+    path.append((DELETE, value))
+    root = rebuild(ancestors, replacement)
+    return (root, path, node_height(root), -sys.maxsize)
+
+
+def own(stack, copied):
+    """
+    copy the nodes on a descent that earlier versions still share, top down,
+    so a batch can change them in place. a node is only ever linked below a
+    copy, so the nodes the batch has already copied are always the ones
+    nearest the root and the copying starts below the deepest of them.
+
+    parameters:
+        stack ([(Node, int)]): each node on the way down from the root and
+            the upper bound on values below it. replaced by the copies.
+        copied ({Node}): nodes made by the batch. the copies are added.
+
+    returns (Node):
+        the root of the new version of the tree.
+    """
+    first = len(stack)
+    while first > 0 and stack[first - 1][0] not in copied:
+        first -= 1
+
+    for index in range(first, len(stack)):
+        node, high = stack[index]
+        copy = Node(node.value, node.left, node.right)
+        copied.add(copy)
+
+        if index > 0:
+            parent = stack[index - 1][0]
+            if parent.left == node:
+                parent.set_left_child(copy)
+            else:
+                parent.set_right_child(copy)
+
+        stack[index] = (copy, high)
+
+    return stack[0][0]
+
+
+def insert_many(root, values, max_height):
+    """
+    insert a batch of values into a new version of a tree. the descents are
+    shared as in bst.insert_many, and each node is copied the first time the
+    batch changes something below it, so a node on the way to several values
+    is only copied once.
+
+    parameters:
+        root (Node): the tree to insert into. left unchanged.
+        values (iterable of int): the values to try and insert.
+        max_height (int): values that would make the tree taller than this
+            are skipped.
+
+    returns (Node, [(string, int)], int):
+        1st value is the new version of the tree, or root itself if nothing
+        changed. 2nd is the operations taken to insert every value, the same
+        as bst.insert_many gives. 3rd is height of tree after the batch.
+    """
+    ordered = sorted(set(values))
+    path = []
+    copied = set() #nodes made by this batch, which no earlier version shares
+
+    if len(ordered) == 0:
+        return (root, path, node_height(root))
+
+    if root == None:
+        root = Node(ordered[0])
+        copied.add(root)
+        path.append((INSERT, ordered[0]))
+        ordered = ordered[1:]
+
+    #(node, upper bound on values in its subtree) from the root down. cached
+    #heights of copies are refreshed as they are popped
+    stack = [(root, None)]
+
+    for value in ordered:
+        while stack[-1][1] != None and value >= stack[-1][1]:
+            node = stack.pop()[0]
+            if node in copied:
+                update(node)
+
+        node, high = stack[-1]
+
+        while True:
+            if node.value == value:
+                path.append((DUPLICATE, value))
+                break
+
+            path.append((SEARCH, node.value))
+
+            if node.value < value:
+                child = node.right
+                child_high = high
+            else:
+                child = node.left
+                child_high = node.value
+
+            if child == None:
+                #new node would sit one level below the deepest ancestor
+                if len(stack) + 1 > max_height:
+                    break
+
+                root = own(stack, copied)
+                node = stack[-1][0]
+                child = Node(value)
+                copied.add(child)
+                if node.value < value:
+                    node.set_right_child(child)
+                else:
+                    node.set_left_child(child)
+                path.append((INSERT, value))
+                stack.append((child, child_high))
+                break
+
+            stack.append((child, child_high))
+            node, high = child, child_high
+
+    while len(stack) > 0:
+        node = stack.pop()[0]
+        if node in copied:
+            update(node)
+
+    return (root, path, node_height(root))
+
+
+def delete_many(root, values):
+    """
+    delete a batch of values from a new version of a tree. the descents are
+    shared as in bst.delete_many, and each node is copied the first time the
+    batch changes something below it. a node with two children takes its 
+    successor's value in its copy, and the successor is unlinked from the 
+    copies of the nodes above it.
+
+    parameters:
+        root (Node): the tree to delete from. left unchanged.
+        values (iterable of int): the values to search for and delete.
+
+    returns (Node, [(string, int)], int):
+        1st value is the new version of the tree, or root itself if nothing
+        changed. 2nd is the operations taken to delete every value, the same
+        as bst.delete_many gives. 3rd is height of tree after the batch.
+    """
+    path = []
+    copied = set() #nodes made by this batch, which no earlier version shares
+
+    #(node, upper bound on values in its subtree) from the root down. cached
+    #heights of copies are refreshed as they are popped
+    stack = []
+
+    for value in sorted(set(values)):
+        while len(stack) > 0 and stack[-1][1] != None and \
+            value >= stack[-1][1]:
+            node = stack.pop()[0]
+            if node in copied:
+                update(node)
+
+        if len(stack) == 0:
+            if root == None:
+                path.append((NOT_FOUND, value))
+                continue
+            stack.append((root, None))
+
+        #the descent starts again from the deepest ancestor left
+        node, high = stack.pop()
+        swapped = None #depth of the stack above a node given its successor
+
+        while node != None:
+            if node.value < value:
+                path.append((SEARCH, node.value))
+                stack.append((node, high))
+                node = node.right
+                continue
+            elif node.value > value:
+                path.append((SEARCH, node.value))
+                stack.append((node, high))
+                node, high = node.left, node.value
+                continue
+
+            if node.both_children():
+                #the copy takes the successor's value, and the successor is
+                #the node to unlink. the walk down to it is described as the
+                #search for the value bst.delete_many swaps into it
+                successor = min_node(node.right)
+                path.append((SWAP, (value, successor.value)))
+                stack.append((node, high))
+                root = own(stack, copied)
+                stack[-1][0].set_value(successor.value)
+                swapped = len(stack)
+
+                node = node.right
+                while node.left != None:
+                    path.append((SEARCH, node.value))
+                    stack.append((node, node.value))
+                    node = node.left
+
+            path.append((DELETE, value))
+            replacement = node.one_child()
+
+            if len(stack) == 0:
+                root = replacement
+            else:
+                root = own(stack, copied)
+                parent = stack[-1][0]
+                if parent.left == node:
+                    parent.set_left_child(replacement)
+                else:
+                    parent.set_right_child(replacement)
+            break
+        else:
+            path.append((NOT_FOUND, value))
+
+        #values in the subtree right of a node given its successor are now 
+        #bounded below by the successor, so later descents don't resume in it
+        while swapped != None and len(stack) > swapped:
+            node = stack.pop()[0]
+            if node in copied:
+                update(node)
+
+    while len(stack) > 0:
+        node = stack.pop()[0]
+        if node in copied:
+            update(node)
+
+    return (root, path, node_height(root))
+
+
+class History:
+    """
+    every version of a persistent tree, and which one is current. making a
+    change after undoing drops the versions that were undone.
+    """
+    def __init__(self, root=None):
+        """
+        parameters:
+            root (Node): the first version of the tree.
+        """
+        self.versions = [root]
+        self.index = 0 #position of the current version
+
+    def __len__(self):
+        return len(self.versions)
+
+    def current(self):
+        """
+        returns (Node):
+            the current version of the tree.
+        """
+        return self.versions[self.index]
+
+    def push(self, root):
+        """
+        make a new version of the tree current. nothing is kept if the tree
+        is the current version, as after a search or a failed insert.
+
+        parameters:
+            root (Node): the new version.
+
+        returns (bool):
+            true if a version was added.
+        """
+        if root is self.versions[self.index]:
+            return False
+
+        del self.versions[self.index + 1:]
+        self.versions.append(root)
+        self.index += 1
+        return True
+
+    def can_undo(self):
+        return self.index > 0
+
+    def can_redo(self):
+        return self.index < len(self.versions) - 1
+
+    def goto(self, index):
+        """
+        make any version current, keeping those after it to be redone.
+
+        parameters:
+            index (int): the position of the version, 0 being the first.
+                clamped to the versions there are.
+
+        returns (Node):
+            the version made current.
+        """
+        self.index = min(max(index, 0), len(self.versions) - 1)
+        return self.versions[self.index]
+
+    def undo(self):
+        """
+        returns (Node):
+            the version before the current one, now current.
+        """
+        return self.goto(self.index - 1)
+
+    def redo(self):
+        """
+        returns (Node):
+            the version after the current one, now current.
+        """
+        return self.goto(self.index + 1)
@@ -0,0 +1,422 @@
+"""
+red-black tree implementation, using the left-leaning variant so every
+operation is a short sequence of rotations and colour flips. offers the same
+functions as bst.py and returns the same paths, with every rotation reported
+as a RESTRUCTURE instruction so the view can replay it.
+"""
+
+import sys
+
+import bst
+from bst import Node, node_height, update
+from bst import SEARCH, SWAP, INSERT, NOT_FOUND, DUPLICATE, DELETE, \
+    RESTRUCTURE
+
+
+class RBNode(Node):
+    """
+    a bst node that is also coloured red or black.
+    """
+    __slots__ = ("red",)
+
+    def __init__(self, value, red=True):
+        """
+        parameters:
+            value (int): the value that this tree node stores.
+            red (bool): the colour of the link from this node's parent.
+        """
+        super().__init__(value)
+        self.red = red
+
+    def new_node(self, value):
+        return RBNode(value)
+
+
+def create(value):
+    """
+    function to initialise a red-black tree holding a single value.
+
+    returns (RBNode):
+        the root of the new tree.
+    """
+    return RBNode(value, False)
+
+
+def is_red(node):
+    """
+    returns (bool):
+        true if the node is red. empty trees are black.
+    """
+    return node != None and node.red
+
+
+def rotate_left(node, path):
+    """
+    rotate the right child of node up into its place, keeping the colour of
+    the link above the subtree.
+
+    parameters:
+        node (RBNode): the root of the subtree to rotate.
+        path [(string, int)]: the path the rotation is recorded in.
+
+    returns (RBNode):
+        the new root of the subtree.
+    """
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    pivot.red = node.red
+    node.red = True
+    update(node)
+    update(pivot)
+    path.append((RESTRUCTURE, (node.value, pivot.value)))
+    return pivot
+
+
+def rotate_right(node, path):
+    """
+    rotate the left child of node up into its place, keeping the colour of
+    the link above the subtree.
+
+    parameters:
+        node (RBNode): the root of the subtree to rotate.
+        path [(string, int)]: the path the rotation is recorded in.
+
+    returns (RBNode):
+        the new root of the subtree.
+    """
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    pivot.red = node.red
+    node.red = True
+    update(node)
+    update(pivot)
+    path.append((RESTRUCTURE, (node.value, pivot.value)))
+    return pivot
+
+
+def flip_colours(node):
+    """
+    flip the colour of a node and both of its children.
+    """
+    node.red = not node.red
+    node.left.red = not node.left.red
+    node.right.red = not node.right.red
+
+
+def balance(node, path):
+    """
+    restore the left-leaning invariants at node on the way back up from a
+    mutation, refreshing its cached height and size.
+
+    parameters:
+        node (RBNode): the root of the subtree to fix.
+        path [(string, int)]: the path any rotations are recorded in.
+
+    returns (RBNode):
+        the new root of the subtree.
+    """
+    if is_red(node.right) and not is_red(node.left):
+        node = rotate_left(node, path)
+    if is_red(node.left) and is_red(node.left.left):
+        node = rotate_right(node, path)
+    if is_red(node.left) and is_red(node.right):
+        flip_colours(node)
+
+    update(node)
+    return node
+
+
+def move_red_left(node, path):
+    """
+    make node.left or one of its children red before descending left.
+    """
+    flip_colours(node)
+    if is_red(node.right.left):
+        node.right = rotate_right(node.right, path)
+        node = rotate_left(node, path)
+        flip_colours(node)
+    return node
+
+
+def move_red_right(node, path):
+    """
+    make node.right or one of its children red before descending right.
+    """
+    flip_colours(node)
+    if is_red(node.left.left):
+        node = rotate_right(node, path)
+        flip_colours(node)
+    return node
+
+
+def h_insert(node, value, path, depth, max_height):
+    """
+    recursive helper for insert. recursion depth is bounded by twice the
+    logarithm of the tree size.
+
+    parameters:
+        node (RBNode): the subtree to insert into.
+        value (int): the value to insert.
+        path [(string, int)]: the path and operations taken so far.
+        depth (int): the level node is located at.
+        max_height (int): the new node is not attached if it would make the
+            tree taller than this.
+
+    returns (RBNode):
+        the new root of the subtree.
+    """
+    if node == None:
+        if depth + 1 > max_height:
+            return None
+        path.append((INSERT, value))
+        return RBNode(value)
+
+    if node.value == value:
+        path.append((DUPLICATE, value))
+        return node
+
+    path.append((SEARCH, node.value))
+
+    if node.value < value:
+        child = h_insert(node.right, value, path, depth + 1, max_height)
+        if child == None:
+            return node
+        node.right = child
+    else:
+        child = h_insert(node.left, value, path, depth + 1, max_height)
+        if child == None:
+            return node
+        node.left = child
+
+    #nothing below changed, so there is nothing to fix
+    if path[-1][0] == DUPLICATE:
+        return node
+
+    return balance(node, path)
+
+
+def insert(root, value, max_height):
+    """
+    function to insert a node into a red-black tree.
+
+    parameters:
+        root (RBNode): the tree to insert into.
+        value (int): the value to try and insert into the tree.
+        max_height (int): the maximum tree height allowed by the view
+
+    returns (RBNode, [(string, int)], int, int):
+        1st value is the new tree (possibly unchanged). 2nd is the operations
+        taken to perform this action on the tree. 3rd is height of tree after
+        operation. 4th is the level the new node was attached at, before any
+        restructuring.
+    """
+    if root == None:
+        return (create(value), [(INSERT, value)], 1, 0)
+
+    path = []
+    root = h_insert(root, value, path, 0, max_height)
+    root.red = False
+
+    #the descent stopped without inserting
+    if path[-1][0] == SEARCH:
+        return (root, [], node_height(root), -sys.maxsize)
+
+    level = 0
+    while path[level][0] == SEARCH:
+        level += 1
+
+    return (root, path, node_height(root), level)
+
+
+def delete_min(node, path):
+    """
+    remove the leftmost node of a subtree.
+
+    parameters:
+        node (RBNode): the subtree to remove from.
+        path [(string, int)]: the path and operations taken so far.
+
+    returns (RBNode):
+        the new root of the subtree.
+    """
+    if node.left == None:
+        path.append((DELETE, node.value))
+        return None
+
+    if not is_red(node.left) and not is_red(node.left.left):
+        node = move_red_left(node, path)
+
+    path.append((SEARCH, node.value))
+    node.left = delete_min(node.left, path)
+    return balance(node, path)
+
+
+def h_delete(node, value, path):
+    """
+    recursive helper for delete. the value must be present in the subtree.
+
+    parameters:
+        node (RBNode): the subtree to delete from.
+        value (int): the value to delete.
+        path [(string, int)]: the path and operations taken so far.
+
+    returns (RBNode):
+        the new root of the subtree.
+    """
+    if value < node.value:
+        if not is_red(node.left) and not is_red(node.left.left):
+            node = move_red_left(node, path)
+        path.append((SEARCH, node.value))
+        node.left = h_delete(node.left, value, path)
+        return balance(node, path)
+
+    if is_red(node.left):
+        node = rotate_right(node, path)
+
+    if node.value == value and node.right == None:
+        path.append((DELETE, value))
+        return None
+
+    if not is_red(node.right) and not is_red(node.right.left):
+        node = move_red_right(node, path)
+
+    if node.value == value:
+        #swap with the successor and remove it from the right subtree
+        minimum_node = bst.min_node(node.right)
+        path.append((SWAP, (value, minimum_node.value)))
+        node.value = minimum_node.value
+        minimum_node.value = value
+        node.right = delete_min(node.right, path)
+    else:
+        path.append((SEARCH, node.value))
+        node.right = h_delete(node.right, value, path)
+
+    return balance(node, path)
+
+
+def delete(root, value):
+    """
+    attempts to delete the node with a specified value in the red-black tree
+
+    parameters:
+        root (RBNode): the tree to delete from
+        value (int): the value of the node to search for and delete
+
+    returns (RBNode, [(string, int)], int, int):
+        1st value is the new tree (possibly unchanged). 2nd is the operations
+        taken to perform this action on the tree. 3rd is height of tree after
+        operation. 4th is always -sys.maxsize as the value is no longer in the
+        tree.
+    """
+    root, path = bst.search(root, value)
+
+    if path[-1][0] == NOT_FOUND:
+        return (root, path, node_height(root), -sys.maxsize)
+
+    path = []
+    if not is_red(root.left) and not is_red(root.right):
+        root.red = True
+
+    root = h_delete(root, value, path)
+    if root != None:
+        root.red = False
+
+    return (root, path, node_height(root), -sys.maxsize)
+
+
+def insert_many(root, values, max_height):
+    """
+    insert a batch of values into a red-black tree, one at a time in 
+    ascending order. a batch can't share its descents, as every insert 
+    rebalances the tree on its way back up to the root.
+
+    parameters:
+        root (RBNode): the tree to insert into.
+        values (iterable of int): the values to try and insert.
+        max_height (int): values that would make the tree taller than this
+            are skipped.
+
+    returns (RBNode, [(string, int)], int):
+        1st value is the new tree. 2nd is the operations taken to insert every
+        value. 3rd is height of tree after the batch.
+    """
+    path = []
+
+    for value in sorted(set(values)):
+        root, steps, _, _ = insert(root, value, max_height)
+        path.extend(steps)
+
+    return (root, path, node_height(root))
+
+
+def delete_many(root, values):
+    """
+    delete a batch of values from a red-black tree, one at a time in 
+    ascending order.
+
+    parameters:
+        root (RBNode): the tree to delete from.
+        values (iterable of int): the values to search for and delete.
+
+    returns (RBNode, [(string, int)], int):
+        1st value is the new tree. 2nd is the operations taken to delete every
+        value, in ascending order of value. 3rd is height of tree after the 
+        batch.
+    """
+    path = []
+
+    for value in sorted(set(values)):
+        root, steps, _, _ = delete(root, value)
+        path.extend(steps)
+
+    return (root, path, node_height(root))
+
+
+def build(values, presorted=False):
+    """
+    construct a red-black tree from a collection of values by inserting them
+    in ascending order, so every node is coloured as the tree would colour 
+    it. takes O(n log n).
+
+    parameters:
+        values (iterable of int): the values to store. duplicates are dropped.
+        presorted (bool): the values are already in ascending order.
+
+    returns (RBNode):
+        the root of the new tree. None if there were no values.
+    """
+    root = None
+
+    for value in (values if presorted else sorted(set(values))):
+        root = insert(root, value, sys.maxsize)[0]
+
+    return root
+
+
+def from_preorder(values):
+    """
+    rebuild a red-black tree holding the values of a tree saved in preorder.
+    a preorder doesn't record colours, so the values are built into a new
+    red-black tree rather than keeping the saved shape.
+
+    parameters:
+        values (iterable of int): the values in preorder.
+
+    returns (RBNode):
+        the root of the tree. None if there were no values.
+
+    raises (ValueError):
+        if the values are not the preorder of a binary search tree.
+    """
+    root = bst.from_preorder(values)
+    return build((value for _, value in bst.iter_inorder(root)), 
+        presorted=True)
+
+
+"""
+searching doesn't depend on how the tree is balanced.
+"""
+search = bst.search
+search_many = bst.search_many
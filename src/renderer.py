@@ -0,0 +1,189 @@
+"""
+backends the view draws the tree with. every renderer offers the drawing
+methods of a PySimpleGUI Graph that the view uses, plus set_fill and set_text
+for changing figures in place:
+
+    GraphRenderer draws on a PySimpleGUI Graph in a window.
+    RecordingRenderer draws nothing, keeping the figures that would be on the
+    graph and a log of the calls made, so the view can run without a display.
+"""
+
+
+class GraphRenderer:
+    """
+    draws on a PySimpleGUI Graph element.
+    """
+    def __init__(self, graph, window=None):
+        """
+        parameters:
+            graph (PSG::Graph): the element to draw on.
+            window (PSG::Window): the window holding the graph, refreshed by
+                refresh.
+        """
+        self.graph = graph
+        self.window = window
+
+    def draw_circle(self, centre, radius, fill_color=None):
+        return self.graph.draw_circle(centre, radius, fill_color=fill_color)
+
+    def draw_text(self, text, location, color=None):
+        return self.graph.draw_text(text, location, color=color)
+
+    def draw_line(self, point_from, point_to):
+        return self.graph.draw_line(point_from, point_to)
+
+    def draw_polygon(self, points, fill_color=None):
+        return self.graph.draw_polygon(points, fill_color=fill_color)
+
+    def delete_figure(self, figure_id):
+        self.graph.delete_figure(figure_id)
+
+    def move_figure(self, figure_id, x_move, y_move):
+        self.graph.move_figure(figure_id, x_move, y_move)
+
+    def bring_figure_to_front(self, figure_id):
+        self.graph.bring_figure_to_front(figure_id)
+
+    def send_figure_to_back(self, figure_id):
+        self.graph.send_figure_to_back(figure_id)
+
+    def set_fill(self, figure_id, colour):
+        """
+        change the fill colour of a figure already on the graph.
+        """
+        self.graph.TKCanvas.itemconfig(figure_id, fill=colour)
+
+    def set_text(self, figure_id, text):
+        """
+        change the text shown by a text figure already on the graph.
+        """
+        self.graph.TKCanvas.itemconfig(figure_id, text=str(text))
+
+    def refresh(self):
+        """
+        show what has been drawn so far, for callers that don't return to
+        the window's event loop between frames.
+        """
+        if self.window != None:
+            self.window.refresh()
+
+
+class RecordingRenderer:
+    """
+    a renderer without a display. figures are kept as [kind, attributes]
+    lists by id, so tests can check what would be on the graph and exporters
+    can draw it in the order of stacked(). calls are counted by method so 
+    benchmarks can see how much drawing was done.
+
+    the order is kept in two layers so changing it takes O(1): figures sent
+    to the back, most recently sent first, behind every other figure, from 
+    the first drawn or brought to the front to the last.
+    """
+    def __init__(self, record_calls=False):
+        """
+        parameters:
+            record_calls (bool): also keep every call made, in order, as
+                (method, arguments) in self.calls.
+        """
+        self.figures = {} #[kind, attributes] of each figure by id
+        self.back = {} #ids of figures sent to the back, frontmost first
+        self.front = {} #ids of every other figure, backmost first
+        self.counts = {} #number of calls to each method
+        self.calls = [] if record_calls else None
+        self.next_id = 1
+
+    def record(self, method, *arguments):
+        """
+        count a call, and log it if calls are being recorded.
+        """
+        self.counts[method] = self.counts.get(method, 0) + 1
+        if self.calls != None:
+            self.calls.append((method, arguments))
+
+    def add_figure(self, kind, attributes):
+        """
+        returns (int):
+            the id of a new figure.
+        """
+        figure_id = self.next_id
+        self.next_id += 1
+        self.figures[figure_id] = [kind, attributes]
+        self.front[figure_id] = None
+        return figure_id
+
+    def stacked(self):
+        """
+        returns (generator of [string, {string: object}]):
+            the kind and attributes of every figure, from the back of the 
+            graph to the front.
+        """
+        figures = self.figures
+        for figure_id in reversed(self.back):
+            yield figures[figure_id]
+        for figure_id in self.front:
+            yield figures[figure_id]
+
+    def draw_circle(self, centre, radius, fill_color=None):
+        self.record("draw_circle", centre, radius, fill_color)
+        return self.add_figure("circle", {"centre": centre, "radius": radius,
+            "fill": fill_color})
+
+    def draw_text(self, text, location, color=None):
+        self.record("draw_text", text, location, color)
+        return self.add_figure("text", {"text": str(text),
+            "location": location, "colour": color})
+
+    def draw_line(self, point_from, point_to):
+        self.record("draw_line", point_from, point_to)
+        return self.add_figure("line", {"points": [point_from, point_to]})
+
+    def draw_polygon(self, points, fill_color=None):
+        self.record("draw_polygon", points, fill_color)
+        return self.add_figure("polygon", {"points": list(points),
+            "fill": fill_color})
+
+    def delete_figure(self, figure_id):
+        self.record("delete_figure", figure_id)
+        self.figures.pop(figure_id, None)
+        self.back.pop(figure_id, None)
+        self.front.pop(figure_id, None)
+
+    def move_figure(self, figure_id, x_move, y_move):
+        self.record("move_figure", figure_id, x_move, y_move)
+        attributes = self.figures[figure_id][1]
+
+        for key in ("centre", "location"):
+            if key in attributes:
+                attributes[key] = (attributes[key][0] + x_move,
+                    attributes[key][1] + y_move)
+
+        if "points" in attributes:
+            attributes["points"] = [(x + x_move, y + y_move)
+                for x, y in attributes["points"]]
+
+    def bring_figure_to_front(self, figure_id):
+        self.record("bring_figure_to_front", figure_id)
+        if figure_id in self.back:
+            del self.back[figure_id]
+        else:
+            del self.front[figure_id]
+        self.front[figure_id] = None
+
+    def send_figure_to_back(self, figure_id):
+        self.record("send_figure_to_back", figure_id)
+        if figure_id in self.front:
+            del self.front[figure_id]
+        else:
+            del self.back[figure_id]
+        self.back[figure_id] = None
+
+    def set_fill(self, figure_id, colour):
+        self.record("set_fill", figure_id, colour)
+        self.figures[figure_id][1]["fill"] = colour
+
+    def set_text(self, figure_id, text):
+        self.record("set_text", figure_id, text)
+        self.figures[figure_id][1]["text"] = str(text)
+
+    def refresh(self):
+        self.record("refresh")
@@ -0,0 +1,114 @@
+"""
+saving trees to snapshot files and loading them back. a snapshot is MAGIC,
+the number of nodes as a 64 bit integer and then the value of every node in
+preorder, each a little-endian 64 bit integer. the preorder alone fixes the
+shape of a binary search tree, so loading rebuilds exactly the tree that was
+saved in O(n) with bst.from_preorder, without inserting the values again.
+
+large snapshots are memory mapped when loading, so the values are read
+straight from the file rather than copied into memory first.
+"""
+
+import mmap
+import sys
+from array import array
+
+import bst
+
+"""
+layout of snapshot files. the header is a multiple of 8 bytes so the values
+after it can be read in place.
+"""
+MAGIC = b"BSTSNAP\x01"
+HEADER_SIZE = len(MAGIC) + 8
+TYPECODE = "q" #values are signed 64 bit integers
+CHUNK_SIZE = 1 << 16 #values written at a time
+
+
+def save(tree, filename):
+    """
+    write a tree to a snapshot file, replacing it if it exists.
+
+    parameters:
+        tree (Node): the tree to save.
+        filename (string): the file to write.
+
+    raises (OverflowError):
+        if a value doesn't fit in 64 bits.
+    """
+    with open(filename, "wb") as file:
+        file.write(MAGIC)
+        file.write(bst.node_size(tree).to_bytes(8, "little"))
+        chunk = array(TYPECODE)
+
+        for _, value in bst.iter_preorder(tree):
+            chunk.append(value)
+            if len(chunk) == CHUNK_SIZE:
+                write_chunk(file, chunk)
+                chunk = array(TYPECODE)
+
+        write_chunk(file, chunk)
+
+
+def write_chunk(file, chunk):
+    """
+    write an array of values to a file in little-endian order.
+    """
+    if sys.byteorder == "big":
+        chunk.byteswap()
+    file.write(chunk.tobytes())
+
+
+def read_header(data, filename):
+    """
+    returns (int):
+        the number of values in a snapshot.
+
+    raises (ValueError):
+        if the data isn't a whole snapshot.
+    """
+    if data[:len(MAGIC)] != MAGIC or len(data) < HEADER_SIZE:
+        raise ValueError("not a snapshot file: %s" % filename)
+
+    count = int.from_bytes(data[len(MAGIC):HEADER_SIZE], "little")
+    if len(data) != HEADER_SIZE + count * 8:
+        raise ValueError("snapshot is truncated: %s" % filename)
+
+    return count
+
+
+def load(filename):
+    """
+    rebuild the tree saved in a snapshot file.
+
+    parameters:
+        filename (string): the snapshot to read.
+
+    returns (Node):
+        the tree. None if it was empty.
+
+    raises (ValueError):
+        if the file isn't a whole snapshot of a binary search tree.
+    """
+    with open(filename, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            data = b"" #an empty file can't be mapped
+
+        try:
+            read_header(data, filename)
+
+            #values are only copied on machines that store them the other
+            #way round
+            if sys.byteorder == "big":
+                values = array(TYPECODE, data[HEADER_SIZE:])
+                values.byteswap()
+                return bst.from_preorder(values)
+
+            with memoryview(data) as view:
+                with view[HEADER_SIZE:].cast(TYPECODE) as values:
+                    return bst.from_preorder(values)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
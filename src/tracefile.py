@@ -0,0 +1,450 @@
+"""
+a compact binary format for sessions of tree operations, so they can be
+recorded as they happen and replayed later.
+
+a session file starts with MAGIC and holds one record per operation:
+
+    operation byte   OPERATION | the method's index in METHODS
+    varint           the number of keys given to the method
+    varint * n       the keys
+    instructions     an opcode byte from OPCODES followed by one varint, or
+                     two for SWAP and RESTRUCTURE, for each instruction of
+                     the path the operation took
+    END              marks the end of the record
+
+varints hold 7 bits per byte and are zigzag encoded so small negative values
+stay small. traversals are recorded without their instructions, as they are
+worked out again from the tree when the session is replayed.
+
+reading maps the file into memory rather than loading it, so sessions larger
+than memory can be replayed one operation at a time.
+"""
+
+import mmap
+import sys
+
+import avl
+import bst
+import pbst
+import rbtree
+from bst import FIND, SEARCH, SWAP, INSERT, NOT_FOUND, DUPLICATE, DELETE, \
+    RESTRUCTURE
+from bstview import BST_INSERT, BST_DELETE, BST_SEARCH, BST_BFS, \
+    BST_PREORDER, BST_INORDER, BST_POSTORDER, BST_LOAD, BST_OPEN, BST_GOTO, \
+    BST_TREE
+
+"""
+layout of session files
+"""
+MAGIC = b"BSTTRACE\x01"
+END = 0x00
+OPERATION = 0x80 #set on the first byte of every operation record
+
+"""
+opcodes of the instructions in a path, and the instructions whose operand is
+a pair of values
+"""
+OPCODES = {FIND: 1, SEARCH: 2, SWAP: 3, INSERT: 4, NOT_FOUND: 5,
+    DUPLICATE: 6, DELETE: 7, RESTRUCTURE: 8}
+INSTRUCTIONS = {opcode: instruction for instruction, opcode in OPCODES.items()}
+PAIRED = (SWAP, RESTRUCTURE)
+
+"""
+methods that can be recorded, by index, and the traversals among them. new
+methods go on the end so older sessions still read the same. an Open records
+the preorder of the snapshot opened as its keys, a Goto the position in the
+history of the version of the tree gone back or forward to, and a Tree the
+index in TREES of the variant the operations after it use.
+"""
+METHODS = (BST_INSERT, BST_DELETE, BST_SEARCH, BST_BFS, BST_PREORDER,
+    BST_INORDER, BST_POSTORDER, BST_LOAD, BST_OPEN, BST_GOTO, BST_TREE)
+METHOD_CODES = {method: code for code, method in enumerate(METHODS)}
+TRAVERSALS = {
+    BST_BFS: bst.iter_breadth_first,
+    BST_PREORDER: bst.iter_preorder,
+    BST_INORDER: bst.iter_inorder,
+    BST_POSTORDER: bst.iter_postorder,
+}
+
+"""
+variants of tree operations can be performed on, by name. new variants go on
+the end, as a Tree record holds the index of one. bst is performed with pbst
+wherever every version of the tree is kept, as it gives the same paths. avl
+and rbtree change their trees in place, so no earlier versions are kept.
+"""
+TREES = {
+    "bst": bst,
+    "avl": avl,
+    "rbtree": rbtree,
+}
+TREE_NAMES = tuple(TREES)
+TREE_CODES = {name: code for code, name in enumerate(TREE_NAMES)}
+
+
+def perform(tree, method, keys, model=bst):
+    """
+    perform an operation on a tree the way the gui does. several keys are
+    handled as one batch.
+
+    parameters:
+        tree (Node): the tree to operate on.
+        method (string): one of METHODS.
+        keys ([int]): the values given to the method. traversals take none.
+        model (module): bst, avl or rbtree, which change the tree in place,
+            or pbst, which leaves it as it was and returns a new version.
+
+    returns (Node, iterable of (string, int), int, int):
+        1st value is the tree afterwards. 2nd is the path taken, a generator
+        for traversals. 3rd is the height of the tree and 4th the level of
+        the node acted upon, 0 where the method doesn't give one.
+    """
+    if method == BST_LOAD:
+        tree = model.build(keys)
+        return (tree, [], bst.node_height(tree), 0)
+    elif method == BST_OPEN:
+        tree = model.from_preorder(keys)
+        return (tree, [], bst.node_height(tree), 0)
+    elif method in TRAVERSALS:
+        return (tree, TRAVERSALS[method](tree), bst.node_height(tree), 0)
+    elif len(keys) > 1:
+        if method == BST_INSERT:
+            return model.insert_many(tree, keys, sys.maxsize) + (0,)
+        elif method == BST_DELETE:
+            return model.delete_many(tree, keys) + (0,)
+        elif method == BST_SEARCH:
+            tree, path = model.search_many(tree, keys)
+            return (tree, path, bst.node_height(tree), 0)
+    elif method == BST_INSERT:
+        return model.insert(tree, keys[0], sys.maxsize)
+    elif method == BST_DELETE:
+        return model.delete(tree, keys[0])
+    elif method == BST_SEARCH:
+        tree, path = model.search(tree, keys[0])
+        return (tree, path, bst.node_height(tree), 0)
+
+    raise ValueError("unknown method: %s" % method)
+
+
+def write_varint(out, value):
+    """
+    append an integer to a bytearray as a zigzag varint.
+    """
+    value = value * 2 if value >= 0 else -value * 2 - 1
+
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, position):
+    """
+    parameters:
+        data (bytes or mmap): the encoded data.
+        position (int): where the varint starts.
+
+    returns (int, int):
+        the integer, and the position just after it.
+    """
+    result = 0
+    shift = 0
+
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+
+    return ((result >> 1) ^ -(result & 1), position)
+
+
+def encode(method, keys, path):
+    """
+    returns (bytearray):
+        the record of one operation.
+
+    parameters:
+        method (string): one of METHODS.
+        keys ([int]): the values given to the method.
+        path ([(string, int)]): the instructions the operation produced.
+            ignored for traversals.
+    """
+    out = bytearray([OPERATION | METHOD_CODES[method]])
+    write_varint(out, len(keys))
+    for key in keys:
+        write_varint(out, key)
+
+    if method not in TRAVERSALS:
+        for instruction, operand in path:
+            out.append(OPCODES[instruction])
+            if instruction in PAIRED:
+                write_varint(out, operand[0])
+                write_varint(out, operand[1])
+            else:
+                write_varint(out, operand)
+
+    out.append(END)
+    return out
+
+
+def decode(data, position):
+    """
+    read the operation record starting at a position.
+
+    parameters:
+        data (bytes or mmap): the encoded session.
+        position (int): where the record starts.
+
+    returns (string, [int], [(string, int)], int):
+        the method, its keys, its path and the position of the next record.
+
+    raises (ValueError):
+        if the data at position is not an operation record, or the record
+        holds an instruction that isn't in OPCODES.
+    raises (IndexError):
+        if the record is cut off by the end of the data.
+    """
+    code = data[position]
+    if code & OPERATION == 0 or code & ~OPERATION >= len(METHODS):
+        raise ValueError("no operation record at byte %d" % position)
+
+    method = METHODS[code & ~OPERATION]
+    count, position = read_varint(data, position + 1)
+    keys = []
+    for _ in range(count):
+        key, position = read_varint(data, position)
+        keys.append(key)
+
+    #varints are read inline, as this loop is where replays spend their time
+    path = []
+    append = path.append
+    instructions = INSTRUCTIONS
+
+    while True:
+        opcode = data[position]
+        position += 1
+        if opcode == END:
+            break
+
+        try:
+            instruction = instructions[opcode]
+        except KeyError:
+            raise ValueError("unknown opcode %d at byte %d" % (opcode, 
+                position - 1))
+        byte = data[position]
+        position += 1
+        result = byte & 0x7F
+        shift = 7
+        while byte >= 0x80:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            shift += 7
+        operand = (result >> 1) ^ -(result & 1)
+
+        if instruction in PAIRED:
+            second, position = read_varint(data, position)
+            operand = (operand, second)
+
+        append((instruction, operand))
+
+    return (method, keys, path, position)
+
+
+def records_end(data):
+    """
+    parameters:
+        data (bytes or mmap): an encoded session, starting with MAGIC.
+
+    returns (int):
+        the position just after the last whole record that can be read.
+    """
+    position = len(MAGIC)
+
+    while position < len(data):
+        try:
+            position = decode(data, position)[3]
+        except (IndexError, ValueError):
+            break
+
+    return position
+
+
+class TraceWriter:
+    """
+    appends operations to a session file, starting it if it is new.
+    """
+    def __init__(self, filename):
+        """
+        parameters:
+            filename (string): the session file to add to.
+
+        raises (ValueError):
+            if the file exists but isn't a session.
+        """
+        self.file = open(filename, "ab+")
+        self.file.seek(0)
+        start = self.file.read(len(MAGIC))
+
+        if start == b"":
+            self.file.write(MAGIC)
+        elif start != MAGIC:
+            self.file.close()
+            raise ValueError("not a session file: %s" % filename)
+        else:
+            self.drop_partial_record()
+
+    def drop_partial_record(self):
+        """
+        cut off whatever follows the last whole record of the file, such as
+        a record left half written by a crash, so records added after it
+        can still be read.
+        """
+        data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            end = records_end(data)
+            size = len(data)
+        finally:
+            data.close()
+
+        if end < size:
+            self.file.truncate(end)
+
+    def write(self, method, keys, path):
+        """
+        record an operation. records are buffered until flush is called, and
+        a record left half written by a crash is dropped the next time the
+        session is opened, so a crash loses only what was written since the
+        last flush.
+
+        parameters:
+            method (string): one of METHODS.
+            keys ([int]): the values given to the method.
+            path ([(string, int)]): the instructions the operation produced.
+        """
+        self.file.write(encode(method, keys, path))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class TraceReader:
+    """
+    reads the operations of a session file through a memory map, one at a
+    time, so only the operation being read is held in memory.
+    """
+    def __init__(self, filename):
+        """
+        parameters:
+            filename (string): the session file to read.
+
+        raises (ValueError):
+            if the file isn't a session.
+        """
+        self.file = open(filename, "rb")
+
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0,
+                access=mmap.ACCESS_READ)
+        except ValueError:
+            self.data = b"" #an empty file can't be mapped
+
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("not a session file: %s" % filename)
+
+    def __iter__(self):
+        """
+        returns (generator of (string, [int], [(string, int)])):
+            the method, keys and path of each operation in the session. 
+            reading stops at an operation cut off at the end of the file or
+            one that can't be decoded.
+        """
+        data = self.data
+        position = len(MAGIC)
+
+        while position < len(data):
+            try:
+                method, keys, path, position = decode(data, position)
+            except (IndexError, ValueError):
+                return
+            yield (method, keys, path)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def replay(operations, view=None, tree=None, model=bst):
+    """
+    play a session back, performing each operation again to rebuild the tree
+    and, given a view, animating the recorded paths to the end on it. every
+    version of a bst is kept in a pbst.History, as the gui keeps them, so a
+    Goto returns to the same version it did when it was recorded.
+
+    parameters:
+        operations (iterable of (string, [int], [(string, int)])): the
+            session, such as a TraceReader.
+        view (BSTView): where the operations are animated, if anywhere.
+        tree (Node): the tree the session started from.
+        model (module): one of TREES, used until a Tree record says 
+            otherwise.
+
+    returns (Node):
+        the tree at the end of the session.
+    """
+    model = pbst if model == bst else model
+    history = pbst.History(tree) if model == pbst else None
+
+    for method, keys, path in operations:
+        if method == BST_TREE:
+            model = TREES[TREE_NAMES[keys[0]]]
+            model = pbst if model == bst else model
+            history = pbst.History() if model == pbst else None
+            tree = None
+            if view != None:
+                view.redraw_from_model(tree, refit=True)
+            continue
+
+        if method == BST_GOTO:
+            tree = history.goto(keys[0])
+            if view != None:
+                view.redraw_from_model(tree)
+            continue
+
+        tree, performed, height, level = perform(tree, method, keys, model)
+        if history != None:
+            history.push(tree)
+
+        if view == None:
+            continue
+
+        if method in (BST_LOAD, BST_OPEN):
+            view.redraw_from_model(tree, refit=True)
+            continue
+
+        view.start_animation(performed if method in TRAVERSALS else path,
+            height, level, tree)
+        while view.step_animation():
+            pass
+
+    return tree
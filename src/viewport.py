@@ -0,0 +1,140 @@
+"""
+the part of a tree layout shown on the graph. converts between positions in
+the tidy layout, measured in separations and levels, and coordinates on the
+graph, and keeps track of how far the user has zoomed and panned.
+"""
+
+"""
+limits on zooming, in pixels per unit of the tidy layout
+"""
+MIN_SCALE = 1e-6
+MAX_SCALE = 400
+ZOOM_STEP = 1.25 #zoom applied by each press of a zoom button
+
+
+class Viewport:
+    """
+    a window onto a tree layout drawn on a graph of fixed size. starts fitted
+    to the tree and stays fitted as the tree changes until the user zooms or
+    pans.
+    """
+    def __init__(self, width, height, border, max_spacing, max_level_gap):
+        """
+        parameters:
+            width, height (int): the size of the graph in pixels.
+            border (int): space kept clear around the tree when fitting it.
+            max_spacing (float): the most pixels a unit of the layout is
+                stretched to when fitting the tree.
+            max_level_gap (float): the most pixels between levels when
+                fitting the tree.
+        """
+        self.width = width
+        self.height = height
+        self.border = border
+        self.max_spacing = max_spacing
+        self.max_level_gap = max_level_gap
+        self.scale = max_spacing #pixels per unit of the layout
+        self.level_gap = max_level_gap #pixels between levels
+        self.centre_x = 0.0 #layout position at the middle of the graph
+        self.top_level = 0.0 #level drawn at the top of the drawable area
+        self.fitted = True
+
+    def to_screen(self, x, level):
+        """
+        returns (float, float):
+            the graph coordinates of a position in the layout.
+        """
+        return (self.width / 2 + (x - self.centre_x) * self.scale,
+            self.height - self.border - (level - self.top_level) *
+            self.level_gap)
+
+    def to_layout(self, coords):
+        """
+        returns (float, float):
+            the layout position and level at some graph coordinates.
+        """
+        return (self.centre_x + (coords[0] - self.width / 2) / self.scale,
+            self.top_level + (self.height - self.border - coords[1]) /
+            self.level_gap)
+
+    def visible_x(self, margin=0):
+        """
+        parameters:
+            margin (float): pixels beyond each side of the graph to include.
+
+        returns (float, float):
+            the layout positions at the left and right edges of the graph.
+        """
+        half_width = (self.width / 2 + margin) / self.scale
+        return (self.centre_x - half_width, self.centre_x + half_width)
+
+    def last_level(self, margin=0):
+        """
+        parameters:
+            margin (float): pixels below the graph to include.
+
+        returns (int):
+            the deepest level at least partly on the graph.
+        """
+        return int(self.top_level + (self.height - self.border + margin) /
+            self.level_gap)
+
+    def fit(self, min_x, max_x, height):
+        """
+        zoom and pan so a whole layout fits on the graph, no more stretched
+        than max_spacing and max_level_gap allow.
+
+        parameters:
+            min_x, max_x (float): the layout positions of the tree's sides.
+            height (int): the number of levels in the tree.
+        """
+        self.scale = self.max_spacing
+        if max_x > min_x:
+            self.scale = min(self.scale,
+                (self.width - 2 * self.border) / (max_x - min_x))
+
+        self.level_gap = self.max_level_gap
+        if height > 1:
+            self.level_gap = min(self.level_gap,
+                (self.height - 2 * self.border) / (height - 1))
+
+        self.centre_x = (min_x + max_x) / 2
+        self.top_level = 0.0
+        self.fitted = True
+
+    def pan(self, dx, dy):
+        """
+        move the tree across the graph.
+
+        parameters:
+            dx, dy (float): pixels to move the tree right and up by.
+        """
+        self.centre_x -= dx / self.scale
+        self.top_level += dy / self.level_gap
+        self.fitted = False
+
+    def zoom(self, factor, anchor=None):
+        """
+        scale the tree on the graph, keeping the point under anchor still.
+
+        parameters:
+            factor (float): how many times larger to draw the tree.
+            anchor (float, float): graph coordinates to zoom about. defaults
+                to the middle of the graph.
+        """
+        if anchor == None:
+            anchor = (self.width / 2, self.height / 2)
+
+        x, level = self.to_layout(anchor)
+        scale = min(max(self.scale * factor, MIN_SCALE), MAX_SCALE)
+
+        #trees are far wider than they are tall, so levels stop spreading out
+        #once they are as far apart as they would be in a small tree
+        self.level_gap = min(self.level_gap * scale / self.scale, 
+            self.max_level_gap)
+        self.scale = scale
+
+        self.centre_x = x - (anchor[0] - self.width / 2) / self.scale
+        self.top_level = level - (self.height - self.border - anchor[1]) / \
+            self.level_gap
+        self.fitted = False